@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fitness de una población: una llamada por individuo vs lotes (B, H, W, 3)
+con `evaluate_individuals` (fitness/batch.py), para varios tamaños de tile.
+
+Por defecto cada individuo guarda su render (`ind.img`) y se mide solo la
+puntuación, que es lo que cambia; con --with-render se renderiza en cada
+evaluación, igual en ambos caminos.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_batch_fitness --image starry_night.jpg --pop 40 --tiles 16 32 64 0
+  (0 = imagen completa)
+"""
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.genetics.fitness.batch import evaluate_individuals
+from src.genetics.fitness.mixed_mse_ssim_deltae import MixedMSESSIMDeltaEEvaluator
+from src.genetics.fitness.mse import MSEEvaluator
+from src.genetics.fitness.ssim import SSIMEvaluator
+from src.genetics.individual import Individual
+from src.genetics.render.buffers import set_render_mode
+
+EVALUATORS = {
+    "mse": MSEEvaluator,
+    "ssim": SSIMEvaluator,
+    "mixed_mse_ssim_deltae": MixedMSESSIMDeltaEEvaluator,
+}
+
+
+def _evals_per_sec(population, target, budget, repeats):
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        for ind in population:
+            ind.fitness = float('inf')
+        evaluate_individuals(population, target, budget_bytes=budget)
+    return len(population) * repeats / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fitness por individuo vs por lotes.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=40)
+    ap.add_argument("--polygons", type=int, default=20)
+    ap.add_argument("--tiles", type=int, nargs="*", default=[16, 32, 64, 0])
+    ap.add_argument("--budget-mb", type=float, default=64)
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument("--with-render", action="store_true")
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    set_render_mode("numpy")
+    budget = int(args.budget_mb * 1024 * 1024)
+    print(f"{args.pop} individuos de {args.polygons} polígonos, presupuesto {args.budget_mb} MiB")
+    print(f"{'tile':>9s} {'fitness':24s} {'por individuo':>14s} {'por lotes':>12s} {'speedup':>8s}")
+    for tile in args.tiles:
+        crop = img if tile == 0 else img.crop((0, 0, tile, tile))
+        target = np.array(crop)
+        w, h = crop.size
+        for name, evaluator_cls in EVALUATORS.items():
+            evaluator = evaluator_cls().prepare(target)
+            population = [Individual(w, h, args.polygons, evaluator, None, target_img=crop)
+                          for _ in range(args.pop)]
+            if not args.with_render:
+                for ind in population:
+                    ind.img = Image.fromarray(ind.render_array().copy())
+            single = _evals_per_sec(population, target, 0, args.repeats)
+            batched = _evals_per_sec(population, target, budget, args.repeats)
+            print(f"{w:>4d}x{h:<4d} {name:24s} {single:10.0f}/s {batched:9.0f}/s   x{batched / single:5.2f}")
+    set_render_mode(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Evaluación de MSE completa vs incremental sobre el rectángulo modificado
+(fitness/delta_mse.py) para hijos con un solo polígono mutado.
+
+Cada paso clona un padre ya evaluado, lo muta con `single_gene_mutation` y
+calcula el fitness del hijo. Se reporta evaluaciones por segundo, el área
+media re-renderizada y la diferencia máxima de fitness entre ambos caminos.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_delta_fitness --image starry_night.jpg --polygons 100 --steps 200
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.genetics.fitness.delta_mse import dirty_rect, polygon_keys, set_delta_fitness
+from src.genetics.fitness.mse import mse_fitness
+from src.genetics.individual import Individual
+from src.genetics.mutation.single_gene_mutation import single_gene_mutation
+from src.genetics.render.buffers import set_render_mode
+
+
+def _run(parent, img, target, steps, seed):
+    random.seed(seed)
+    parent.fitness = float("inf")
+    parent.calculate_fitness(target)
+    fitnesses, areas = [], []
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        child = parent.clone()
+        single_gene_mutation(child, 1.0, img)
+        if child.delta_base is not None:
+            rect = dirty_rect(child.delta_base.keys, polygon_keys(child.polygons), child.width, child.height)
+            areas.append((rect[2] - rect[0]) * (rect[3] - rect[1]) if rect else (0 if rect == () else child.width * child.height))
+        fitnesses.append(child.calculate_fitness(target))
+    return steps / (time.perf_counter() - t0), np.array(fitnesses), areas
+
+
+def main():
+    ap = argparse.ArgumentParser(description="MSE completo vs incremental por bounding box.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--steps", type=int, default=200)
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    target = np.array(img)
+    w, h = img.size
+    print(f"target {w}x{h}, {args.polygons} polígonos, {args.steps} hijos")
+
+    for mode in ("fast", "numpy"):
+        set_render_mode(mode)
+        parent = Individual(w, h, args.polygons, mse_fitness, single_gene_mutation, target_img=img)
+        set_delta_fitness(False)
+        full_rate, full_fit, _ = _run(parent, img, target, args.steps, seed=1)
+        parent.delta_base = None
+        set_delta_fitness(True)
+        delta_rate, delta_fit, areas = _run(parent, img, target, args.steps, seed=1)
+        print(f"{mode:6s} completo {full_rate:7.1f} eval/s   delta {delta_rate:7.1f} eval/s   "
+              f"x{delta_rate / full_rate:5.2f}   área media {np.mean(areas) / (w * h):6.1%}   "
+              f"|dif| máx fitness {np.abs(full_fit - delta_fit).max():.2e}")
+    set_delta_fitness(None)
+
+
+if __name__ == "__main__":
+    main()
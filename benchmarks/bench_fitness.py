@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tiempo por evaluación de cada fitness: función original (skimage, todo en
+float64 y recalculando el target) vs evaluador con el target preparado
+(`score`) vs evaluador por lotes (`score_batch`). Para los fitness compuestos imprime además el tiempo
+medio por evaluación de cada componente y de los intermedios compartidos.
+Las filas deltaE_cie94 / deltaE_cie76 comparan los modos aproximados del
+evaluador (`deltae_mode`) con la misma fórmula de skimage.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_fitness --image starry_night.jpg --pop 8 --polygons 100
+  python -m benchmarks.bench_fitness --only ssim mixed
+"""
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+from PIL import Image
+from skimage import color
+
+from src.genetics.fitness.deltaE import DeltaEEvaluator, delta_e_fitness
+from src.genetics.fitness.mixed_fitness import MixedEvaluator, mixed_fitness
+from src.genetics.fitness.mixed_mse_ssim_deltae import (
+    MixedMSESSIMDeltaEEvaluator, mixed_fitness_mse_ssim_deltaE,
+)
+from src.genetics.fitness.mse import MSEEvaluator, mse_fitness
+from src.genetics.fitness.ssim import SSIMEvaluator, ssim_fitness
+from src.genetics.individual import Individual
+
+def _skimage_delta_e(formula, target, generated):
+    target_lab = color.rgb2lab(target.astype(np.float32) / 255.0)
+    generated_lab = color.rgb2lab(generated.astype(np.float32) / 255.0)
+    return 1 / (1 + np.mean(formula(target_lab, generated_lab)))
+
+
+FITNESS = {
+    "mse": (mse_fitness, MSEEvaluator),
+    "ssim": (ssim_fitness, SSIMEvaluator),
+    "deltaE": (delta_e_fitness, DeltaEEvaluator),
+    "deltaE_cie94": (partial(_skimage_delta_e, color.deltaE_ciede94), partial(DeltaEEvaluator, "cie94")),
+    "deltaE_cie76": (partial(_skimage_delta_e, color.deltaE_cie76), partial(DeltaEEvaluator, "cie76")),
+    "mixed": (mixed_fitness, MixedEvaluator),
+    "mixed_mse_ssim_deltae": (mixed_fitness_mse_ssim_deltaE, MixedMSESSIMDeltaEEvaluator),
+}
+
+
+def _per_eval_ms(fn, n):
+    t0 = time.perf_counter()
+    out = fn()
+    return (time.perf_counter() - t0) / n * 1e3, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo por evaluación: función original vs evaluador.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=8)
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--only", nargs="*", default=None, help="Subconjunto de fitness a medir.")
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    target = np.array(img)
+    w, h = img.size
+    stack = np.stack([np.array(Individual(w, h, args.polygons, None, None, target_img=img).render())
+                      for _ in range(args.pop)])
+    print(f"target {w}x{h}, {args.pop} renders de {args.polygons} polígonos")
+    print(f"{'fitness':24s} {'función':>10s} {'score':>10s} {'batch':>10s} {'speedup':>8s} {'|dif| máx':>10s}")
+
+    for name, (function, evaluator_cls) in FITNESS.items():
+        if args.only and name not in args.only:
+            continue
+        evaluator = evaluator_cls().prepare(target)
+        evaluator.score(stack[0])  # calentar
+        t_fn, ref = _per_eval_ms(lambda: [function(target, g) for g in stack], len(stack))
+        t_score, got = _per_eval_ms(lambda: [evaluator.score(g) for g in stack], len(stack))
+        t_batch, batch = _per_eval_ms(lambda: evaluator.score_batch(stack), len(stack))
+        diff = max(np.abs(np.subtract(ref, got)).max(), np.abs(np.subtract(ref, batch)).max())
+        print(f"{name:24s} {t_fn:8.1f}ms {t_score:8.1f}ms {t_batch:8.1f}ms "
+              f"x{t_fn / min(t_score, t_batch):6.2f} {diff:10.2e}")
+        # fitness compuestos: desglose por componente / intermedio compartido
+        timings = evaluator.take_timings()
+        if timings:
+            evals = 2 * len(stack) + 1
+            print(" " * 26 + "  ".join(f"{part} {sec / evals * 1e3:.1f}ms" for part, sec in timings.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memoria por individuo: lista de Individual/Polygon vs PopulationArrays.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_genome_memory --pop 120 --polygons 100
+"""
+import argparse
+import gc
+import tracemalloc
+
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.polygon import Polygon
+from src.genetics.population_arrays import PopulationArrays
+
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def _fresh_copy(ind):
+    # clone() comparte los Polygon (inmutables): acá se construyen de nuevo
+    copy = ind.clone()
+    copy.polygons = [Polygon(p.vertices, p.color) for p in ind.polygons]
+    return copy
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Memoria por individuo según representación del genoma.")
+    ap.add_argument("--pop", type=int, default=120)
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--width", type=int, default=500)
+    ap.add_argument("--height", type=int, default=400)
+    args = ap.parse_args()
+
+    target = Image.new("RGB", (args.width, args.height), (128, 128, 128))
+    individuals = [Individual(args.width, args.height, args.polygons, None, None, target_img=target)
+                   for _ in range(args.pop)]
+
+    # Copia "fresca" de los objetos para medir solo su memoria
+    _, objects_bytes = _traced(lambda: [_fresh_copy(ind) for ind in individuals])
+    _, arrays_bytes = _traced(lambda: PopulationArrays.from_individuals(individuals))
+
+    print(f"población {args.pop}, {args.polygons} polígonos")
+    print(f"{'Individual/Polygon':22s} {objects_bytes / args.pop / 1024:10.2f} KiB/individuo")
+    print(f"{'PopulationArrays':22s} {arrays_bytes / args.pop / 1024:10.2f} KiB/individuo")
+    print(f"{'reducción':22s} {objects_bytes / max(1, arrays_bytes):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
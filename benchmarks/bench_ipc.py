@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de IPC del pool de fitness: bytes por generación y tiempo de
+serialización de las tareas que se mandan a los workers.
+
+  antes:   (Individual, target_array)          -> pickle del objeto completo
+  después: (PackedGenome, SharedArrayHandle)   -> int16/uint8 + handle
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_ipc --image starry_night.jpg --pop 120 --polygons 100
+"""
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+from multiprocessing.reduction import ForkingPickler
+
+from src.genetics.population import Population
+from src.genetics.fitness.mse import mse_fitness
+from src.genetics.mutation.multi_gene_mutation import multi_gene_mutation
+from src.genetics.selection.torneos import tournament_selection
+from src.genetics.next_gen.traditional_selection import traditional_selection
+from src.genetics.shared_target import SharedTarget
+from src.genetics.genome_codec import dumps
+
+
+def _measure(tasks, serialize, reps):
+    total_bytes = 0
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        total_bytes = sum(serialize(t) for t in tasks)
+    return total_bytes, (time.perf_counter() - t0) / reps
+
+
+def _forking_size(task):
+    return len(ForkingPickler.dumps(task))
+
+
+def _oob_size(task):
+    data, buffers = dumps(task)
+    return len(data) + sum(memoryview(b).nbytes for b in buffers)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de serialización de tareas de fitness.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=120)
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--reps", type=int, default=5)
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    target = np.array(img)
+    pop = Population(
+        population_size=args.pop, width=img.width, height=img.height, n_polygons=args.polygons,
+        fitness_method=mse_fitness, mutation_method=multi_gene_mutation,
+        selection_method=tournament_selection, replacement_method=traditional_selection,
+        max_gen=1, target_img=img,
+    )
+
+    with SharedTarget({"target": target}) as shared:
+        rows = [
+            ("antes  (Individual + target)", pop.prepare_fitness_tasks(target), _forking_size),
+            ("después (packed + handle)", pop.prepare_fitness_tasks(shared.handle, packed=True), _forking_size),
+            ("después, protocolo 5 out-of-band", pop.prepare_fitness_tasks(shared.handle, packed=True), _oob_size),
+        ]
+        print(f"target {img.width}x{img.height}, población {args.pop}, {args.polygons} polígonos")
+        for label, tasks, serialize in rows:
+            nbytes, secs = _measure(tasks, serialize, args.reps)
+            print(f"{label:36s} {nbytes / 1024:12.1f} KiB/gen  {secs * 1000:9.2f} ms/gen")
+
+        t0 = time.perf_counter()
+        for _ in range(args.reps):
+            pop.prepare_fitness_tasks(shared.handle, packed=True)
+        pack_ms = (time.perf_counter() - t0) / args.reps * 1000
+        print(f"{'empaquetado de genomas':36s} {'':12s}          {pack_ms:9.2f} ms/gen")
+
+
+if __name__ == "__main__":
+    main()
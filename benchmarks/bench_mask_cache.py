@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Render `numpy` tras mutaciones de un polígono, con y sin cache de máscaras de
+cobertura (render/mask_cache.py).
+
+Cada paso clona un individuo, muta un polígono con `_mutate_one_polygon`
+(≈50 % cambia solo color/alfa, ≈50 % mueve un vértice) y renderiza el hijo.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_mask_cache --image starry_night.jpg --pop 10 --polygons 100 --steps 200
+"""
+import argparse
+import random
+import time
+
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.mutation.auxiliar_mutate_one_polygon import _mutate_one_polygon
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.render.mask_cache import MaskCache, set_mask_cache
+
+
+def _run(population, img, steps, seed):
+    random.seed(seed)
+    for ind in population:
+        ind.render_array()
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        child = random.choice(population).clone()
+        idx = random.randrange(len(child.polygons))
+        child.polygons[idx] = _mutate_one_polygon(child.polygons[idx], child, img)
+        child.render_array()
+    return steps / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render numpy con y sin cache de máscaras.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=10)
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--steps", type=int, default=200)
+    ap.add_argument("--budget-mb", type=float, default=256)
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    w, h = img.size
+    set_render_mode("numpy")
+    population = [Individual(w, h, args.polygons, None, None, target_img=img) for _ in range(args.pop)]
+    print(f"target {w}x{h}, {args.pop} individuos, {args.polygons} polígonos, {args.steps} mutaciones")
+
+    set_mask_cache(None)
+    base = _run(population, img, args.steps, seed=1)
+    cache = MaskCache(int(args.budget_mb * 1024 * 1024))
+    set_mask_cache(cache)
+    cached = _run(population, img, args.steps, seed=1)
+    print(f"sin cache {base:7.1f} renders/s   con cache {cached:7.1f} renders/s   x{cached / base:4.2f}   "
+          f"hit rate {cache.hit_rate:.3f}   {len(cache)} máscaras, {cache.nbytes / 1024 ** 2:.1f} MiB")
+    set_mask_cache(None)
+    set_render_mode(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Clonado y memoria por polígono: `Polygon` inmutable con __slots__ (clone sin
+copias, mutación copy-on-write con `with_vertex`) vs el `Polygon` anterior
+(atributos en __dict__, vértices en lista y `clone()` con `copy.deepcopy`).
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_polygon --pop 120 --polygons 300 --repeat 3
+"""
+import argparse
+import copy
+import gc
+import random
+import time
+import tracemalloc
+
+from src.genetics.polygon import Polygon
+
+
+class _LegacyPolygon:
+    """Representación anterior, para comparar."""
+
+    def __init__(self, vertices, color):
+        self.vertices = vertices
+        self.color = color
+
+    def clone(self):
+        return _LegacyPolygon(copy.deepcopy(self.vertices), copy.deepcopy(self.color))
+
+
+def _random_fields(rng, n_vertices, width, height):
+    vertices = [(rng.randint(0, width), rng.randint(0, height)) for _ in range(n_vertices)]
+    color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), rng.randint(30, 160))
+    return vertices, color
+
+
+def _bytes_per_polygon(build, fields):
+    gc.collect()
+    tracemalloc.start()
+    polygons = [build(v, c) for v, c in fields]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(polygons), polygons
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Clonado y memoria de Polygon: __slots__ inmutable vs anterior.")
+    ap.add_argument("--pop", type=int, default=120)
+    ap.add_argument("--polygons", type=int, default=300)
+    ap.add_argument("--vertices", type=int, default=3)
+    ap.add_argument("--width", type=int, default=500)
+    ap.add_argument("--height", type=int, default=400)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    n = args.pop * args.polygons
+    fields = [_random_fields(rng, args.vertices, args.width, args.height) for _ in range(n)]
+    print(f"{args.pop} individuos x {args.polygons} polígonos de {args.vertices} vértices ({n} polígonos)")
+
+    # tuplas nuevas en ambos casos, como al construir un polígono
+    legacy_bytes, legacy = _bytes_per_polygon(lambda v, c: _LegacyPolygon([(x, y) for x, y in v], (c[0], c[1], c[2], c[3])), fields)
+    slotted_bytes, slotted = _bytes_per_polygon(Polygon, fields)
+    print(f"{'memoria anterior':22s} {legacy_bytes:8.1f} B/polígono")
+    print(f"{'memoria __slots__':22s} {slotted_bytes:8.1f} B/polígono   x{legacy_bytes / slotted_bytes:4.2f}")
+
+    # Clonar la población entera, como hacían Individual.clone() y los crossovers
+    legacy_s = _time(lambda: [p.clone() for p in legacy], args.repeat)
+    slotted_s = _time(lambda: [p.clone() for p in slotted], args.repeat)
+    print(f"{'clone anterior':22s} {legacy_s * 1e9 / n:8.1f} ns/polígono")
+    print(f"{'clone inmutable':22s} {slotted_s * 1e9 / n:8.1f} ns/polígono   x{legacy_s / slotted_s:6.1f}")
+
+    # Lo que cuesta ahora una mutación: copiar solo el polígono que cambia
+    cow_s = _time(lambda: [p.with_vertex(0, (1, 1)) for p in slotted], args.repeat)
+    legacy_edit_s = _time(lambda: [_edit_vertex(p.clone()) for p in legacy], args.repeat)
+    print(f"{'clone + editar (ant.)':22s} {legacy_edit_s * 1e9 / n:8.1f} ns/polígono")
+    print(f"{'with_vertex':22s} {cow_s * 1e9 / n:8.1f} ns/polígono   x{legacy_edit_s / cow_s:6.1f}")
+
+
+def _edit_vertex(poly):
+    poly.vertices[0] = (1, 1)
+    return poly
+
+
+if __name__ == "__main__":
+    main()
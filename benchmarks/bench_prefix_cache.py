@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Re-render después de mutar un solo polígono, con y sin el cache de
+composiciones parciales (render/prefix_cache.py).
+
+Cada paso clona un individuo de la población, muta un polígono al azar con
+`single_gene_mutation` y renderiza el hijo. Con cache, el render arranca del
+último checkpoint anterior al polígono mutado.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_prefix_cache --image starry_night.jpg --pop 10 --polygons 100 --steps 200
+"""
+import argparse
+import random
+import time
+
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.mutation.single_gene_mutation import single_gene_mutation
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.render.prefix_cache import PrefixCache, set_prefix_cache
+
+
+def _run(population, img, steps, seed):
+    random.seed(seed)
+    for ind in population:
+        ind.render_array()
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        child = random.choice(population).clone()
+        single_gene_mutation(child, 1.0, img)
+        child.render_array()
+    return steps / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Re-render tras mutar un polígono, con y sin cache de prefijos.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=10)
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--steps", type=int, default=200)
+    ap.add_argument("--budget-mb", type=float, default=256)
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    w, h = img.size
+    population = [Individual(w, h, args.polygons, None, single_gene_mutation, target_img=img)
+                  for _ in range(args.pop)]
+    print(f"target {w}x{h}, {args.pop} individuos, {args.polygons} polígonos, {args.steps} mutaciones")
+
+    for mode in ("fast", "numpy"):
+        set_render_mode(mode)
+        set_prefix_cache(None)
+        base = _run(population, img, args.steps, seed=1)
+        cache = PrefixCache(int(args.budget_mb * 1024 * 1024))
+        set_prefix_cache(cache)
+        cached = _run(population, img, args.steps, seed=1)
+        print(f"{mode:6s} sin cache {base:7.1f} renders/s   con cache {cached:7.1f} renders/s   "
+              f"x{cached / base:4.2f}   hit rate {cache.hit_rate:.2f}   "
+              f"polígonos omitidos {cache.polygons_skipped / max(1, cache.polygons_skipped + cache.polygons_drawn):.0%}   "
+              f"{cache.nbytes / 1024 ** 2:.0f} MiB")
+    set_prefix_cache(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Throughput de render por modo (compat / fast / numpy) y render por lotes
+con el rasterizador NumPy, más la diferencia media de píxeles contra compat.
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_render --image starry_night.jpg --pop 20 --polygons 100
+"""
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.render.raster import render_batch
+
+
+def _time_mode(individuals, mode):
+    set_render_mode(mode)
+    t0 = time.perf_counter()
+    imgs = [np.array(ind.render(use_cache=False)) for ind in individuals]
+    return time.perf_counter() - t0, imgs
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de modos de render.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=20)
+    ap.add_argument("--polygons", type=int, default=100)
+    ap.add_argument("--scale", type=float, default=1.0, help="Escala del target (p. ej. 0.5).")
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    if args.scale != 1.0:
+        img = img.resize((max(1, int(img.width * args.scale)), max(1, int(img.height * args.scale))))
+    w, h = img.size
+    individuals = [Individual(w, h, args.polygons, None, None, target_img=img) for _ in range(args.pop)]
+
+    print(f"target {w}x{h}, {args.pop} individuos, {args.polygons} polígonos")
+    _, reference = _time_mode(individuals, "compat")
+    for mode in ("compat", "fast", "numpy"):
+        secs, imgs = _time_mode(individuals, mode)
+        diff = np.mean([np.abs(a.astype(np.int16) - b).mean() for a, b in zip(imgs, reference)])
+        print(f"{mode:14s} {args.pop / secs:9.1f} renders/s   |dif| vs compat {diff:.3f}")
+
+    arrays = [ind.genome_arrays() for ind in individuals]
+    vertices = np.stack([v for v, _ in arrays])
+    colors = np.stack([c for _, c in arrays])
+    out = np.empty((args.pop, h, w, 3), dtype=np.uint8)
+    t0 = time.perf_counter()
+    render_batch(vertices, colors, w, h, out=out)
+    secs = time.perf_counter() - t0
+    print(f"{'numpy (batch)':14s} {args.pop / secs:9.1f} renders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memoria transitoria por render: `render()` + `np.array(...)` (camino viejo de
+calculate_fitness) vs `render_array()` sobre los buffers reutilizables.
+
+Para cada render en régimen estacionario (después de calentar los buffers)
+se mide con tracemalloc el pico de memoria por encima de la línea base y se
+expresa en "imágenes" (H * W * 3 bytes).
+
+Uso (desde la raíz del repo):
+  python -m benchmarks.bench_render_memory --image starry_night.jpg --pop 10 --polygons 100
+"""
+import argparse
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.render.buffers import set_render_mode
+
+
+def _peak_per_render(individuals, render):
+    for ind in individuals:         # calentar buffers / cachés
+        render(ind)
+    peaks = []
+    tracemalloc.start()
+    for ind in individuals:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        render(ind)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+    tracemalloc.stop()
+    return max(peaks), float(np.mean(peaks))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Memoria transitoria por render.")
+    ap.add_argument("--image", default="starry_night.jpg")
+    ap.add_argument("--pop", type=int, default=10)
+    ap.add_argument("--polygons", type=int, default=100)
+    args = ap.parse_args()
+
+    img = Image.open(args.image).convert("RGB")
+    w, h = img.size
+    image_bytes = w * h * 3
+    individuals = [Individual(w, h, args.polygons, None, None, target_img=img) for _ in range(args.pop)]
+
+    print(f"target {w}x{h} ({image_bytes / 1024:.0f} KiB por imagen RGB)")
+    paths = {
+        "render() + np.array": lambda ind: np.array(ind.render(use_cache=False)),
+        "render_array()": lambda ind: ind.render_array(),
+    }
+    for mode in ("fast", "numpy"):
+        set_render_mode(mode)
+        for label, render in paths.items():
+            peak, mean = _peak_per_render(individuals, render)
+            print(f"{mode:6s} {label:22s} pico {peak / image_bytes:6.2f} img   medio {mean / image_bytes:6.2f} img")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,7 @@ def artistic_crossover(parent1: Individual, parent2: Individual, rng=None):
             child2.polygons[i] = Polygon(blended_vertices, blended_color)
 
         else:
-            child1.polygons[i] = p2_poly.clone()
-            child2.polygons[i] = p1_poly.clone()
+            child1.polygons[i] = p2_poly
+            child2.polygons[i] = p1_poly
             
     return child1, child2
\ No newline at end of file
@@ -8,10 +8,10 @@ def uniform_crossover(parent1, parent2):
     
     for i in range(num_polygons):
         if random.random() < 0.5:
-            child1.polygons[i] = parent1.polygons[i].clone()
-            child2.polygons[i] = parent2.polygons[i].clone()
+            child1.polygons[i] = parent1.polygons[i]
+            child2.polygons[i] = parent2.polygons[i]
         else:
-            child1.polygons[i] = parent2.polygons[i].clone()
-            child2.polygons[i] = parent1.polygons[i].clone()
+            child1.polygons[i] = parent2.polygons[i]
+            child2.polygons[i] = parent1.polygons[i]
             
     return child1, child2
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+
+# config key -> per-process switch. Set in the environment so the worker
+# processes (pool / replica) inherit them; each module reads its own variable.
+ENV_KEYS = {
+    "render_mode": "GEN_RENDER_MODE",            # render/buffers.py
+    "prefix_cache_mb": "GEN_PREFIX_CACHE_MB",    # render/prefix_cache.py
+    "prefix_cache_step": "GEN_PREFIX_CACHE_STEP",
+    "delta_fitness": "GEN_DELTA_FITNESS",        # fitness/delta_mse.py
+    "mask_cache_mb": "GEN_MASK_CACHE_MB",        # render/mask_cache.py (numpy only)
+    "batch_fitness_mb": "GEN_BATCH_FITNESS_MB",  # fitness/batch.py
+}
+# on/off switches, exported as "1" / "0"
+FLAG_KEYS = {"delta_fitness"}
+
+
+def apply_env_config(cfg):
+    """Export the config keys of ENV_KEYS to the environment; keys missing
+    from the config leave the variable as it is. The legacy use_fast_render
+    flag maps to render_mode "fast" / "compat" when render_mode is absent."""
+    cfg = dict(cfg)
+    if cfg.get("render_mode") is None and cfg.get("use_fast_render") is not None:
+        cfg["render_mode"] = "fast" if cfg["use_fast_render"] else "compat"
+    for key, var in ENV_KEYS.items():
+        value = cfg.get(key)
+        if value is None or value == "":
+            continue
+        if key in FLAG_KEYS:
+            value = "1" if value else "0"
+        os.environ[var] = str(value)
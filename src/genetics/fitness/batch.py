@@ -0,0 +1,94 @@
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .cutoff import supports_cutoff
+from .evaluator import FitnessEvaluator
+from .sampling import sampled_evaluator
+
+# Batched fitness evaluation.
+#
+# Scoring one render per call pays the Python and NumPy dispatch overhead
+# of every metric once per individual, which dominates for small tiles.
+# evaluate_individuals() renders the pending individuals into a
+# (B, H, W, 3) uint8 stack and scores each stack with a single
+# evaluator.score_batch() call. B is chosen so that the stack plus the
+# metric's float32 temporaries (FitnessEvaluator.batch_bytes) stay within
+# the per-process budget GEN_BATCH_FITNESS_MB.
+#
+# Individuals that already have a fitness keep it. Individuals on the
+# delta-MSE path, evaluators that are plain functions and cutoff-aware
+# (early-abort) evaluations are scored one by one through
+# Individual.calculate_fitness as before. With a pixel sample
+# (fitness/sampling.py) the stack holds the sampled mosaics and is scored by
+# the evaluator prepared on the target mosaic.
+
+
+def chunk_size(evaluator: FitnessEvaluator, shape: Sequence[int], budget_bytes: int) -> int:
+    """How many candidates of `shape` fit in `budget_bytes` at once (>= 1)."""
+    return max(1, int(budget_bytes // max(1, evaluator.batch_bytes(shape))))
+
+
+def evaluate_individuals(individuals, target: np.ndarray, budget_bytes: Optional[int] = None,
+                         min_fitness: Optional[float] = None, sample=None) -> List[float]:
+    """Fitness of each individual, scored in memory-bounded stacked batches.
+
+    With min_fitness (early-abort generations) metrics that can stop early
+    are scored one by one through calculate_fitness instead. With sample
+    only the sampled pixels are scored.
+    """
+    if budget_bytes is None:
+        budget_bytes = batch_fitness_budget()
+    results: List[Optional[float]] = [None] * len(individuals)
+    groups = {}
+    for i, individual in enumerate(individuals):
+        method = individual.fitness_method
+        if (budget_bytes <= 0 or individual.fitness != float('inf')
+                or not isinstance(method, FitnessEvaluator)
+                or (sample is None and individual.uses_delta_fitness())
+                or (min_fitness is not None and supports_cutoff(method))):
+            results[i] = individual.calculate_fitness(target, min_fitness=min_fitness, sample=sample)
+        else:
+            groups.setdefault(id(method), (method, []))[1].append(i)
+
+    for evaluator, indices in groups.values():
+        if sample is not None:
+            evaluator = sampled_evaluator(evaluator, target, sample)
+            shape = evaluator.target.shape
+        else:
+            if target is not evaluator.target:
+                evaluator.prepare(target)
+            shape = target.shape
+        size = min(len(indices), chunk_size(evaluator, shape, budget_bytes))
+        stack = np.empty((size,) + shape, dtype=np.uint8)
+        for start in range(0, len(indices), size):
+            chunk = indices[start:start + size]
+            for j, i in enumerate(chunk):
+                individual = individuals[i]
+                # render_array() reuses one pooled buffer: copy it out now
+                generated = np.asarray(individual.img) if individual.img is not None else individual.render_array()
+                stack[j] = sample.take(generated) if sample is not None else generated
+            scores = evaluator.score_batch(stack[:len(chunk)])
+            for i, score in zip(chunk, scores):
+                individuals[i].fitness = float(score)
+                results[i] = individuals[i].fitness
+    return results
+
+
+# Per-process budget, GEN_BATCH_FITNESS_MB (0 / unset = one call per individual)
+_budget: Optional[int] = None
+
+
+def batch_fitness_budget() -> int:
+    global _budget
+    if _budget is None:
+        budget_mb = float(os.environ.get("GEN_BATCH_FITNESS_MB", "0") or 0)
+        _budget = int(budget_mb * 1024 * 1024) if budget_mb > 0 else 0
+    return _budget
+
+
+def set_batch_fitness_budget(budget_bytes: Optional[int]):
+    """Override the budget for this process (None re-reads GEN_BATCH_FITNESS_MB)."""
+    global _budget
+    _budget = budget_bytes
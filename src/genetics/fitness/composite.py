@@ -0,0 +1,109 @@
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .deltaE import rgb_to_lab32
+from .evaluator import FitnessEvaluator
+
+# Composite fitness pipeline.
+#
+# The mixed fitnesses combine MSE, SSIM and deltaE over the same render.
+# Run separately, each metric re-casts the render to float and deltaE
+# converts it to Lab on its own. A CompositeEvaluator wraps the batch in a
+# Candidates object whose intermediates are built on first use and shared
+# by every component:
+#
+#   candidates.planes   float32 (B, C, H, W)   MSE and SSIM
+#   candidates.lab      float32 (3, B, H, W)   deltaE (its L plane is the
+#                                              luminance; SSIM stays per
+#                                              channel to match skimage)
+#
+# Components score from those through score_candidates(); the composite
+# only combines the per-component arrays. Time spent building each
+# intermediate and inside each component is accumulated in `timings`
+# (seconds) and drained with take_timings() for the metrics CSV.
+
+
+class Candidates:
+    """A (B, H, W[, C]) uint8 batch plus lazily built shared intermediates."""
+
+    def __init__(self, stack: np.ndarray):
+        self.stack = stack
+        self.gray = stack.ndim == 3
+        self.timings: Dict[str, float] = {}
+        self._planes = None
+        self._lab = None
+
+    def _timed(self, name, build):
+        t0 = time.perf_counter()
+        value = build()
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - t0
+        return value
+
+    @property
+    def planes(self) -> np.ndarray:
+        if self._planes is None:
+            self._planes = self._timed("planes", self._build_planes)
+        return self._planes
+
+    @property
+    def lab(self) -> np.ndarray:
+        if self._lab is None:
+            self._lab = self._timed("lab", lambda: rgb_to_lab32(self.stack))
+        return self._lab
+
+    def _build_planes(self):
+        if self.gray:
+            return self.stack[:, None].astype(np.float32)
+        return np.moveaxis(self.stack, -1, 1).astype(np.float32)
+
+    @property
+    def shared_seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+class CompositeEvaluator(FitnessEvaluator):
+    """Weighted combination of component evaluators over shared intermediates."""
+
+    def __init__(self):
+        super().__init__()
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def batch_temporaries(self):
+        # planes y lab compartidos viven durante todo el lote
+        return 2 + sum(component.batch_temporaries for _, component in self.components())
+
+    def components(self) -> Tuple[Tuple[str, FitnessEvaluator], ...]:
+        raise NotImplementedError
+
+    def combine(self, scores: Dict[str, np.ndarray]) -> np.ndarray:
+        raise NotImplementedError
+
+    def _precompute(self, target):
+        for _, component in self.components():
+            component.prepare(target)
+        return {}
+
+    def score(self, generated):
+        return float(self.score_batch(np.asarray(generated)[None])[0])
+
+    def score_batch(self, stack):
+        candidates = Candidates(stack)
+        scores = {}
+        for name, component in self.components():
+            shared_before = candidates.shared_seconds
+            t0 = time.perf_counter()
+            scores[name] = component.score_candidates(candidates)
+            # el tiempo de armar un intermedio se cuenta aparte, no en el
+            # componente que lo pidió primero
+            elapsed = time.perf_counter() - t0 - (candidates.shared_seconds - shared_before)
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+        for name, seconds in candidates.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        return np.asarray(self.combine(scores), dtype=np.float64)
+
+    def take_timings(self) -> Dict[str, float]:
+        timings, self.timings = self.timings, {}
+        return timings
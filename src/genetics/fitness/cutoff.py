@@ -0,0 +1,110 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .deltaE import DeltaEEvaluator, rgb_to_lab32, _DELTAE_FUNCTIONS
+from .delta_mse import squared_error_sum, sse_fitness
+from .mse import MSEEvaluator, mse_fitness
+
+# Cutoff-aware (early-abort) evaluation.
+#
+# With traditional_selection the next generation is the best N of the old
+# population plus the offspring, so a child whose fitness is below the
+# worst fitness of the old population can never survive: the N old
+# individuals alone already beat it. When the population defers
+# replacement until after evaluation (Population(early_abort=True)), it
+# passes that worst fitness as `min_fitness` with every pending child.
+#
+# MSE and deltaE are means over pixels, so fitness < min_fitness is the same
+# as the summed error exceeding a budget, (1 / min_fitness - 1) * n. The
+# error is accumulated in CUTOFF_BANDS row bands; as soon as the partial
+# sum is over budget the candidate is rejected with REJECTED_FITNESS and the
+# remaining rows are never scored. Candidates that finish get exactly the
+# fitness the full evaluation gives (MSE in exact integers, as delta_mse).
+# With delta fitness on, delta_mse.evaluate_delta applies the same SSE
+# budget to the full render or to the updated dirty-rectangle SSE.
+# Other metrics are scored in full.
+
+REJECTED_FITNESS = float('-inf')
+CUTOFF_BANDS = 16
+
+
+def supports_cutoff(fitness_method) -> bool:
+    return (fitness_method is mse_fitness
+            or type(fitness_method) in (MSEEvaluator, DeltaEEvaluator))
+
+
+def _bands(height: int):
+    step = max(1, math.ceil(height / CUTOFF_BANDS))
+    return [(r0, min(height, r0 + step)) for r0 in range(0, height, step)]
+
+
+def sse_budget(min_fitness: float, n_values: int) -> float:
+    """Largest SSE whose MSE fitness is still >= min_fitness."""
+    return (1 / min_fitness - 1) * n_values
+
+
+def sse_with_cutoff(target, generated, budget) -> Tuple[Optional[int], int]:
+    """(exact SSE or None once it exceeds budget, rows scored)."""
+    sse = 0
+    for r0, r1 in _bands(target.shape[0]):
+        sse += squared_error_sum(target[r0:r1], generated[r0:r1])
+        if sse > budget:
+            return None, r1
+    return sse, target.shape[0]
+
+
+def _mse_cutoff(target, generated, min_fitness):
+    sse, rows = sse_with_cutoff(target, generated, sse_budget(min_fitness, target.size))
+    return (REJECTED_FITNESS if sse is None else sse_fitness(sse, target.size)), rows
+
+
+def _delta_e_cutoff(evaluator, generated, min_fitness):
+    target_lab = evaluator.cache["lab"]
+    height = target_lab.shape[1]
+    n_pixels = target_lab[0].size
+    budget = (1 / min_fitness - 1) * n_pixels
+    delta_e = _DELTAE_FUNCTIONS[evaluator.mode]
+    total = 0.0
+    for r0, r1 in _bands(height):
+        band = delta_e(target_lab[:, r0:r1], rgb_to_lab32(generated[r0:r1]))
+        total += float(band.sum(dtype=np.float64))
+        if total > budget:
+            return REJECTED_FITNESS, r1
+    return 1 / (1 + total / n_pixels), height
+
+
+def score_with_cutoff(fitness_method, target, generated, min_fitness) -> Tuple[float, int]:
+    """(fitness or REJECTED_FITNESS, rows scored) for a supports_cutoff method."""
+    if min_fitness is None or min_fitness <= 0:
+        return fitness_method(target, generated), target.shape[0]
+    if type(fitness_method) is DeltaEEvaluator:
+        if target is not fitness_method.target:
+            fitness_method.prepare(target)
+        return _delta_e_cutoff(fitness_method, generated, min_fitness)
+    return _mse_cutoff(target, generated, min_fitness)
+
+
+class CutoffStats:
+    """Per-process pixels scored / skipped by cutoff-aware evaluations."""
+
+    def __init__(self):
+        self.scored = 0
+        self.skipped = 0
+        self.rejected = 0
+        self._reported = (0, 0)
+
+    def add(self, rows_scored, height, width, rejected):
+        self.scored += rows_scored * width
+        self.skipped += (height - rows_scored) * width
+        self.rejected += int(rejected)
+
+    def take_counts(self):
+        """(pixels scored, pixels skipped) since the previous call."""
+        scored, skipped = self.scored - self._reported[0], self.skipped - self._reported[1]
+        self._reported = (self.scored, self.skipped)
+        return scored, skipped
+
+
+cutoff_stats = CutoffStats()
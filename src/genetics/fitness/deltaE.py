@@ -2,6 +2,8 @@ import numpy as np
 from skimage import color
 from skimage.color import deltaE_ciede2000
 
+from .evaluator import FitnessEvaluator
+
 def delta_e_fitness(target_img: np.ndarray, generated_img: np.ndarray) -> float:
     target_float = target_img.astype(np.float32) / 255.0
     generated_float = generated_img.astype(np.float32) / 255.0
@@ -13,4 +15,186 @@ def delta_e_fitness(target_img: np.ndarray, generated_img: np.ndarray) -> float:
     
     mean_delta_e = np.mean(delta_e)
     
-    return 1 / (1 + mean_delta_e)
\ No newline at end of file
+    return 1 / (1 + mean_delta_e)
+
+
+# deltaE rápido, mismas fórmulas que skimage (rgb2lab con D65/2°,
+# deltaE_ciede2000 / deltaE_ciede94 / deltaE_cie76) pero:
+#   - sRGB -> lineal por una tabla de 256 entradas en vez de pow() por píxel
+#   - RGB lineal -> XYZ / blanco de referencia en una sola matriz 3x3
+#   - Lab y la diferencia de color en float32, sin copias por canal
+#   - el Lab del target se calcula una vez en prepare()
+# Diferencia con delta_e_fitness < DELTAE_TOLERANCE en el fitness.
+DELTAE_MODES = ("ciede2000", "cie94", "cie76")
+DELTAE_TOLERANCE = 1e-5
+
+_XYZ_FROM_RGB = np.array([[0.412453, 0.357580, 0.180423],
+                          [0.212671, 0.715160, 0.072169],
+                          [0.019334, 0.119193, 0.950227]])
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+# filas escaladas por el blanco: xyz / white en un solo producto
+_XYZN_FROM_RGB = (_XYZ_FROM_RGB / _WHITE_D65[:, None]).T.astype(np.float32)
+
+
+def _srgb_lut():
+    c = np.arange(256, dtype=np.float64) / 255.0
+    linear = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    return linear.astype(np.float32)
+
+
+SRGB_TO_LINEAR = _srgb_lut()
+
+
+def rgb_to_lab32(img: np.ndarray) -> np.ndarray:
+    """uint8 (..., 3) sRGB -> float32 (3, ...) planes L, a, b."""
+    xyz = SRGB_TO_LINEAR[img] @ _XYZN_FROM_RGB
+    xyz = np.moveaxis(xyz, -1, 0)
+    small = xyz <= 0.008856
+    f = np.cbrt(xyz)
+    f[small] = 7.787 * xyz[small] + np.float32(16.0 / 116.0)
+    fx, fy, fz = f
+    lab = np.empty_like(f)
+    np.multiply(fy, 116.0, out=lab[0])
+    lab[0] -= 16.0
+    np.subtract(fx, fy, out=lab[1])
+    lab[1] *= 500.0
+    np.subtract(fy, fz, out=lab[2])
+    lab[2] *= 200.0
+    return lab
+
+
+def _cart2polar_2pi(x, y):
+    r = np.hypot(x, y)
+    t = np.arctan2(y, x)
+    t[t < 0] += np.float32(2 * np.pi)
+    return r, t
+
+
+def ciede2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """CIEDE2000 (kL = kC = kH = 1) between (3, ...) Lab planes."""
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+    f32 = np.float32
+
+    Cbar = 0.5 * (np.hypot(a1, b1) + np.hypot(a2, b2))
+    c7 = Cbar ** 7
+    G = 0.5 * (1 - np.sqrt(c7 / (c7 + f32(25 ** 7))))
+    scale = 1 + G
+    C1, h1 = _cart2polar_2pi(a1 * scale, b1)
+    C2, h2 = _cart2polar_2pi(a2 * scale, b2)
+
+    Lbar = 0.5 * (L1 + L2)
+    tmp = (Lbar - 50) ** 2
+    SL = 1 + 0.015 * tmp / np.sqrt(20 + tmp)
+    L_term = (L2 - L1) / SL
+
+    Cbar = 0.5 * (C1 + C2)
+    SC = 1 + 0.045 * Cbar
+    C_term = (C2 - C1) / SC
+
+    h_diff = h2 - h1
+    h_sum = h1 + h2
+    CC = C1 * C2
+    zero = CC == 0.0
+    wrap = np.abs(h_diff) > f32(np.pi)
+
+    dH = h_diff.copy()
+    dH[h_diff > np.pi] -= f32(2 * np.pi)
+    dH[h_diff < -np.pi] += f32(2 * np.pi)
+    dH[zero] = 0.0
+    dH_term = 2 * np.sqrt(CC) * np.sin(dH / 2)
+
+    wrap &= ~zero
+    low = wrap & (h_sum < f32(2 * np.pi))
+    wrap &= ~low
+    Hbar = h_sum
+    Hbar[low] += f32(2 * np.pi)
+    Hbar[wrap] -= f32(2 * np.pi)
+    Hbar[zero] *= 2
+    Hbar *= 0.5
+
+    T = (1
+         - 0.17 * np.cos(Hbar - f32(np.deg2rad(30)))
+         + 0.24 * np.cos(2 * Hbar)
+         + 0.32 * np.cos(3 * Hbar + f32(np.deg2rad(6)))
+         - 0.20 * np.cos(4 * Hbar - f32(np.deg2rad(63))))
+    SH = 1 + 0.015 * Cbar * T
+    H_term = dH_term / SH
+
+    c7 = Cbar ** 7
+    Rc = 2 * np.sqrt(c7 / (c7 + f32(25 ** 7)))
+    dtheta = f32(np.deg2rad(30)) * np.exp(-(((Hbar * f32(180 / np.pi) - 275) / 25) ** 2))
+    R_term = -np.sin(2 * dtheta) * Rc * C_term * H_term
+
+    dE2 = L_term ** 2
+    dE2 += C_term ** 2
+    dE2 += H_term ** 2
+    dE2 += R_term
+    np.maximum(dE2, 0, out=dE2)
+    return np.sqrt(dE2, out=dE2)
+
+
+def cie94(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """CIE94 (artes gráficas: kL = 1, K1 = 0.045, K2 = 0.015), lab1 de referencia."""
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    dC = C1 - C2
+    # = 2 (C1 C2 - a1 a2 - b1 b2) sin la cancelación en float32 entre colores parecidos
+    dH2 = (a1 - a2) ** 2 + (b1 - b2) ** 2 - dC ** 2
+    dE2 = (L1 - L2) ** 2
+    dE2 += (dC / (1 + 0.045 * C1)) ** 2
+    dE2 += dH2 / (1 + 0.015 * C1) ** 2
+    np.maximum(dE2, 0, out=dE2)
+    return np.sqrt(dE2, out=dE2)
+
+
+def cie76(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """Distancia euclídea en Lab."""
+    diff = lab1 - lab2
+    diff *= diff
+    return np.sqrt(diff.sum(axis=0))
+
+
+_DELTAE_FUNCTIONS = {"ciede2000": ciede2000, "cie94": cie94, "cie76": cie76}
+
+
+class DeltaEEvaluator(FitnessEvaluator):
+    """delta_e_fitness con el Lab del target cacheado y la conversión en float32.
+
+    `mode` elige la fórmula: "ciede2000" (la de delta_e_fitness), o las
+    aproximaciones más baratas "cie94" y "cie76".
+    """
+
+    # Lab más los planos intermedios de CIEDE2000 (cada uno 1/3 de imagen)
+    batch_temporaries = 8
+
+    def __init__(self, mode="ciede2000"):
+        super().__init__()
+        if mode not in _DELTAE_FUNCTIONS:
+            raise ValueError(f"deltae_mode '{mode}' no disponible (opciones: {', '.join(DELTAE_MODES)})")
+        self.mode = mode
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(mode=cfg.get("deltae_mode", "ciede2000"))
+
+    def _precompute(self, target):
+        return {"lab": rgb_to_lab32(target)}
+
+    def score(self, generated):
+        return float(self.score_batch(np.asarray(generated)[None])[0])
+
+    def score_batch(self, stack):
+        return self._score_lab(rgb_to_lab32(stack))
+
+    def score_candidates(self, candidates):
+        return self._score_lab(candidates.lab)
+
+    def _score_lab(self, lab):
+        # Lab (3, B, H, W) contra el del target difundido sobre B
+        target_lab = self.cache["lab"][:, None]
+        delta_e = _DELTAE_FUNCTIONS[self.mode](target_lab, lab)
+        mean_delta_e = delta_e.reshape(lab.shape[1], -1).mean(axis=1, dtype=np.float64)
+        return 1 / (1 + mean_delta_e)
@@ -0,0 +1,172 @@
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import ImageDraw
+
+from ..render.buffers import render_buffers
+from ..render.raster import render_genome
+from .mse import MSEEvaluator, mse_fitness
+
+# Bounding-box delta evaluation for MSE.
+#
+# An evaluated individual keeps a DeltaState: the polygons it was rendered
+# from, its rendered image and the exact integer sum of squared errors (SSE)
+# against the target. A clone (and therefore every child) starts from its
+# parent's state. When the child is scored, its polygons are diffed against
+# that state; only pixels inside the union of the old and new bounding boxes
+# of the changed polygons can differ, so just that rectangle is re-rendered
+# from the polygons touching it and the SSE is updated with the rectangle's
+# old and new contributions. The numpy rasterizer renders just that window
+# (spans still computed in canvas coordinates, so the pixels are identical);
+# PIL's polygon filler rounds differently once coordinates are shifted, so
+# the fast backend draws the touching polygons at their real position on the
+# pooled full-size canvas and crops the rectangle.
+#
+# Fitness is 1 / (1 + SSE / n_values), i.e. mse_fitness computed exactly in
+# integers. Full evaluation is used when there is no state (first
+# evaluation, genomes that came through a pool worker), when the polygon
+# count changed, or when the dirty rectangle covers more than
+# MAX_DIRTY_FRACTION of the image. Non-local metrics (SSIM, deltaE, the
+# mixes: anything but mse_fitness / MSEEvaluator) and the compat backend
+# always take the full path in Individual.calculate_fitness.
+
+MAX_DIRTY_FRACTION = 0.5
+
+
+class DeltaState:
+    __slots__ = ("keys", "image", "sse")
+
+    def __init__(self, keys, image, sse):
+        self.keys = keys
+        self.image = image
+        self.sse = sse
+
+
+def supports_delta(fitness_method) -> bool:
+    """Only plain MSE is local enough for bounding-box updates."""
+    return fitness_method is mse_fitness or type(fitness_method) is MSEEvaluator
+
+
+def polygon_keys(polygons) -> List[Tuple[tuple, tuple]]:
+    return [(p.vertices, p.color) for p in polygons]
+
+
+def squared_error_sum(target: np.ndarray, generated: np.ndarray) -> int:
+    diff = (target.astype(np.int32) - generated.astype(np.int32)).ravel()
+    return int(np.einsum("i,i->", diff, diff, dtype=np.int64))
+
+
+def sse_fitness(sse: int, n_values: int) -> float:
+    return 1 / (1 + sse / n_values)
+
+
+def _bbox(vertices):
+    xs = [v[0] for v in vertices]
+    ys = [v[1] for v in vertices]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def dirty_rect(old_keys, new_keys, width, height) -> Optional[Tuple[int, int, int, int]]:
+    """Half-open (x0, y0, x1, y1) covering every changed polygon, () if nothing
+    changed, or None when a full evaluation is needed."""
+    if len(old_keys) != len(new_keys):
+        return None
+    x0 = y0 = None
+    for old, new in zip(old_keys, new_keys):
+        if old == new:
+            continue
+        for verts in (old[0], new[0]):
+            bx0, by0, bx1, by1 = _bbox(verts)
+            if x0 is None:
+                x0, y0, x1, y1 = bx0, by0, bx1, by1
+            else:
+                x0, y0, x1, y1 = min(x0, bx0), min(y0, by0), max(x1, bx1), max(y1, by1)
+    if x0 is None:
+        return ()
+    # one pixel of slack around the vertex bbox, clipped to the canvas
+    x0, y0 = max(0, x0 - 1), max(0, y0 - 1)
+    x1, y1 = min(width, x1 + 2), min(height, y1 + 2)
+    if x0 >= x1 or y0 >= y1:
+        return ()
+    if (x1 - x0) * (y1 - y0) > MAX_DIRTY_FRACTION * width * height:
+        return None
+    return x0, y0, x1, y1
+
+
+def render_rect(keys, rect, width, height, mode) -> np.ndarray:
+    """Render the window rect of a genome given by its polygon keys as (h, w, 3) uint8."""
+    x0, y0, x1, y1 = rect
+    touching = []
+    for verts, color in keys:
+        bx0, by0, bx1, by1 = _bbox(verts)
+        if bx1 >= x0 and bx0 < x1 and by1 >= y0 and by0 < y1:
+            touching.append((verts, color))
+    if mode == "numpy":
+        w, h = x1 - x0, y1 - y0
+        if not touching:
+            return np.full((h, w, 3), 255, dtype=np.uint8)
+        vertices = np.array([v for v, _ in touching], dtype=np.int32)
+        colors = np.array([c for _, c in touching], dtype=np.uint8)
+        return render_genome(vertices, colors, w, h, origin=(x0, y0))
+    canvas = render_buffers(width, height).canvas
+    draw = ImageDraw.Draw(canvas, "RGBA")
+    for verts, color in touching:
+        draw.polygon(verts, fill=color)
+    return np.asarray(canvas.crop(rect))
+
+
+def evaluate_delta(individual, target: np.ndarray, mode: str, min_fitness: Optional[float] = None) -> Tuple[float, int]:
+    """(MSE fitness, rows scored) of individual, incremental over its parent's
+    DeltaState when possible. With min_fitness (early abort) the fitness is
+    REJECTED_FITNESS as soon as the SSE exceeds that fitness's budget; a
+    rejected individual keeps its parent's state."""
+    from .cutoff import REJECTED_FITNESS, sse_budget, sse_with_cutoff  # cutoff imports this module
+    budget = sse_budget(min_fitness, target.size) if min_fitness is not None and min_fitness > 0 else None
+    keys = polygon_keys(individual.polygons)
+    base = individual.delta_base
+    rect = None
+    if base is not None:
+        rect = dirty_rect(base.keys, keys, individual.width, individual.height)
+
+    if rect is None:
+        image = individual.render_array().copy()
+        if budget is None:
+            sse = squared_error_sum(target, image)
+        else:
+            sse, rows = sse_with_cutoff(target, image, budget)
+            if sse is None:
+                return REJECTED_FITNESS, rows
+    else:
+        sse = base.sse
+        patch = None
+        if rect:
+            x0, y0, x1, y1 = rect
+            window = (slice(y0, y1), slice(x0, x1))
+            patch = render_rect(keys, rect, individual.width, individual.height, mode)
+            sse += squared_error_sum(target[window], patch) - squared_error_sum(target[window], base.image[window])
+        if budget is not None and sse > budget:
+            return REJECTED_FITNESS, target.shape[0]
+        image = base.image.copy()
+        if patch is not None:
+            image[window] = patch
+
+    individual.delta_base = DeltaState(keys, image, sse)
+    return sse_fitness(sse, target.size), target.shape[0]
+
+
+# Per-process switch, GEN_DELTA_FITNESS ("1" / "true" = on)
+_enabled: Optional[bool] = None
+
+
+def delta_fitness_enabled() -> bool:
+    global _enabled
+    if _enabled is None:
+        _enabled = os.environ.get("GEN_DELTA_FITNESS", "").lower() in ("1", "true", "yes", "on")
+    return _enabled
+
+
+def set_delta_fitness(enabled: Optional[bool]):
+    """Override the switch for this process (None re-reads GEN_DELTA_FITNESS)."""
+    global _enabled
+    _enabled = enabled
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Fitness evaluators.
+#
+# A FitnessEvaluator separates the work that only depends on the target
+# (float casts, Lab conversion, local statistics...) from the per-candidate
+# scoring:
+#
+#   evaluator.prepare(target)     once per run / per worker
+#   evaluator.score(generated)    one (H, W, 3) uint8 render -> fitness
+#   evaluator.score_batch(stack)  (B, H, W, 3) renders -> (B,) fitnesses
+#
+# Options come from the run's JSON config through from_config(cfg).
+# Evaluators are also callable as fitness(target, generated), the signature
+# Individual.calculate_fitness uses, and prepare themselves whenever they
+# see a different target object. Pickling drops the prepared arrays, so an
+# evaluator travels to the workers as configuration only.
+
+
+class FitnessEvaluator:
+    # float32 image-sized arrays alive at once per candidate in score_batch
+    # (sizes the chunks of fitness/batch.py)
+    batch_temporaries = 0
+
+    def __init__(self):
+        self.target = None
+        self.cache: Dict[str, Any] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "FitnessEvaluator":
+        return cls()
+
+    def prepare(self, target: np.ndarray) -> "FitnessEvaluator":
+        self.target = target
+        self.cache = self._precompute(target)
+        return self
+
+    def _precompute(self, target: np.ndarray) -> Dict[str, Any]:
+        return {}
+
+    def score(self, generated: np.ndarray) -> float:
+        raise NotImplementedError
+
+    def score_batch(self, stack: np.ndarray) -> np.ndarray:
+        return np.array([self.score(generated) for generated in stack], dtype=np.float64)
+
+    def batch_bytes(self, shape) -> int:
+        """Approximate peak bytes per candidate of `shape` in score_batch."""
+        return int(np.prod(shape)) * (1 + 4 * self.batch_temporaries)
+
+    def score_candidates(self, candidates) -> np.ndarray:
+        """Score a composite.Candidates batch, reusing its shared intermediates."""
+        return self.score_batch(candidates.stack)
+
+    def take_timings(self) -> Dict[str, float]:
+        """Seconds per fitness component since the last call (composites only)."""
+        return {}
+
+    def __call__(self, target: np.ndarray, generated: np.ndarray) -> float:
+        if target is not self.target:
+            self.prepare(target)
+        return self.score(generated)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["target"] = None
+        state["cache"] = {}
+        return state
+
+
+class FunctionEvaluator(FitnessEvaluator):
+    """Adapter for plain fitness(target, generated) functions."""
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def score(self, generated: np.ndarray) -> float:
+        return self.function(self.target, generated)
+
+
+def resolve_evaluator(method, cfg: Optional[Dict[str, Any]] = None) -> FitnessEvaluator:
+    """Accept an evaluator instance, an evaluator class or a plain function.
+
+    Classes are built with their options from `cfg` (the run config).
+    """
+    if isinstance(method, FitnessEvaluator):
+        return method
+    if isinstance(method, type) and issubclass(method, FitnessEvaluator):
+        return method.from_config(cfg or {})
+    if callable(method):
+        return FunctionEvaluator(method)
+    raise TypeError(f"Not a fitness evaluator or function: {method!r}")
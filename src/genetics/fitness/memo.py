@@ -0,0 +1,62 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+# Genome-hash fitness memo.
+#
+# With a low mutation rate many children are unmutated clones of a parent
+# (no crossover, mutation that did not fire) and would be rendered and
+# scored again. The memo maps a content hash of the genome (canvas size,
+# polygon vertices and RGBA colors, see genome_hash) to the fitness it got.
+# Population.collect_pending() serves dirty individuals from it before they
+# are submitted and stores every new finite result (an early-abort
+# REJECTED_FITNESS is not the genome's fitness). Bounded by an entry count with
+# LRU eviction; it lives in the process that owns the Population (the
+# master), across generations. Only valid for one target and one fitness
+# method, so every Population keeps its own.
+
+
+def genome_hash(individual) -> bytes:
+    """16-byte digest of the genome; equal genomes hash equal in any process."""
+    vertices, colors = individual.genome_arrays()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{individual.width}x{individual.height}:{vertices.shape}".encode())
+    h.update(vertices.tobytes())
+    h.update(colors.tobytes())
+    return h.digest()
+
+
+class FitnessMemo:
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._entries: "OrderedDict[bytes, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: bytes) -> Optional[float]:
+        fitness = self._entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, key: bytes, fitness: float):
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -1,10 +1,33 @@
 import numpy as np
 from skimage.metrics import structural_similarity as ssim
-from .ssim import ssim_fitness
-from .deltaE import delta_e_fitness
+from .ssim import ssim_fitness, SSIMEvaluator
+from .deltaE import delta_e_fitness, DeltaEEvaluator
+from .composite import CompositeEvaluator
 
 def mixed_fitness(target, generated, alpha=0.5):
     ssim_score = ssim_fitness(target, generated)
     delta_e_score = 1.0 - (delta_e_fitness(target, generated)) 
     
-    return (alpha * ssim_score) + ((1 - alpha) * delta_e_score)
\ No newline at end of file
+    return (alpha * ssim_score) + ((1 - alpha) * delta_e_score)
+
+
+class MixedEvaluator(CompositeEvaluator):
+    """mixed_fitness sobre SSIM y deltaE preparados, con los intermedios compartidos."""
+
+    def __init__(self, alpha=0.5, deltae_mode="ciede2000"):
+        super().__init__()
+        self.alpha = alpha
+        self.ssim = SSIMEvaluator()
+        self.delta_e = DeltaEEvaluator(deltae_mode)
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(alpha=float(cfg.get("alpha", 0.5)),
+                   deltae_mode=cfg.get("deltae_mode", "ciede2000"))
+
+    def components(self):
+        return (("ssim", self.ssim), ("delta_e", self.delta_e))
+
+    def combine(self, scores):
+        delta_e_score = 1.0 - scores["delta_e"]
+        return (self.alpha * scores["ssim"]) + ((1 - self.alpha) * delta_e_score)
@@ -1,7 +1,8 @@
-from .mse import mse_fitness
-from .ssim import ssim_fitness
+from .mse import mse_fitness, MSEEvaluator
+from .ssim import ssim_fitness, SSIMEvaluator
 from ..individual import Individual
-from .deltaE import delta_e_fitness
+from .deltaE import delta_e_fitness, DeltaEEvaluator
+from .composite import CompositeEvaluator
 
 def mixed_fitness_mse_ssim_deltaE(
     target,
@@ -22,4 +23,35 @@ def mixed_fitness_mse_ssim_deltaE(
         (weight_deltae * delta_e_fit)
     )
 
-    return combined_fitness
\ No newline at end of file
+    return combined_fitness
+
+
+class MixedMSESSIMDeltaEEvaluator(CompositeEvaluator):
+    """mixed_fitness_mse_ssim_deltaE sobre evaluadores preparados, con los intermedios compartidos."""
+
+    def __init__(self, weight_mse=0.66, weight_ssim=0.15, weight_deltae=0.19, deltae_mode="ciede2000"):
+        super().__init__()
+        self.weight_mse = weight_mse
+        self.weight_ssim = weight_ssim
+        self.weight_deltae = weight_deltae
+        self.mse = MSEEvaluator()
+        self.ssim = SSIMEvaluator()
+        self.delta_e = DeltaEEvaluator(deltae_mode)
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(weight_mse=float(cfg.get("weight_mse", 0.66)),
+                   weight_ssim=float(cfg.get("weight_ssim", 0.15)),
+                   weight_deltae=float(cfg.get("weight_deltae", 0.19)),
+                   deltae_mode=cfg.get("deltae_mode", "ciede2000"))
+
+    def components(self):
+        return (("mse", self.mse), ("ssim", self.ssim), ("delta_e", self.delta_e))
+
+    def combine(self, scores):
+        normalized_ssim_fit = (scores["ssim"] + 1) / 2
+        return (
+            (self.weight_mse * scores["mse"]) +
+            (self.weight_ssim * normalized_ssim_fit) +
+            (self.weight_deltae * scores["delta_e"])
+        )
@@ -1,6 +1,36 @@
 import numpy as np
 
+from .evaluator import FitnessEvaluator
+
 # Solo tiene en cuenta la diferencia pixel a pixel
 def mse_fitness(target, generated):
     error = np.mean((target.astype(np.float32) - generated.astype(np.float32)) ** 2)
-    return 1 / (1 + error) 
\ No newline at end of file
+    return 1 / (1 + error) 
+
+
+class MSEEvaluator(FitnessEvaluator):
+    """mse_fitness con el target convertido a float32 una sola vez."""
+
+    batch_temporaries = 1
+
+    def _precompute(self, target):
+        planes = target[None, None] if target.ndim == 2 else np.moveaxis(target, -1, 0)[None]
+        return {"target": target.astype(np.float32), "planes": planes.astype(np.float32)}
+
+    def score(self, generated):
+        error = np.mean((self.cache["target"] - generated.astype(np.float32)) ** 2)
+        return 1 / (1 + error)
+
+    def score_batch(self, stack):
+        # en el lugar: un solo arreglo del tamaño del lote
+        diff = stack.astype(np.float32)
+        diff -= self.cache["target"]
+        np.square(diff, out=diff)
+        error = diff.reshape(len(stack), -1).mean(axis=1)
+        return 1 / (1 + error.astype(np.float64))
+
+    def score_candidates(self, candidates):
+        diff = candidates.planes - self.cache["planes"]
+        np.square(diff, out=diff)
+        error = diff.reshape(len(diff), -1).mean(axis=1)
+        return 1 / (1 + error.astype(np.float64))
@@ -0,0 +1,99 @@
+import hashlib
+import math
+import pickle
+
+import numpy as np
+
+from .evaluator import FitnessEvaluator
+
+# Pixel-subsampled fitness.
+#
+# For large targets the metric (SSIM windows, Lab conversion) costs more
+# than the render. With Population(sample_fraction=f) every candidate is
+# scored on the same subset of about f of the pixels: a grid of row bands
+# x column bands (PixelSample), gathered from the render and the target
+# into a small mosaic that any evaluator can score. Comparisons between
+# individuals stay fair because the whole population shares the subset:
+#
+#   "fixed"       one subset drawn at the start of the run;
+#   "stratified"  one band per stratum of rows / columns, redrawn every
+#                 sample_rerank_every generations (the population is
+#                 re-scored on the new subset when it changes).
+#
+# Sampled scores only drive selection. The population scores its best
+# individual exactly every generation (best_fitness keeps its meaning) and,
+# every sample_rerank_every generations, the top sample_rerank_top as well,
+# re-ranking them by their exact fitness (Population._rerank_exact).
+
+SAMPLE_MODES = ("fixed", "stratified")
+SAMPLE_BAND = 8
+
+
+class PixelSample:
+    """Rows x columns of the image that a sampled evaluation looks at."""
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, height: int, width: int):
+        self.rows = np.asarray(rows, dtype=np.intp)
+        self.cols = np.asarray(cols, dtype=np.intp)
+        self.shape = (height, width)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{height}x{width}".encode())
+        h.update(self.rows.tobytes())
+        h.update(self.cols.tobytes())
+        self.key = h.digest()
+
+    @property
+    def fraction(self) -> float:
+        return len(self.rows) * len(self.cols) / (self.shape[0] * self.shape[1])
+
+    def take(self, img: np.ndarray) -> np.ndarray:
+        """(H, W, ...) image -> (len(rows), len(cols), ...) mosaic."""
+        return img[self.rows][:, self.cols]
+
+
+def _stratified_bands(size: int, fraction: float, band: int, rng) -> np.ndarray:
+    band = max(1, min(band, size))
+    n_bands = max(1, min(size // band, round(size * math.sqrt(fraction) / band)))
+    edges = np.linspace(0, size, n_bands + 1).astype(int)
+    starts = [rng.integers(lo, max(lo, hi - band) + 1) for lo, hi in zip(edges[:-1], edges[1:])]
+    return np.unique(np.concatenate([np.arange(s, min(size, s + band)) for s in starts]))
+
+
+def draw_sample(height: int, width: int, fraction: float, rng, band: int = SAMPLE_BAND) -> PixelSample:
+    """Bands of `band` rows / columns, one per stratum, covering ~fraction of the pixels."""
+    if not 0 < fraction < 1:
+        raise ValueError(f"sample_fraction debe estar en (0, 1), no {fraction}")
+    return PixelSample(_stratified_bands(height, fraction, band, rng),
+                       _stratified_bands(width, fraction, band, rng), height, width)
+
+
+# id(evaluator) -> (target, sample key, copy prepared on the target mosaic)
+_sampled = {}
+
+
+def sampled_evaluator(evaluator: FitnessEvaluator, target: np.ndarray, sample: PixelSample) -> FitnessEvaluator:
+    """A copy of `evaluator` prepared on sample.take(target), kept per process."""
+    entry = _sampled.get(id(evaluator))
+    if entry is None or entry[0] is not target or entry[1] != sample.key:
+        # pickling drops target and cache (FitnessEvaluator.__getstate__)
+        copy = pickle.loads(pickle.dumps(evaluator))
+        copy.prepare(np.ascontiguousarray(sample.take(target)))
+        entry = _sampled[id(evaluator)] = (target, sample.key, copy)
+    return entry[2]
+
+
+def sampled_fitness(fitness_method, target: np.ndarray, generated: np.ndarray, sample: PixelSample) -> float:
+    """fitness_method scored on the sampled pixels of target and generated."""
+    if isinstance(fitness_method, FitnessEvaluator):
+        return sampled_evaluator(fitness_method, target, sample).score(np.ascontiguousarray(sample.take(generated)))
+    return fitness_method(sample.take(target), sample.take(generated))
+
+
+def rank_agreement(sampled, exact) -> float:
+    """Fraction of pairs ordered the same way by the two score lists."""
+    pairs = concordant = 0
+    for i in range(len(sampled)):
+        for j in range(i + 1, len(sampled)):
+            pairs += 1
+            concordant += (sampled[i] - sampled[j]) * (exact[i] - exact[j]) >= 0
+    return concordant / pairs if pairs else 1.0
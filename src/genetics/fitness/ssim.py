@@ -1,8 +1,14 @@
+import numpy as np
 from skimage.metrics import structural_similarity as ssim
 
-def ssim_fitness(target, generated):
+from .evaluator import FitnessEvaluator
+
+def _win_size(target):
     min_dim = min(target.shape[0], target.shape[1])
-    win_size = min(7, min_dim if min_dim % 2 == 1 else min_dim - 1)
+    return min(7, min_dim if min_dim % 2 == 1 else min_dim - 1)
+
+def ssim_fitness(target, generated):
+    win_size = _win_size(target)
 
     if target.ndim == 3 and target.shape[2] == 3:
         return ssim(
@@ -16,4 +22,107 @@ def ssim_fitness(target, generated):
             target, generated,
             data_range=generated.max() - generated.min(),
             win_size=win_size
-        )
\ No newline at end of file
+        )
+
+
+# SSIM rápido, mismo cálculo que skimage (ventana uniforme de win_size,
+# covarianza muestral, K1=0.01, K2=0.03, data_range del generado, promedio
+# sobre el interior sin el borde de (win_size-1)/2 píxeles) pero:
+#   - media y varianza locales del target calculadas una vez en prepare()
+#   - sumas de ventana en float32 solo sobre el interior (sumas desplazadas
+#     separables, en planos (C, H, W) contiguos)
+#   - lotes (B, H, W, C) procesados de una sola pasada
+# Diferencia con skimage < SSIM_TOLERANCE en el SSIM medio (float32 vs float64).
+K1 = 0.01
+K2 = 0.03
+SSIM_TOLERANCE = 1e-4
+
+
+def box_mean(a, win):
+    """Mean over every win x win window fully inside the last two axes."""
+    h = a.shape[-2] - win + 1
+    w = a.shape[-1] - win + 1
+    rows = a[..., 0:h, :].copy()
+    for i in range(1, win):
+        rows += a[..., i:i + h, :]
+    out = rows[..., 0:w].copy()
+    for i in range(1, win):
+        out += rows[..., i:i + w]
+    out *= 1.0 / (win * win)
+    return out
+
+
+class SSIMEvaluator(FitnessEvaluator):
+    """ssim_fitness con los momentos locales del target cacheados."""
+
+    batch_temporaries = 6
+
+    def _precompute(self, target):
+        win = _win_size(target)
+        gray = target.ndim == 2
+        x = self._planes(target[None], gray)[0]
+        np_win = win * win
+        cov_norm = np_win / (np_win - 1)
+        ux = box_mean(x, win)
+        vx = cov_norm * (box_mean(x * x, win) - ux * ux)
+        return {"win_size": win, "cov_norm": cov_norm, "gray": gray,
+                "x": x, "ux": ux, "ux2": ux * ux, "vx": vx}
+
+    @staticmethod
+    def _planes(stack, gray):
+        """(B, H, W[, C]) -> float32 (B, C, H, W)."""
+        if gray:
+            return stack[:, None].astype(np.float32)
+        return np.moveaxis(stack, -1, 1).astype(np.float32)
+
+    def score(self, generated):
+        return float(self.score_batch(np.asarray(generated)[None])[0])
+
+    def score_batch(self, stack):
+        y = self._planes(stack, self.cache["gray"])
+        return self._score_planes(y, stack, reuse=True)
+
+    def score_candidates(self, candidates):
+        return self._score_planes(candidates.planes, candidates.stack, reuse=False)
+
+    def _score_planes(self, y, stack, reuse):
+        # reuse=True: y es propio y se puede pisar; si no, es compartido
+        c = self.cache
+        win, cov_norm = c["win_size"], c["cov_norm"]
+        ux = c["ux"]
+
+        uy = box_mean(y, win)
+        uy2 = uy * uy
+        vy = box_mean(y * y, win)
+        vy -= uy2
+        vy *= cov_norm
+        if reuse:
+            y *= c["x"]
+        else:
+            y = y * c["x"]
+        vxy = box_mean(y, win)
+        uy *= ux
+        vxy -= uy
+        vxy *= cov_norm
+
+        flat = stack.reshape(len(stack), -1)
+        data_range = flat.max(axis=1).astype(np.float32) - flat.min(axis=1).astype(np.float32)
+        data_range = data_range.reshape(-1, 1, 1, 1)
+        c1 = (K1 * data_range) ** 2
+        c2 = (K2 * data_range) ** 2
+
+        # (2 ux uy + C1)(2 vxy + C2) / ((ux^2 + uy^2 + C1)(vx + vy + C2))
+        num = uy
+        num *= 2
+        num += c1
+        vxy *= 2
+        vxy += c2
+        num *= vxy
+        den = uy2
+        den += c["ux2"]
+        den += c1
+        vy += c["vx"]
+        vy += c2
+        den *= vy
+        num /= den
+        return num.reshape(len(stack), -1).mean(axis=1, dtype=np.float64)
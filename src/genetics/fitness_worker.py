@@ -0,0 +1,40 @@
+from .genome_codec import unpack_genome
+from .fitness.batch import evaluate_individuals
+from .fitness.evaluator import FitnessEvaluator
+from .shared_target import attach_shared_arrays, resolve_target
+from .worker_counters import publish_fitness_counters, publish_render_counters
+
+# Worker-side state for the fitness pool. Filled once per process by the
+# pool initializer so that tasks only carry a packed genome and a handle.
+_state = {}
+
+
+def init_fitness_worker(handles, fitness_method, counters=None):
+    attach_shared_arrays(handles)
+    if isinstance(fitness_method, FitnessEvaluator):
+        fitness_method.prepare(resolve_target(handles["target"]))
+    _state["fitness_method"] = fitness_method
+    _state["counters"] = counters
+
+
+def evaluate_packed(task):
+    # (packed, reference[, options]): Population.eval_options(), e.g. the
+    # early-abort cutoff or the generation's pixel sample
+    packed, reference = task[:2]
+    options = task[2] if len(task) > 2 else {}
+    individual = unpack_genome(packed, _state["fitness_method"])
+    fitness = individual.calculate_fitness(resolve_target(reference), **options)
+    publish_render_counters(_state.get("counters"))
+    publish_fitness_counters(_state.get("counters"), _state["fitness_method"])
+    return fitness
+
+
+def evaluate_packed_chunk(task):
+    """Score a chunk of packed genomes, stacked into batches per metric."""
+    packed_genomes, reference = task[:2]
+    options = task[2] if len(task) > 2 else {}
+    individuals = [unpack_genome(packed, _state["fitness_method"]) for packed in packed_genomes]
+    results = evaluate_individuals(individuals, resolve_target(reference), **options)
+    publish_render_counters(_state.get("counters"))
+    publish_fitness_counters(_state.get("counters"), _state["fitness_method"])
+    return results
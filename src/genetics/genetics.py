@@ -1,8 +1,9 @@
-from .fitness.mse import mse_fitness
-from .fitness.ssim import ssim_fitness
-from .fitness.mixed_fitness import mixed_fitness
-from .fitness.mixed_mse_ssim_deltae import mixed_fitness_mse_ssim_deltaE
-from .fitness.deltaE import delta_e_fitness
+from .fitness.mse import mse_fitness, MSEEvaluator
+from .fitness.ssim import ssim_fitness, SSIMEvaluator
+from .fitness.mixed_fitness import mixed_fitness, MixedEvaluator
+from .fitness.mixed_mse_ssim_deltae import mixed_fitness_mse_ssim_deltaE, MixedMSESSIMDeltaEEvaluator
+from .fitness.deltaE import delta_e_fitness, DeltaEEvaluator
+from .fitness.evaluator import resolve_evaluator
 
 from .mutation.single_gene_mutation import single_gene_mutation
 from .mutation.multi_gene_mutation import multi_gene_mutation
@@ -29,6 +30,7 @@ from .crossover.circular_crossover import annular_crossover
 from .crossover.artistic_crossover import artistic_crossover
 
 from .population import Population
+from .env_config import apply_env_config
 import numpy as np
 from PIL import Image, ImageDraw
 import random
@@ -37,6 +39,15 @@ import matplotlib.pyplot as plt
 # multiprocessing seed helpers
 from .preprocessing.tiling import compute_tile_seeds
 from .preprocessing.shared_seed_store import create_shared_seed_store, update_seed_if_better, find_seed_by_point
+from .shared_target import SharedTarget
+from .fitness_worker import init_fitness_worker, evaluate_packed, evaluate_packed_chunk
+from .fitness.batch import batch_fitness_budget
+from .replica_pool import ReplicaPool
+from .pyramid import PyramidSchedule, downscale, level_size, parse_pyramid, render_at_size
+from .worker_counters import (
+    FITNESS_COUNTERS, FITNESS_TIMERS, RENDER_COUNTERS, SharedCounters,
+    publish_fitness_counters, publish_render_counters,
+)
 import multiprocessing
 import time
 import argparse
@@ -45,38 +56,96 @@ import csv
 
 
 
-def _calculate_fitness_helper(args):
-    individual, reference_img = args
-    return individual.calculate_fitness(reference_img)
-
 def _ensure_dir(path: str):
     d = os.path.dirname(os.path.abspath(path))
     if d and not os.path.exists(d):
         os.makedirs(d, exist_ok=True)
 
+METRICS_COLUMNS = [
+    "generation",
+    "best_fitness",
+    "avg_fitness",
+    "worst_fitness",
+    "std_dev",
+    "mutation_rate",
+    "stagnation_counter",
+    "processes",
+    "population_size",
+    "n_polygons",
+    "fitness",
+    "selection",
+    "crossover",
+    "mutation",
+    "elapsed_sec",
+    "evaluated",
+    "skipped_evals",
+    "mask_hits",
+    "mask_misses",
+    "mask_hit_rate",
+    # tiempo por componente de los fitness compuestos (ms, suma de procesos)
+    "fitness_planes_ms",
+    "fitness_lab_ms",
+    "fitness_mse_ms",
+    "fitness_ssim_ms",
+    "fitness_delta_e_ms",
+    # memo de fitness por hash de genoma
+    "memo_hits",
+    "memo_hit_rate",
+    # hijos con genoma repetido dentro de la generación
+    "duplicates",
+    # evaluación con corte temprano (early_abort)
+    "cutoff_rejected",
+    "pixels_skipped_frac",
+    # fitness sobre una muestra de píxeles (sample_fraction)
+    "sample_fraction",
+    "exact_evals",
+    "rank_agreement",
+    # modo pirámide: nivel activo y su escala
+    "level",
+    "level_scale",
+    # pre-selección de hijos con el fitness a baja resolución (screen_ratio)
+    "screened_out",
+    "screen_disagreement",
+    # R² de las predicciones del surrogate entrenado (screen_surrogate "ridge")
+    "surrogate_accuracy",
+]
+
+def _memo_hit_rate(eval_stats):
+    lookups = eval_stats["memo_hits"] + eval_stats["evaluated"]
+    return f"{eval_stats['memo_hits'] / lookups:.4f}" if lookups else ""
+
+def _skipped_frac(gen_counts):
+    pixels = gen_counts["cutoff_pixels_scored"] + gen_counts["cutoff_pixels_skipped"]
+    return f"{gen_counts['cutoff_pixels_skipped'] / pixels:.4f}" if pixels else ""
+
+def _sample_columns(population):
+    if population.pixel_sample is None:
+        return {}
+    agreement = population.sample_stats["rank_agreement"]
+    return {
+        "sample_fraction": f"{population.pixel_sample.fraction:.4f}",
+        "exact_evals": population.sample_stats["exact_evals"],
+        "rank_agreement": f"{agreement:.4f}" if agreement is not None else "",
+    }
+
+def _screen_columns(population):
+    if not population.screening:
+        return {}
+    disagreement = population.screen_stats["disagreement"]
+    accuracy = population.screen_stats["accuracy"]
+    return {
+        "screened_out": population.screen_stats["screened_out"],
+        "screen_disagreement": f"{disagreement:.4f}" if disagreement is not None else "",
+        "surrogate_accuracy": f"{accuracy:.4f}" if accuracy is not None else "",
+    }
+
 def _write_metrics_row(csv_path, row, write_header_if_needed=False):
     _ensure_dir(csv_path)
     file_exists = os.path.exists(csv_path)
     with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
+        w = csv.DictWriter(f, fieldnames=METRICS_COLUMNS, restval="")
         if write_header_if_needed and not file_exists:
-            w.writerow([
-                "generation",
-                "best_fitness",
-                "avg_fitness",
-                "worst_fitness",
-                "std_dev",
-                "mutation_rate",
-                "stagnation_counter",
-                "processes",
-                "population_size",
-                "n_polygons",
-                "fitness",
-                "selection",
-                "crossover",
-                "mutation",
-                "elapsed_sec",
-            ])
+            w.writeheader()
         w.writerow(row)
 
 
@@ -91,11 +160,11 @@ def main():
 
     # --- mapas de nombre->función (según lo implementado) ---
     fitness_map = {
-        "mse": mse_fitness,
-        "ssim": ssim_fitness,
-        "mixed": mixed_fitness,
-        "mixed_mse_ssim_deltae": mixed_fitness_mse_ssim_deltaE,
-        "deltaE": delta_e_fitness,
+        "mse": MSEEvaluator,
+        "ssim": SSIMEvaluator,
+        "mixed": MixedEvaluator,
+        "mixed_mse_ssim_deltae": MixedMSESSIMDeltaEEvaluator,
+        "deltaE": DeltaEEvaluator,
     }
 
     mutation_map = {
@@ -138,6 +207,13 @@ def main():
     if not os.path.exists(img_path):
         raise SystemExit(f"No se encontró la imagen en: {img_path}")
     
+    # render_mode, caches, delta_fitness y lotes del JSON tienen prioridad
+    # sobre las variables GEN_* (los workers las heredan)
+    apply_env_config(cfg)
+    if cfg.get("delta_fitness") and cfg.get("eval_mode", "pool") == "pool":
+        # los workers del pool reciben genomas sin el estado del padre
+        raise SystemExit("delta_fitness requiere eval_mode 'replica' (o tiled_ga)")
+
     metrics_csv = cfg.get("metrics_csv", "out/metrics.csv")
     _ensure_dir(metrics_csv)
 
@@ -159,6 +235,22 @@ def main():
     max_generations = int(cfg.get("max_generations", 10000))
     stop_fitness = float(cfg.get("stop_fitness", 0.9))
 
+    # modo pirámide (coarse-to-fine, ver pyramid.py): un target reducido por nivel
+    try:
+        pyramid = parse_pyramid(cfg)
+    except (KeyError, TypeError, ValueError) as e:
+        raise SystemExit(f"pyramid inválida: {e}")
+    schedule = PyramidSchedule(pyramid) if pyramid else None
+    level_targets, level_images = {"target": target_array}, {}
+    for i, level in enumerate(pyramid):
+        level_images[i] = downscale(target_img, level_size(width, height, level.scale))
+        if level.scale < 1:
+            level_targets[f"level_{i}"] = np.array(level_images[i])
+
+    def level_key():
+        # clave del target del nivel activo en la memoria compartida
+        return "target" if schedule is None or schedule.level.scale == 1 else f"level_{schedule.index}"
+
     # anti-estancamiento
     stagnation_threshold = int(cfg.get("stagnation_threshold", 20))
     original_mutation_rate = float(cfg.get("original_mutation_rate", mutation_rate))
@@ -187,12 +279,15 @@ def main():
         raise SystemExit(f"replacement '{replacement_name}' no disponible")
     if crossover_fn is None:
         raise SystemExit(f"crossover '{crossover_name}' no disponible")
+    # nombre -> evaluador (el target se prepara una vez por proceso)
+    fitness_fn = resolve_evaluator(fitness_fn, cfg)
 
     # ------------------ población inicial ------------------
+    start_width, start_height = level_images[0].size if schedule else (width, height)
     population = Population(
         population_size=pop_size,
-        width=width,
-        height=height,
+        width=start_width,
+        height=start_height,
         n_polygons=n_polygons,
         n_vertices=n_vertices,
         fitness_method=fitness_fn,
@@ -204,52 +299,124 @@ def main():
         elite_size=elite_size,
         seed_store=None,
         seed_frac=0.0,
-        target_img=target_img,
+        target_img=level_images[0] if schedule else target_img,
         crossover_method=crossover_fn,
-        max_gen=max_generations
+        max_gen=max_generations,
+        fitness_memo_size=int(cfg.get("fitness_memo_size", 0)),
+        duplicate_policy=cfg.get("duplicate_policy"),
+        early_abort=bool(cfg.get("early_abort", False)),
+        sample_fraction=float(cfg.get("sample_fraction", 0.0)),
+        sample_mode=cfg.get("sample_mode", "stratified"),
+        sample_rerank_every=int(cfg.get("sample_rerank_every", 10)),
+        sample_rerank_top=int(cfg.get("sample_rerank_top", 5)),
+        screen_ratio=float(cfg.get("screen_ratio", 0.0)),
+        screen_scale=float(cfg.get("screen_scale", 0.25)),
+        screen_percentile=(float(cfg["screen_percentile"])
+                           if cfg.get("screen_percentile") is not None else None),
+        screen_surrogate=cfg.get("screen_surrogate", "lowres"),
+        surrogate_alpha=float(cfg.get("surrogate_alpha", 1.0)),
+        surrogate_min_samples=int(cfg.get("surrogate_min_samples", 32)),
+        surrogate_min_r2=float(cfg.get("surrogate_min_r2", 0.0)),
+        surrogate_r2_window=int(cfg.get("surrogate_r2_window", 3)),
     )
 
     # ------------------ evaluación inicial (paralelo) ------------------
+    # El target vive en memoria compartida y cada tarea lleva solo el genoma
+    # empaquetado (int16 + uint8) y el handle; el worker devuelve el fitness.
+    shared_target = SharedTarget(level_targets)
+    # contadores que los workers suman (hits del cache de máscaras, tiempo
+    # por componente del fitness)
+    counters = SharedCounters(RENDER_COUNTERS + FITNESS_COUNTERS)
     num_processes = multiprocessing.cpu_count()
-    pool = multiprocessing.Pool(processes=num_processes)
+    # "pool": genomas empaquetados por tarea; "replica": cada worker guarda su
+    # fragmento de la población y recibe solo scripts de edición por hijo.
+    eval_mode = cfg.get("eval_mode", "pool")
+    if eval_mode == "replica" and schedule is not None:
+        raise SystemExit("pyramid no disponible con eval_mode 'replica'")
+    if eval_mode == "replica":
+        pool = ReplicaPool(num_processes, shared_target.handles, fitness_fn, width, height, counters=counters)
+    elif eval_mode == "pool":
+        pool = multiprocessing.Pool(
+            processes=num_processes,
+            initializer=init_fitness_worker,
+            initargs=(shared_target.handles, fitness_fn, counters),
+        )
+    else:
+        raise SystemExit(f"eval_mode '{eval_mode}' no disponible")
+
+    def _evaluate_population():
+        if eval_mode == "replica":
+            results = pool.evaluate(population)
+        else:
+            if batch_fitness_budget() > 0:
+                # un bloque de genomas por proceso, puntuado por lotes en el worker
+                tasks = population.prepare_fitness_tasks(shared_target.handles[level_key()], packed=True,
+                                                         chunks=num_processes)
+                results = [fitness for chunk in pool.map(evaluate_packed_chunk, tasks) for fitness in chunk]
+            else:
+                tasks = population.prepare_fitness_tasks(shared_target.handles[level_key()], packed=True)
+                results = pool.map(evaluate_packed, tasks)
+        population.update_fitness_from_results(results)
+        publish_render_counters(counters)
+        publish_fitness_counters(counters, fitness_fn)
 
     t0 = time.time()
 
-    tasks = population.prepare_fitness_tasks(target_array)
-    results = pool.map(_calculate_fitness_helper, tasks)
-    population.update_fitness_from_results(results)
+    _evaluate_population()
+
+    last_counters = {name: 0 for name in counters.names}
+
+    def _metrics_row(stats, stagnation, elapsed):
+        # contadores de la generación = totales actuales - totales anteriores
+        totals = counters.snapshot()
+        gen_counts = {k: totals[k] - last_counters[k] for k in totals}
+        last_counters.update(totals)
+        mask_lookups = gen_counts["mask_hits"] + gen_counts["mask_misses"]
+        return {
+            "generation": stats['generation'],
+            "best_fitness": f"{stats['best_fitness']:.10g}",
+            "avg_fitness": f"{stats['average_fitness']:.10g}",
+            "worst_fitness": f"{stats['worst_fitness']:.10g}",
+            "std_dev": f"{stats['std_deviation']:.10g}",
+            "mutation_rate": f"{population.mutation_rate:.6g}",
+            "stagnation_counter": stagnation,
+            "processes": num_processes,     # usás cpu_count() para el Pool
+            "population_size": stats['population_size'],
+            "n_polygons": n_polygons,
+            "fitness": fitness_name,
+            "selection": selection_name,
+            "crossover": crossover_name,
+            "mutation": mutation_name,
+            "elapsed_sec": f"{elapsed:.3f}",
+            "evaluated": population.eval_stats["evaluated"],
+            "skipped_evals": population.eval_stats["skipped"],
+            "memo_hits": population.eval_stats["memo_hits"],
+            "memo_hit_rate": _memo_hit_rate(population.eval_stats) if population.fitness_memo is not None else "",
+            "duplicates": population.offspring_stats["duplicates"] if population.duplicate_policy is not None else "",
+            "cutoff_rejected": population.early_abort_stats["rejected"] if population.early_abort else "",
+            "pixels_skipped_frac": _skipped_frac(gen_counts) if population.early_abort else "",
+            **_sample_columns(population),
+            **_screen_columns(population),
+            **({"level": schedule.index, "level_scale": f"{schedule.level.scale:.4g}"} if schedule else {}),
+            "mask_hits": gen_counts["mask_hits"],
+            "mask_misses": gen_counts["mask_misses"],
+            "mask_hit_rate": f"{gen_counts['mask_hits'] / mask_lookups:.4f}" if mask_lookups else "",
+            **{f"fitness_{name}_ms": f"{gen_counts[f'fitness_{name}_us'] / 1e3:.3f}"
+               for name in FITNESS_TIMERS if gen_counts[f"fitness_{name}_us"]},
+        }
 
     # --- CSV: gen 0 ---
     stats0 = population.get_statistics()
     elapsed0 = time.time() - t0
-    _write_metrics_row(
-        metrics_csv,
-        [
-            stats0['generation'],
-            f"{stats0['best_fitness']:.10g}",
-            f"{stats0['average_fitness']:.10g}",
-            f"{stats0['worst_fitness']:.10g}",
-            f"{stats0['std_deviation']:.10g}",
-            f"{population.mutation_rate:.6g}",
-            0,                          # stagnation_counter (arranca en 0)
-            num_processes,              # usás cpu_count() para el Pool
-            stats0['population_size'],
-            n_polygons,
-            fitness_name,
-            selection_name,
-            crossover_name,
-            mutation_name,
-            f"{elapsed0:.3f}",
-        ],
-        write_header_if_needed=True
-    )
+    # stagnation_counter arranca en 0
+    _write_metrics_row(metrics_csv, _metrics_row(stats0, 0, elapsed0), write_header_if_needed=True)
 
 
     # ------------------ plot en vivo ------------------
     if show_live:
         plt.ion()
         fig, ax = plt.subplots()
-        best_image = population.best_individual.render()
+        best_image = render_at_size(population.best_individual, width, height)
         img_display = ax.imshow(best_image)
         ax.set_title("Best individual")
 
@@ -259,37 +426,23 @@ def main():
     # ------------------ loop evolutivo ------------------
     for generation in range(1, max_generations + 1):
         population.create_next_generation()
-
-        tasks = population.prepare_fitness_tasks(target_array)
-        results = pool.map(_calculate_fitness_helper, tasks)
-        population.update_fitness_from_results(results)
+        _evaluate_population()
 
         stats = population.get_statistics()
         current_best_fitness = stats['best_fitness']
-        print(f"Gen {generation}: Best fitness = {current_best_fitness:.6f}")
+        duplicates = (f", duplicados {population.offspring_stats['duplicates']}"
+                      if population.duplicate_policy is not None else "")
+        if population.screening:
+            accuracy = population.screen_stats["accuracy"]
+            duplicates += f", descartados {population.screen_stats['screened_out']}"
+            duplicates += f", R² {accuracy:.3f}" if accuracy is not None else ""
+        level = f" [nivel {schedule.index}, escala {schedule.level.scale:g}]" if schedule else ""
+        print(f"Gen {generation}: Best fitness = {current_best_fitness:.6f}{level} "
+              f"(evaluados {population.eval_stats['evaluated']}, omitidos {population.eval_stats['skipped']}{duplicates})")
 
         # --- CSV: gen N ---
         elapsedN = time.time() - t0
-        _write_metrics_row(
-            metrics_csv,
-            [
-                stats['generation'],
-                f"{stats['best_fitness']:.10g}",
-                f"{stats['average_fitness']:.10g}",
-                f"{stats['worst_fitness']:.10g}",
-                f"{stats['std_deviation']:.10g}",
-                f"{population.mutation_rate:.6g}",
-                stagnation_counter,
-                num_processes,
-                stats['population_size'],
-                n_polygons,
-                fitness_name,
-                selection_name,
-                crossover_name,
-                mutation_name,
-                f"{elapsedN:.3f}",
-            ]
-        )
+        _write_metrics_row(metrics_csv, _metrics_row(stats, stagnation_counter, elapsedN))
 
 
         # anti-estancamiento
@@ -308,23 +461,37 @@ def main():
 
         # actualizar preview
         if show_live and (generation % plot_interval == 0):
-            best_image = population.best_individual.render()
+            best_image = render_at_size(population.best_individual, width, height)
             img_display.set_data(np.array(best_image))
             plt.pause(0.001)
 
-        # criterio de corte
-        if current_best_fitness >= stop_fitness:
+        # pirámide: al terminar un nivel se reescalan los genomas al siguiente
+        if schedule is not None and schedule.step(current_best_fitness):
+            level = schedule.advance()
+            population.rescale(*level_images[schedule.index].size, level_images[schedule.index])
+            _evaluate_population()
+            print(f"Nivel {schedule.index}: escala {level.scale:g} "
+                  f"({population.width}x{population.height}), best fitness = {population.best_fitness:.6f}")
+            stagnation_counter = 0
+            best_fitness_last_gen = population.best_fitness
+            population.mutation_rate = original_mutation_rate
+            continue
+
+        # criterio de corte (en la pirámide, solo a tamaño completo)
+        if (schedule is None or schedule.is_final) and current_best_fitness >= stop_fitness:
             print(f"Stopping criteria met: Fitness >= {stop_fitness}")
             break
 
     pool.close()
-    pool.join()
+    if eval_mode == "pool":
+        pool.join()
+    shared_target.close()
     plt.ioff()
 
     # ------------------ guardar salida ------------------
     output_image = cfg.get("output_image", "out/best.png")
     if output_image:
-        population.best_individual.render().save(output_image)
+        render_at_size(population.best_individual, width, height).save(output_image)
         print(f"Guardado: {output_image}")
 
     plt.show()
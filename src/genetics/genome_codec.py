@@ -0,0 +1,97 @@
+import pickle
+from itertools import chain
+from typing import List, Tuple
+
+import numpy as np
+
+from .individual import Individual
+from .polygon import Polygon
+
+# Packed wire format for sending genomes to fitness workers.
+#
+# A genome travels as two flat arrays instead of a pickled Individual:
+#   vertices: int16, n_polygons * n_vertices * 2  (x, y interleaved)
+#   colors:   uint8, n_polygons * 4               (r, g, b, a)
+# plus the canvas size and vertex count. With pickle protocol 5 both arrays
+# are exported as PickleBuffer objects, so they can travel out-of-band.
+
+def _rebuild(width, height, n_vertices, vertices, colors):
+    return PackedGenome(
+        width,
+        height,
+        n_vertices,
+        np.frombuffer(vertices, dtype=np.int16),
+        np.frombuffer(colors, dtype=np.uint8),
+    )
+
+
+class PackedGenome:
+    __slots__ = ("width", "height", "n_vertices", "vertices", "colors")
+
+    def __init__(self, width, height, n_vertices, vertices, colors):
+        self.width = width
+        self.height = height
+        self.n_vertices = n_vertices
+        self.vertices = vertices
+        self.colors = colors
+
+    @property
+    def n_polygons(self) -> int:
+        return len(self.colors) // 4
+
+    @property
+    def nbytes(self) -> int:
+        return self.vertices.nbytes + self.colors.nbytes
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            vertices = pickle.PickleBuffer(self.vertices)
+            colors = pickle.PickleBuffer(self.colors)
+        else:
+            vertices = self.vertices.tobytes()
+            colors = self.colors.tobytes()
+        return _rebuild, (self.width, self.height, self.n_vertices, vertices, colors)
+
+
+def genome_arrays(individual, vertex_dtype=np.int32) -> Tuple[np.ndarray, np.ndarray]:
+    """Polygons as ((n, n_vertices, 2) vertex_dtype vertices, (n, 4) uint8 RGBA
+    colors). The one polygon-list -> arrays conversion: rendering, the memo
+    hash, the wire format and the replica mirrors all go through it."""
+    if max(individual.width, individual.height) > np.iinfo(vertex_dtype).max:
+        raise ValueError(f"Canvas too large for {np.dtype(vertex_dtype).name} vertices")
+    polygons = individual.polygons
+    n_vertices = len(polygons[0].vertices) if polygons else individual.n_vertices
+    vertices = np.fromiter(chain.from_iterable(chain.from_iterable(p.vertices for p in polygons)),
+                           dtype=vertex_dtype, count=len(polygons) * n_vertices * 2)
+    colors = np.fromiter(chain.from_iterable(p.color for p in polygons),
+                         dtype=np.uint8, count=len(polygons) * 4)
+    return vertices.reshape(-1, n_vertices, 2), colors.reshape(-1, 4)
+
+
+def pack_individual(individual: Individual) -> PackedGenome:
+    vertices, colors = genome_arrays(individual, np.int16)
+    return PackedGenome(individual.width, individual.height, vertices.shape[1],
+                        vertices.reshape(-1), colors.reshape(-1))
+
+
+def unpack_genome(packed: PackedGenome, fitness_method, mutation_method=None) -> Individual:
+    individual = Individual(packed.width, packed.height, 0, fitness_method, mutation_method,
+                            n_vertices=packed.n_vertices)
+    verts = packed.vertices.reshape(-1, packed.n_vertices, 2).tolist()
+    colors = packed.colors.reshape(-1, 4).tolist()
+    individual.polygons = [
+        Polygon._of(tuple(map(tuple, poly_verts)), tuple(color))
+        for poly_verts, color in zip(verts, colors)
+    ]
+    return individual
+
+
+def dumps(obj) -> Tuple[bytes, List[pickle.PickleBuffer]]:
+    """Protocol 5 pickling with genome arrays exported out-of-band."""
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return data, buffers
+
+
+def loads(data: bytes, buffers) -> object:
+    return pickle.loads(data, buffers=buffers)
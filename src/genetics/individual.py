@@ -1,9 +1,16 @@
-import os
 import random
+import itertools
 import numpy as np
 from PIL import Image, ImageDraw
 from .polygon import Polygon
 from .utils import generate_random_hex_color
+from .render.raster import BACKGROUND, composite, render_genome, to_rgb8
+from .render.buffers import render_buffers, render_mode
+from .render.prefix_cache import prefix_cache, prefix_hashes
+from .render.mask_cache import mask_cache
+from .fitness.delta_mse import delta_fitness_enabled, evaluate_delta, supports_delta
+from .fitness.cutoff import REJECTED_FITNESS, cutoff_stats, score_with_cutoff, supports_cutoff
+from .fitness.sampling import sampled_fitness
 
 # The genome includes the features of each individual where each polygon has its own color and vertices, and the individual has a background color
 # All of these features can be mutated or crossed over
@@ -13,6 +20,8 @@ from .utils import generate_random_hex_color
 # To crossover we can swap polygons between two individuals or blend colors/vertices
 # 
 # Each individual can render, calculate fitness, mutate and store its genome
+_uids = itertools.count()
+
 class Individual:
     def __init__(self, width, height, n_polygons, fitness_method, mutation_method, target_img=None, n_vertices=3):
         self.width = width
@@ -24,41 +33,168 @@ class Individual:
                          for _ in range(n_polygons)]
 
         self.fitness = float('inf')
+        # Full-image fitness when `fitness` was scored on a pixel sample
+        # (set by the Population, see fitness/sampling.py)
+        self.exact_fitness = None
+        # Low-resolution pre-screening score (surrogate.py)
+        self.surrogate_fitness = None
         self.img = None
+        # Process-unique id plus the uids of the parents this genome was bred from
+        self.uid = next(_uids)
+        self.lineage = None
+        # Render + squared-error state for incremental MSE (fitness/delta_mse.py)
+        self.delta_base = None
+
+    @property
+    def is_dirty(self):
+        # New, mutated or crossed-over individuals have no valid fitness yet
+        return self.fitness == float('inf')
 
     def render(self, use_cache=True):
         if use_cache and self.img is not None:
             return self.img
 
-        # Render mode switch via environment variable GEN_RENDER_MODE
-        # Allowed values: "fast" (default) or "compat" (old per-polygon composite)
-        mode = os.environ.get("GEN_RENDER_MODE", "fast").lower()
+        # Render mode switch via environment variable GEN_RENDER_MODE (resolved
+        # once per process, see render/buffers.py). Allowed values: "fast"
+        # (default), "compat" (old per-polygon composite) or "numpy"
+        # (rasterizer in render/raster.py)
+        mode = render_mode()
+        if mode == "numpy" or (mode == "fast" and prefix_cache() is not None):
+            self.img = Image.fromarray(self.render_array())
+        else:
+            canvas = Image.new("RGB", (self.width, self.height), (255, 255, 255))
+            self.img = self._draw_pil(canvas, mode)
+        return self.img
+
+    def render_array(self):
+        """Render into this process's pooled buffer and return it as (H, W, 3) uint8.
+
+        No image-sized buffer is allocated for the numpy backend; the PIL
+        backends reuse one canvas and copy it into the pooled array. The
+        array is overwritten by the next render of the same size, so consume
+        it (e.g. score it) before rendering another individual.
+        """
+        buffers = render_buffers(self.width, self.height)
+        mode = render_mode()
+        cache = prefix_cache()
+        if cache is not None and mode in ("fast", "numpy"):
+            return self._render_from_prefix(cache, buffers, mode)
+        if mode == "numpy":
+            vertices, colors = self.genome_arrays()
+            return render_genome(vertices, colors, self.width, self.height,
+                                 out=buffers.rgb, acc=buffers.acc, scratch=buffers.scratch,
+                                 masks=mask_cache())
+        np.copyto(buffers.rgb, np.asarray(self._draw_pil(buffers.canvas, mode)))
+        return buffers.rgb
+
+    def _render_from_prefix(self, cache, buffers, mode):
+        """render_array() that resumes from the deepest cached prefix composite
+        and leaves new checkpoints behind (see render/prefix_cache.py)."""
+        n = len(self.polygons)
+        hashes = prefix_hashes(self.polygons)
+        tag = (mode, self.width, self.height)
+        start, snapshot = cache.lookup(tag, hashes)
+
+        if mode == "numpy":
+            vertices, colors = self.genome_arrays()
+            acc, scratch, masks = buffers.acc, buffers.scratch, mask_cache()
+            if snapshot is None:
+                acc.fill(BACKGROUND)
+            else:
+                np.copyto(acc, snapshot)
+
+            def draw(a, b):
+                composite(acc, vertices[a:b], colors[a:b], scratch, masks=masks)
+
+            def snap():
+                return acc.copy(), acc.nbytes
+        else:
+            canvas = buffers.canvas
+            if snapshot is not None:
+                canvas.paste(snapshot)
+            pen = ImageDraw.Draw(canvas, "RGBA")
+
+            def draw(a, b):
+                for poly in self.polygons[a:b]:
+                    pen.polygon(poly.vertices, fill=poly.color)
+
+            def snap():
+                return canvas.copy(), 3 * self.width * self.height
+
+        drawn = start
+        for k in cache.checkpoints(n):
+            if k <= start:
+                continue
+            draw(drawn, k)
+            drawn = k
+            cache.store(tag, k, hashes[k], *snap())
+        draw(drawn, n)
+
+        if mode == "numpy":
+            return to_rgb8(acc, buffers.rgb)
+        np.copyto(buffers.rgb, np.asarray(canvas))
+        return buffers.rgb
+
+    def _draw_pil(self, canvas, mode):
+        """Draw the polygons over a white RGB canvas with one of the PIL backends."""
         if mode == "compat":
             # Old path: per-polygon temp + alpha composite
-            canvas = Image.new("RGBA", (self.width, self.height), (255, 255, 255, 255))
+            canvas = canvas.convert("RGBA")
             for poly in self.polygons:
                 temp_layer = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 0))
                 temp_draw = ImageDraw.Draw(temp_layer)
                 temp_draw.polygon(poly.vertices, fill=poly.color)
                 canvas = Image.alpha_composite(canvas, temp_layer)
-            self.img = canvas.convert("RGB")
-            return self.img
-        else:
-            # Fast single-canvas draw: draw polygons directly onto one RGBA canvas
-            canvas = Image.new("RGBA", (self.width, self.height), (255, 255, 255, 255))
-            draw = ImageDraw.Draw(canvas)
-            for poly in self.polygons:
-                draw.polygon(poly.vertices, fill=poly.color)
-            self.img = canvas.convert("RGB")
-            return self.img
+            return canvas.convert("RGB")
+        # Fast single-canvas draw: an "RGBA" ImageDraw on an RGB canvas
+        # blends each fill with its alpha (same output as compat) without
+        # allocating per-polygon layers
+        draw = ImageDraw.Draw(canvas, "RGBA")
+        for poly in self.polygons:
+            draw.polygon(poly.vertices, fill=poly.color)
+        return canvas
+
+    def genome_arrays(self):
+        """Polygons as ((n, n_vertices, 2) int32 vertices, (n, 4) uint8 RGBA colors)."""
+        from .genome_codec import genome_arrays  # genome_codec imports Individual
+        return genome_arrays(self)
+
+    def uses_delta_fitness(self):
+        """True when calculate_fitness takes the bounding-box delta MSE path."""
+        return (render_mode() != "compat" and delta_fitness_enabled()
+                and supports_delta(self.fitness_method))
 
-    def calculate_fitness(self, reference_img_array, use_cache=True):
+    def calculate_fitness(self, reference_img_array, use_cache=True, min_fitness=None, sample=None):
+        """Score against the target. With min_fitness (the survival threshold of
+        an early-abort generation) MSE / deltaE stop as soon as the candidate
+        provably falls below it and return REJECTED_FITNESS (fitness/cutoff.py).
+        With sample (a fitness.sampling.PixelSample) only those pixels are scored."""
         if use_cache and self.fitness != float('inf'):
             return self.fitness
-        
-        generated_img = self.render(use_cache=use_cache)
-        generated_array = np.array(generated_img)
-        
+
+        if sample is not None:
+            generated_array = np.asarray(self.img) if use_cache and self.img is not None else self.render_array()
+            self.fitness = sampled_fitness(self.fitness_method, reference_img_array, generated_array, sample)
+            return self.fitness
+
+        if self.uses_delta_fitness():
+            self.fitness, rows = evaluate_delta(self, reference_img_array, render_mode(), min_fitness)
+            if min_fitness is not None:
+                cutoff_stats.add(rows, self.height, self.width, self.fitness == REJECTED_FITNESS)
+            return self.fitness
+
+        # The pooled render buffer goes straight to the fitness function (no copy)
+        if use_cache and self.img is not None:
+            generated_array = np.asarray(self.img)
+        else:
+            generated_array = self.render_array()
+
+        if min_fitness is not None and supports_cutoff(self.fitness_method):
+            self.fitness, rows = score_with_cutoff(self.fitness_method, reference_img_array,
+                                                   generated_array, min_fitness)
+            cutoff_stats.add(rows, self.height, self.width, self.fitness == REJECTED_FITNESS)
+            return self.fitness
+
         self.fitness = self.fitness_method(reference_img_array, generated_array)
         return self.fitness
 
@@ -70,6 +206,20 @@ class Individual:
         
         self.img = None
         self.fitness = float('inf')
+        self.exact_fitness = None
+        self.surrogate_fitness = None
+
+    def rescale(self, width, height):
+        """Map the genome onto a width x height canvas (pyramid level switch)."""
+        sx, sy = width / self.width, height / self.height
+        self.polygons = [Polygon([(round(x * sx), round(y * sy)) for x, y in poly.vertices], poly.color)
+                         for poly in self.polygons]
+        self.width, self.height = width, height
+        self.img = None
+        self.fitness = float('inf')
+        self.exact_fitness = None
+        self.surrogate_fitness = None
+        self.delta_base = None
 
     def clone(self):
         new_individual = Individual(
@@ -80,7 +230,9 @@ class Individual:
             self.mutation_method
         )
 
-        new_individual.polygons = [p.clone() for p in self.polygons]
+        # Polygons are immutable (polygon.py): share them, copy only the list
+        new_individual.polygons = list(self.polygons)
+        new_individual.delta_base = self.delta_base
         return new_individual
 
     def hex_to_rgba(self, hex_color, alpha=255):
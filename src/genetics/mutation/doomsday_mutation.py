@@ -36,19 +36,18 @@ def doomsday_mutation(
             new_x = max(0, min(individual.width, x + dx))
             new_y = max(0, min(individual.height, y + dy))
             new_vertices.append((new_x, new_y))
-        poly.vertices = new_vertices
 
         r, g, b, a = poly.color
         r_change = rng.randint(-64, 64)
         g_change = rng.randint(-64, 64)
         b_change = rng.randint(-64, 64)
         a_change = rng.randint(-64, 64)
-        poly.color = (
+        polygons[idx] = Polygon(new_vertices, (
             max(0, min(255, r + r_change)),
             max(0, min(255, g + g_change)),
             max(0, min(255, b + b_change)),
             max(0, min(255, a + a_change)),
-        )
+        ))
 
     individual.img = None
     individual.fitness = float('inf')
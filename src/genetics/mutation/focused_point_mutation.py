@@ -6,14 +6,16 @@ from PIL import Image, ImageChops
 from shapely.geometry import Point, Polygon as ShapelyPolygon
 from .auxiliar_mutate_one_polygon import _mutate_one_polygon
 
-def _find_polygon_at_point(polygons: list, point: tuple) -> Polygon | None:
+def _find_polygon_at_point(polygons: list, point: tuple) -> int | None:
+    """Index of the topmost polygon containing point."""
     p = Point(point)
-    for poly in reversed(polygons):
+    for idx in reversed(range(len(polygons))):
+        poly = polygons[idx]
         if not poly.vertices:
             continue
         shapely_poly = ShapelyPolygon(poly.vertices)
         if shapely_poly.contains(p):
-            return poly
+            return idx
     return None
 
 def focused_point_mutation(individual: Individual, mutation_rate: float, target_img: Image):
@@ -30,9 +32,9 @@ def focused_point_mutation(individual: Individual, mutation_rate: float, target_
     worst_point_coords = np.unravel_index(np.argmax(error_map), error_map.shape)
     worst_point_xy = (worst_point_coords[1], worst_point_coords[0])
 
-    poly_to_mutate = _find_polygon_at_point(individual.polygons, worst_point_xy)
+    idx = _find_polygon_at_point(individual.polygons, worst_point_xy)
     
-    if poly_to_mutate:
-        _mutate_one_polygon(poly_to_mutate, individual, target_img)
-    elif individual.polygons:
-        _mutate_one_polygon(random.choice(individual.polygons), individual, target_img)
\ No newline at end of file
+    if idx is None and individual.polygons:
+        idx = random.randrange(len(individual.polygons))
+    if idx is not None:
+        individual.polygons[idx] = _mutate_one_polygon(individual.polygons[idx], individual, target_img)
@@ -23,4 +23,4 @@ def multi_gene_mutation(individual: Individual, mutation_rate: float, target_img
             swap_idx = random.randrange(n_polygons)
             polygons[idx], polygons[swap_idx] = polygons[swap_idx], polygons[idx]
         else:
-            _mutate_one_polygon(polygons[idx], individual, target_img)
\ No newline at end of file
+            polygons[idx] = _mutate_one_polygon(polygons[idx], individual, target_img)
@@ -48,7 +48,7 @@ def non_uniform_multi_gene_mutation(
 
             new_x = max(0, min(individual.width, x + dx))
             new_y = max(0, min(individual.height, y + dy))
-            poly.vertices[vertex_idx] = (new_x, new_y)
+            polygons[idx] = poly.with_vertex(vertex_idx, (new_x, new_y))
 
         elif mutation_type == 'image_color' and poly.vertices:
             all_x = [v[0] for v in poly.vertices]
@@ -59,7 +59,7 @@ def non_uniform_multi_gene_mutation(
                 px, py = rng.randint(min_x, max_x), rng.randint(min_y, max_y)
                 pixel = target_img.getpixel((px, py))
                 alpha = poly.color[3]
-                poly.color = (pixel[0], pixel[1], pixel[2], alpha)
+                polygons[idx] = poly.with_color((pixel[0], pixel[1], pixel[2], alpha))
 
         elif mutation_type == 'alpha':
             rgba_list = list(poly.color)
@@ -68,10 +68,10 @@ def non_uniform_multi_gene_mutation(
             
             new_alpha_float = (rgba_list[3] / 255.0) + change
             rgba_list[3] = int(max(0.0, min(1.0, new_alpha_float)) * 255)
-            poly.color = tuple(rgba_list)
+            polygons[idx] = poly.with_color(rgba_list)
 
         elif mutation_type == 'random_color':
-            poly.color = generate_random_rgba_color(poly.color[3])
+            polygons[idx] = poly.with_color(generate_random_rgba_color(poly.color[3]))
 
         elif mutation_type == 'swap' and n_polygons > 1:
             swap_idx = rng.randrange(n_polygons)
@@ -22,7 +22,8 @@ def make_seed_guided_mutation(base_mutation, seed_store, adopt_prob=0.5):
             return
 
         # For each polygon, sometimes try to adopt the seed color for the tile containing the polygon centroid
-        for poly in individual.polygons:
+        polygons = individual.polygons
+        for idx, poly in enumerate(polygons):
             if random.random() >= (mutation_rate * adopt_prob):
                 continue
 
@@ -40,6 +41,6 @@ def make_seed_guided_mutation(base_mutation, seed_store, adopt_prob=0.5):
             mean_color = sd.get('mean_color')
             if mean_color:
                 # adopt the seed color
-                poly.color = mean_color
+                polygons[idx] = poly.with_color(mean_color)
 
     return mutation
@@ -13,5 +13,5 @@ def single_gene_mutation(individual: Individual, mutation_rate: float, target_im
     if not individual.polygons:
         return
         
-    poly_to_mutate = random.choice(individual.polygons)
-    _mutate_one_polygon(poly_to_mutate, individual, target_img)
\ No newline at end of file
+    idx = random.randrange(len(individual.polygons))
+    individual.polygons[idx] = _mutate_one_polygon(individual.polygons[idx], individual, target_img)
@@ -4,6 +4,7 @@ from src.genetics.individual import Individual
 from PIL import Image
 
 def uniform_multi_gene_mutation(individual: Individual, mutation_rate: float, target_img: Image):
-    for poly in individual.polygons:
+    polygons = individual.polygons
+    for idx, poly in enumerate(polygons):
         if random.random() < mutation_rate:
-            _mutate_one_polygon(poly, individual, target_img)
\ No newline at end of file
+            polygons[idx] = _mutate_one_polygon(poly, individual, target_img)
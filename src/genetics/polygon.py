@@ -1,12 +1,62 @@
 import random
 import numpy as np
 from PIL import Image, ImageDraw
-import copy
+from .utils import to_rgba
+
+# Polygons are immutable: vertices is a tuple of (x, y) int tuples and color
+# the canonical (r, g, b, a) int tuple; hex strings (tile seed colors) and
+# RGB colors are converted once, on construction. Clones and crossover
+# children share Polygon objects with their parents instead of copying them,
+# and a mutation replaces the polygon it changes in the individual's list
+# (copy on write): individuals[i].polygons[j] = poly.with_color(...).
+# Editing one in place would silently change every individual holding it.
+#
+# __slots__ keeps an instance at the size of its two references (no
+# per-polygon __dict__); with_* build the copy from the fields that are
+# already canonical without converting them again.
+
+_set = object.__setattr__
+
+
+def _canonical_vertices(vertices) -> tuple:
+    return tuple((int(x), int(y)) for x, y in vertices)
+
 
 class Polygon:
+    __slots__ = ("vertices", "color")
+
     def __init__(self, vertices, color):
-        self.vertices = vertices
-        self.color = color
+        _set(self, "vertices", _canonical_vertices(vertices))
+        _set(self, "color", to_rgba(color))
+
+    @classmethod
+    def _of(cls, vertices: tuple, color: tuple) -> 'Polygon':
+        """Polygon from fields that are already canonical."""
+        poly = object.__new__(cls)
+        _set(poly, "vertices", vertices)
+        _set(poly, "color", color)
+        return poly
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Polygon es inmutable: usar with_vertices / with_vertex / with_color")
+
+    def __getstate__(self):
+        return self.vertices, self.color
+
+    def __setstate__(self, state):
+        _set(self, "vertices", state[0])
+        _set(self, "color", state[1])
+
+    def with_vertices(self, vertices) -> 'Polygon':
+        return Polygon._of(_canonical_vertices(vertices), self.color)
+
+    def with_vertex(self, index, vertex) -> 'Polygon':
+        vertices = list(self.vertices)
+        vertices[index] = (int(vertex[0]), int(vertex[1]))
+        return Polygon._of(tuple(vertices), self.color)
+
+    def with_color(self, color) -> 'Polygon':
+        return Polygon._of(self.vertices, to_rgba(color))
 
     @staticmethod
     def random(width, height, n_vertices, target_img: Image) -> 'Polygon':
@@ -39,6 +89,5 @@ class Polygon:
         return Polygon(vertices, color)
 
     def clone(self):
-        cloned_vertices = copy.deepcopy(self.vertices)
-        cloned_color = copy.deepcopy(self.color)
-        return Polygon(cloned_vertices, cloned_color)
\ No newline at end of file
+        # immutable: sharing is safe
+        return self
@@ -1,15 +1,30 @@
 import random
 from .individual import Individual
+from .fitness.batch import evaluate_individuals
+from .fitness.cutoff import REJECTED_FITNESS
+from .fitness.memo import FitnessMemo, genome_hash
+from .fitness.sampling import SAMPLE_MODES, draw_sample, rank_agreement
+from .surrogate import SURROGATES, disagreement, make_surrogate, screen
+from .next_gen.traditional_selection import traditional_selection
+from .population_arrays import PopulationArrays
 from .crossover.single_point_crossover import single_point_crossover
 from src.genetics.mutation.non_uniform_mutation import non_uniform_multi_gene_mutation
 import numpy as np
 
+DUPLICATE_POLICIES = (None, "evaluate_once", "remutate", "replace")
+
+
 class Population:
     def __init__(self, population_size, width, height, n_polygons, fitness_method, 
                  mutation_method, selection_method, replacement_method, max_gen,
                  mutation_rate=0.05, crossover_rate=0.8, elite_size=1,
                  seed_store=None, seed_frac=0.0, crossover_method=single_point_crossover,
-                 target_img = None, n_vertices=3):
+                 target_img = None, n_vertices=3, fitness_memo_size=0, duplicate_policy=None,
+                 early_abort=False, sample_fraction=0.0, sample_mode="stratified",
+                 sample_rerank_every=10, sample_rerank_top=5,
+                 screen_ratio=0.0, screen_scale=0.25, screen_percentile=None,
+                 screen_surrogate="lowres", surrogate_alpha=1.0, surrogate_min_samples=32,
+                 surrogate_min_r2=0.0, surrogate_r2_window=3):
         self.population_size = population_size
         self.width = width
         self.height = height
@@ -48,6 +63,61 @@ class Population:
             for _ in range(n_random)
         ])
         self.generation = 0
+        self._pending = []
+        self._pending_keys = []
+        self.eval_stats = {"evaluated": 0, "skipped": 0, "memo_hits": 0}
+        # genome hash -> fitness, across generations (fitness/memo.py)
+        self.fitness_memo = FitnessMemo(fitness_memo_size) if fitness_memo_size > 0 else None
+        # offspring with identical genomes: None (not checked), "evaluate_once",
+        # "remutate" or "replace" (see _handle_duplicates)
+        if duplicate_policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicate_policy '{duplicate_policy}' no disponible")
+        self.duplicate_policy = duplicate_policy
+        self._duplicates = []
+        self.offspring_stats = {"duplicates": 0}
+        # early abort: evaluate the offspring against the survival threshold
+        # before replacement (only meaningful for traditional_selection)
+        self.early_abort = early_abort and replacement_method is traditional_selection
+        self.survival_threshold = None
+        self._deferred_replacement = None
+        self.early_abort_stats = {"rejected": 0}
+        # pixel-subsampled fitness (fitness/sampling.py): selection runs on
+        # scores over a shared pixel sample; the best is re-scored exactly
+        if sample_mode not in SAMPLE_MODES:
+            raise ValueError(f"sample_mode '{sample_mode}' no disponible")
+        self.sample_fraction = float(sample_fraction or 0.0)
+        self.sample_mode = sample_mode
+        self.sample_rerank_every = max(1, int(sample_rerank_every))
+        self.sample_rerank_top = max(1, int(sample_rerank_top))
+        self.pixel_sample = None
+        self._sample_rng = np.random.default_rng(random.getrandbits(64))
+        self._target_array = None
+        self.sample_stats = {"exact_evals": 0, "rank_agreement": None}
+        # best individual by exact fitness, kept in the population since the
+        # replacement only sees sampled scores
+        self._exact_elite = None
+        # low-resolution pre-screening of the offspring (surrogate.py); like
+        # early_abort it needs the deferred replacement of traditional_selection
+        self.screen_ratio = float(screen_ratio or 0.0)
+        self.screen_scale = float(screen_scale)
+        self.screen_percentile = None if screen_percentile is None else float(screen_percentile)
+        if self.screen_percentile is not None and not 0 <= self.screen_percentile <= 100:
+            raise ValueError(f"screen_percentile debe estar en [0, 100], no {screen_percentile}")
+        if screen_surrogate not in SURROGATES:
+            raise ValueError(f"screen_surrogate '{screen_surrogate}' no disponible")
+        self.screen_surrogate = screen_surrogate
+        self.surrogate_alpha = surrogate_alpha
+        self.surrogate_min_samples = surrogate_min_samples
+        self.surrogate_min_r2 = surrogate_min_r2
+        self.surrogate_r2_window = surrogate_r2_window
+        self.screening = 0 < self.screen_ratio < 1 and replacement_method is traditional_selection
+        self._surrogate = None
+        self.screen_stats = {"screened_out": 0, "disagreement": None, "accuracy": None}
+        if self.sample_fraction > 0:
+            # sampled scores of different samples are not comparable across
+            # the deferred replacement
+            self.early_abort = False
+            self.screening = False
         self.best_individual = None
         self.best_fitness = float('-inf')
 
@@ -60,28 +130,220 @@ class Population:
             self.mutation_args["max_generations"] = max_gen
             self.mutation_args["current_generation"] = 1
 
-    def prepare_fitness_tasks(self, reference_img):
-        return [(individual, reference_img) for individual in self.individuals]
+    def collect_pending(self):
+        # Only dirty individuals (new, mutated or crossed over) are submitted;
+        # survivors keep their fitness and never leave the parent process.
+        # With the fitness memo on, dirty genomes that were already scored
+        # (unmutated clones, repeated children) take the stored fitness.
+        # With duplicate handling on, identical dirty genomes are submitted
+        # once and the copies take that result in update_fitness_from_results.
+        # With pre-screening, children the surrogate ranks low are dropped.
+        self._update_sample()
+        dirty = [ind for ind in self.individuals if ind.is_dirty]
+        skipped = len(self.individuals) - len(dirty)
+        self.screen_stats = {"screened_out": 0, "disagreement": None, "accuracy": None}
+        if self.screening and self._deferred_replacement is not None:
+            dirty = self._screen_offspring(dirty)
+        memo_hits = 0
+        self._duplicates = []
+        if self.fitness_memo is None and self.duplicate_policy is None:
+            self._pending, self._pending_keys = dirty, []
+        else:
+            self._pending, self._pending_keys = [], []
+            first = {}
+            for ind in dirty:
+                key = genome_hash(ind)
+                if key in first:
+                    self._duplicates.append((ind, first[key]))
+                    continue
+                fitness = self.fitness_memo.get(key) if self.fitness_memo is not None else None
+                if fitness is None:
+                    if self.duplicate_policy is not None:
+                        first[key] = len(self._pending)
+                    self._pending.append(ind)
+                    self._pending_keys.append(key)
+                else:
+                    ind.fitness = fitness
+                    memo_hits += 1
+        self.eval_stats = {
+            "evaluated": len(self._pending),
+            "skipped": skipped,
+            "memo_hits": memo_hits,
+        }
+        return self._pending
+
+    def prepare_fitness_tasks(self, reference_img, packed=False, chunks=None):
+        """One task per pending individual, or `chunks` tasks of consecutive
+        individuals each (workers score a chunk with evaluate_individuals)."""
+        self.collect_pending()
+        if packed and self._pending:
+            # rows of one struct-of-arrays block, sent as views
+            arrays = PopulationArrays.from_individuals(self._pending)
+            items = [arrays.packed(i) for i in range(len(arrays))]
+        else:
+            items = [] if packed else list(self._pending)
+        # early-abort or sampled generations carry eval_options() as a third element
+        options = self.eval_options()
+        extra = (options,) if options else ()
+        if chunks:
+            step = max(1, -(-len(items) // chunks))
+            return [(items[i:i + step], reference_img) + extra for i in range(0, len(items), step)]
+        return [(item, reference_img) + extra for item in items]
+
+    def evaluate_pending(self, reference_img_array):
+        """Score the pending individuals in this process, in stacked batches."""
+        self.collect_pending()
+        self.update_fitness_from_results(evaluate_individuals(self._pending, reference_img_array,
+                                                              **self.eval_options()))
+
+    def _screen_offspring(self, children):
+        """Keep the children worth a full evaluation; the rest are rejected."""
+        survivors = self._deferred_replacement[0]
+        keep, rejected = screen(children, self._get_surrogate(), self.screen_ratio, survivors,
+                                self.screen_percentile)
+        for ind in rejected:
+            ind.fitness = REJECTED_FITNESS
+        self.screen_stats["screened_out"] = len(rejected)
+        return keep
+
+    def _get_surrogate(self):
+        if self._surrogate is None:
+            self._surrogate = make_surrogate(self.screen_surrogate, self.fitness_method, self.target_img,
+                                             self.screen_scale, self.surrogate_alpha, self.surrogate_min_samples,
+                                             self.surrogate_min_r2, self.surrogate_r2_window)
+        return self._surrogate
+
+    def eval_options(self):
+        """Keyword arguments for calculate_fitness / evaluate_individuals this generation."""
+        options = {}
+        if self.survival_threshold is not None:
+            options["min_fitness"] = self.survival_threshold
+        if self.pixel_sample is not None:
+            options["sample"] = self.pixel_sample
+        return options
+
+    def _update_sample(self):
+        """Draw the pixel sample of this generation. A new sample makes every
+        stored (sampled) fitness stale, so the whole population is re-scored."""
+        if self.sample_fraction <= 0:
+            return
+        redraw = (self.sample_mode == "stratified" and self.generation > 0
+                  and self.generation % self.sample_rerank_every == 0)
+        if self.pixel_sample is not None and not redraw:
+            return
+        if self.pixel_sample is not None:
+            for ind in self.individuals:
+                ind.fitness = float('inf')
+            if self.fitness_memo is not None:
+                self.fitness_memo.clear()
+        self.pixel_sample = draw_sample(self.height, self.width, self.sample_fraction, self._sample_rng)
         
     def update_fitness_from_results(self, results):
-        for individual, fitness in zip(self.individuals, results):
+        for individual, fitness in zip(self._pending, results):
             individual.fitness = fitness
-        
+        for individual, i in self._duplicates:
+            individual.fitness = results[i]
+        self._duplicates = []
+        if self.fitness_memo is not None:
+            for key, fitness in zip(self._pending_keys, results):
+                # REJECTED_FITNESS only holds against this generation's threshold
+                if np.isfinite(fitness):
+                    self.fitness_memo.put(key, fitness)
+        self._pending = []
+        self._pending_keys = []
+        if self._deferred_replacement is not None:
+            old, offspring = self._deferred_replacement
+            self._deferred_replacement = None
+            self.survival_threshold = None
+            rejected = sum(ind.fitness == REJECTED_FITNESS for ind in offspring)
+            self.early_abort_stats = {"rejected": rejected - self.screen_stats["screened_out"]}
+            if self.screening:
+                self.screen_stats["disagreement"] = disagreement(self._surrogate, old + offspring)
+                self._surrogate.learn(offspring)
+                self.screen_stats["accuracy"] = self._surrogate.accuracy
+            self.individuals = self._replace(old, offspring)
+
         current_best = max(self.individuals, key=lambda x: x.fitness)
-        if self.best_individual is None or current_best.fitness > self.best_fitness:
+        fitness = current_best.fitness
+        if self.pixel_sample is not None:
+            current_best = self._rerank_exact()
+            fitness = current_best.exact_fitness
+        if self.best_individual is None or fitness > self.best_fitness:
+            if self.pixel_sample is not None:
+                self._exact_elite = current_best
             self.best_individual = current_best.clone() 
-            self.best_fitness = current_best.fitness
+            # the best is only rendered, never mutated from
+            self.best_individual.delta_base = None
+            self.best_fitness = fitness
+
+    def _exact_fitness(self, individual):
+        if individual.exact_fitness is None:
+            if self._target_array is None:
+                self._target_array = np.asarray(self.target_img.convert("RGB"))
+            individual.exact_fitness = float(self.fitness_method(self._target_array, individual.render_array()))
+            self.sample_stats["exact_evals"] += 1
+        return individual.exact_fitness
+
+    def _rerank_exact(self):
+        """Exact fitness for the sampled best and, every sample_rerank_every
+        generations, for the sampled top sample_rerank_top, which then take
+        their sampled scores in the order of their exact fitness. Returns the
+        best individual."""
+        self.sample_stats = {"exact_evals": 0, "rank_agreement": None}
+        rerank = self.generation % self.sample_rerank_every == 0
+        top = sorted(self.individuals, key=lambda x: x.fitness, reverse=True)
+        top = top[:self.sample_rerank_top] if rerank else top[:1]
+        exact = [self._exact_fitness(ind) for ind in top]
+        if len(top) > 1:
+            sampled = [ind.fitness for ind in top]
+            self.sample_stats["rank_agreement"] = rank_agreement(sampled, exact)
+            by_exact = sorted(top, key=lambda x: x.exact_fitness, reverse=True)
+            for ind, fitness in zip(by_exact, sampled):
+                ind.fitness = fitness
+        return top[0] if len(top) == 1 else by_exact[0]
     
+    def rescale(self, width, height, target_img):
+        """Carry the population over to a new canvas size and target (pyramid
+        level switch). Every individual is re-scored; the best so far is reset
+        since fitness at different sizes is not comparable."""
+        for ind in self.individuals:
+            ind.rescale(width, height)
+        self.width, self.height = width, height
+        self.target_img = target_img
+        self.mutation_args["target_img"] = target_img
+        self._target_array = None
+        self.pixel_sample = None
+        self._exact_elite = None
+        self._surrogate = None
+        if self.fitness_memo is not None:
+            self.fitness_memo.clear()
+        self.best_individual = None
+        self.best_fitness = float('-inf')
+
+    def to_arrays(self) -> PopulationArrays:
+        return PopulationArrays.from_individuals(self.individuals)
+
+    def load_arrays(self, arrays: PopulationArrays):
+        """Replace the individuals with the genomes (and fitness) stored in arrays."""
+        self.individuals = arrays.to_individuals(self.fitness_method, self.mutation_method)
+
     def get_statistics(self):
         fitnesses = [ind.fitness for ind in self.individuals]
+        best = max(self.individuals, key=lambda x: x.fitness)
+        # with a pixel sample the best is reported with its exact fitness;
+        # worst / average / std are over the sampled scores
+        best_fitness = self._exact_fitness(best) if self.pixel_sample is not None else best.fitness
+        elite = self._exact_elite
+        if elite is not None and elite.exact_fitness is not None and elite.exact_fitness > best_fitness:
+            best, best_fitness = elite, elite.exact_fitness
         
         return {
             'generation': self.generation,
             'population_size': len(self.individuals),
-            'best_fitness': max(fitnesses),
+            'best_fitness': best_fitness,
             'worst_fitness': min(fitnesses),
             'average_fitness': sum(fitnesses) / len(fitnesses),
-            'best_individual': max(self.individuals, key=lambda x: x.fitness),
+            'best_individual': best,
             'std_deviation': np.std(fitnesses) if len(fitnesses) > 1 else 0
         }
 
@@ -92,26 +354,93 @@ class Population:
             self.mutation_args["current_generation"] = self.generation
 
         offspring = []
+        births = []
         for i in range(0, len(parents), 2):
             if i + 1 < len(parents):
                 parent1, parent2 = parents[i], parents[i+1]
 
-                if random.random() < self.crossover_rate:
+                crossed = random.random() < self.crossover_rate
+                if crossed:
                     child1, child2 = self.crossover_method(parent1, parent2)
                 else:
                     child1, child2 = parent1.clone(), parent2.clone()
 
+                child1.lineage = (parent1.uid, parent2.uid)
+                child2.lineage = (parent2.uid, parent1.uid)
                 child1.mutate(**self.mutation_args)
                 child2.mutate(**self.mutation_args)
                 offspring.extend([child1, child2])
+                births.extend([(child1, parent1, parent2, crossed), (child2, parent2, parent1, crossed)])
 
-        new_population = self.replacement_method(self.individuals, offspring)
+        if self.duplicate_policy is not None:
+            self._handle_duplicates(offspring)
+        if self.screening:
+            # replaced duplicates have no parents to learn from
+            kept = {id(child) for child in offspring}
+            self._get_surrogate().record_offspring([b for b in births if id(b[0]) in kept])
 
-        self.individuals = new_population
+        if (self.early_abort or self.screening) and not any(ind.is_dirty for ind in self.individuals):
+            # Replacement waits for the offspring's fitness: a child below the
+            # worst current individual cannot make the top N, so it is scored
+            # with that cutoff and update_fitness_from_results replaces.
+            # Pre-screening drops the children the surrogate ranks low first.
+            if self.early_abort:
+                self.survival_threshold = min(ind.fitness for ind in self.individuals)
+            self._deferred_replacement = (self.individuals, offspring)
+            self.individuals = self.individuals + offspring
+        else:
+            self.individuals = self._replace(self.individuals, offspring)
         self.generation += 1
 
         return self.individuals
 
+    def _replace(self, old, offspring):
+        """Apply the replacement method and release the delta-fitness state
+        (a full-frame image each) of the individuals that did not survive.
+        With a pixel sample the exact best takes the place of the worst
+        survivor if the sampled scores left it out."""
+        survivors = list(self.replacement_method(old, offspring))
+        kept = {id(ind) for ind in survivors}
+        elite = self._exact_elite
+        if elite is not None and id(elite) not in kept:
+            worst = min(range(len(survivors)), key=lambda i: survivors[i].fitness)
+            kept.discard(id(survivors[worst]))
+            survivors[worst] = elite
+            kept.add(id(elite))
+        for ind in old + offspring:
+            if id(ind) not in kept:
+                ind.delta_base = None
+        return survivors
+
+    def _handle_duplicates(self, offspring, max_retries=3):
+        """Count offspring whose genome repeats an earlier child of the batch.
+
+        "evaluate_once" keeps them (collect_pending scores each genome once);
+        "remutate" mutates a copy again, up to max_retries times, until it is
+        new; "replace" swaps it for a fresh random individual.
+        """
+        seen = set()
+        duplicates = 0
+        for i, child in enumerate(offspring):
+            key = genome_hash(child)
+            if key in seen:
+                duplicates += 1
+                if self.duplicate_policy == "remutate":
+                    for _ in range(max_retries):
+                        child.mutate(**self.mutation_args)
+                        key = genome_hash(child)
+                        if key not in seen:
+                            break
+                elif self.duplicate_policy == "replace":
+                    child = Individual(self.width, self.height, self.n_polygons, self.fitness_method,
+                                       self.mutation_method, target_img=self.target_img,
+                                       n_vertices=self.n_vertices)
+                    offspring[i] = child
+                    key = genome_hash(child)
+            seen.add(key)
+        self.offspring_stats = {"duplicates": duplicates}
+        return offspring
+
     def _create_seeded_individual(self, seed, width, height, n_polygons, fitness_method, mutation_method):
         """Create a simple Individual seeded from a TileSeed: one polygon covering the tile with the mean color.
 
@@ -0,0 +1,93 @@
+from typing import List, Sequence
+
+import numpy as np
+
+from .genome_codec import PackedGenome, genome_arrays, pack_individual, unpack_genome
+from .individual import Individual
+
+
+class PopulationArrays:
+    """Struct-of-arrays genome storage for a whole population.
+
+    vertices: (pop, n_polygons, n_vertices, 2) int16
+    colors:   (pop, n_polygons, 4) uint8, RGBA
+    fitness:  (pop,) float64, inf for individuals not evaluated yet
+
+    Rows convert to and from Individual objects, so the operators in
+    genetics.py / tiled_ga.py keep working on the object API while batch
+    code (rendering, fitness, transport) works on the arrays; the pool
+    evaluation packs its pending genomes through it.
+    """
+
+    def __init__(self, vertices: np.ndarray, colors: np.ndarray, fitness: np.ndarray, width: int, height: int):
+        self.vertices = vertices
+        self.colors = colors
+        self.fitness = fitness
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def empty(cls, size, n_polygons, n_vertices, width, height) -> "PopulationArrays":
+        return cls(
+            np.zeros((size, n_polygons, n_vertices, 2), dtype=np.int16),
+            np.zeros((size, n_polygons, 4), dtype=np.uint8),
+            np.full(size, np.inf, dtype=np.float64),
+            width,
+            height,
+        )
+
+    @classmethod
+    def from_individuals(cls, individuals: Sequence[Individual]) -> "PopulationArrays":
+        first = individuals[0]
+        vertices, colors = genome_arrays(first, np.int16)
+        n_polygons, n_vertices = vertices.shape[:2]
+        arrays = cls.empty(len(individuals), n_polygons, n_vertices, first.width, first.height)
+        for i, ind in enumerate(individuals):
+            if i:
+                vertices, colors = genome_arrays(ind, np.int16)
+            if vertices.shape[:2] != (n_polygons, n_vertices):
+                raise ValueError("All genomes must have the same number of polygons and vertices")
+            arrays.vertices[i] = vertices
+            arrays.colors[i] = colors
+            arrays.fitness[i] = ind.fitness
+        return arrays
+
+    def __len__(self) -> int:
+        return self.vertices.shape[0]
+
+    @property
+    def n_polygons(self) -> int:
+        return self.vertices.shape[1]
+
+    @property
+    def n_vertices(self) -> int:
+        return self.vertices.shape[2]
+
+    @property
+    def nbytes(self) -> int:
+        return self.vertices.nbytes + self.colors.nbytes + self.fitness.nbytes
+
+    def packed(self, i: int) -> PackedGenome:
+        """Row i in wire format (views, no copy)."""
+        return PackedGenome(self.width, self.height, self.n_vertices,
+                            self.vertices[i].reshape(-1), self.colors[i].reshape(-1))
+
+    def individual(self, i: int, fitness_method, mutation_method=None) -> Individual:
+        ind = unpack_genome(self.packed(i), fitness_method, mutation_method)
+        ind.fitness = float(self.fitness[i])
+        return ind
+
+    def to_individuals(self, fitness_method, mutation_method=None) -> List[Individual]:
+        return [self.individual(i, fitness_method, mutation_method) for i in range(len(self))]
+
+    def write_individual(self, i: int, individual: Individual):
+        p = pack_individual(individual)
+        self.vertices[i] = p.vertices.reshape(self.n_polygons, self.n_vertices, 2)
+        self.colors[i] = p.colors.reshape(self.n_polygons, 4)
+        self.fitness[i] = individual.fitness
+
+    def take(self, indices) -> "PopulationArrays":
+        """New PopulationArrays with the given rows (e.g. a selection result)."""
+        indices = np.asarray(indices, dtype=np.intp)
+        return PopulationArrays(self.vertices[indices], self.colors[indices], self.fitness[indices],
+                                self.width, self.height)
@@ -8,7 +8,7 @@ class TileSeed:
     id: int
     bbox: Tuple[int, int, int, int]  # x0, y0, x1, y1
     centroid: Tuple[int, int]
-    mean_color: str  # hex color '#rrggbb'
+    mean_color: Tuple[int, int, int, int]  # opaque RGBA, like Polygon.color
     mse: float
     pixel_count: int
 
@@ -16,7 +16,7 @@ class TileSeed:
 def compute_tile_seeds(target_array: np.ndarray, tile_size: int) -> List[TileSeed]:
     """Compute mean-color seeds for non-overlapping square tiles.
 
-    Returns a list of TileSeed objects with bbox, centroid, mean_color (hex) and mse.
+    Returns a list of TileSeed objects with bbox, centroid, mean_color (RGBA) and mse.
     """
     h, w = target_array.shape[:2]
     seeds = []
@@ -43,13 +43,12 @@ def compute_tile_seeds(target_array: np.ndarray, tile_size: int) -> List[TileSee
             # mse of flat color
             mse = np.mean((pixels.astype(np.float32) - mean_col.astype(np.float32)) ** 2)
 
-            hex_color = '#{:02x}{:02x}{:02x}'.format(int(mean_col[0]), int(mean_col[1]), int(mean_col[2]))
 
             seeds.append(TileSeed(
                 id=tid,
                 bbox=(x, y, x1, y1),
                 centroid=((x + x1) // 2, (y + y1) // 2),
-                mean_color=hex_color,
+                mean_color=(int(mean_col[0]), int(mean_col[1]), int(mean_col[2]), 255),
                 mse=float(mse),
                 pixel_count=pixels.shape[0]
             ))
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+# Multi-resolution (coarse-to-fine) evolution.
+#
+# The first generations only find the rough layout and colors, which a
+# downscaled target shows just as well at a fraction of the render and
+# fitness cost. With a "pyramid" in the config the population evolves
+# against the target resized to each level's scale in turn (e.g. 1/8, 1/4,
+# 1/2, 1). A level ends after its `generations` or after `plateau`
+# generations without improving the best fitness; the genomes are then
+# rescaled to the next size (Population.rescale) and evolution continues.
+# The last level is always full size and runs until the end of the run.
+#
+#   "pyramid": [0.125, 0.25, {"scale": 0.5, "plateau": 20, "generations": 200}]
+
+
+@dataclass
+class PyramidLevel:
+    scale: float
+    generations: Optional[int] = None  # max generations at this level
+    plateau: Optional[int] = None      # generations without improvement that end it
+
+
+def parse_pyramid(cfg, default_generations: int = 50) -> List[PyramidLevel]:
+    """Levels from cfg["pyramid"] (scales or {"scale", "generations", "plateau"}
+    entries, coarse to fine), ending with a full-size level; [] when unset."""
+    levels = []
+    for entry in cfg.get("pyramid") or []:
+        if not isinstance(entry, dict):
+            entry = {"scale": entry}
+        level = PyramidLevel(float(entry["scale"]), entry.get("generations"), entry.get("plateau"))
+        if not 0 < level.scale <= 1:
+            raise ValueError(f"escala de pirámide fuera de (0, 1]: {level.scale}")
+        if levels and level.scale <= levels[-1].scale:
+            raise ValueError("los niveles de la pirámide deben ir de menor a mayor escala")
+        if level.generations is None and level.plateau is None and level.scale < 1:
+            level.generations = default_generations
+        levels.append(level)
+    if levels and levels[-1].scale < 1:
+        levels.append(PyramidLevel(1.0))
+    return levels
+
+
+# Smallest side of a downscaled level: SSIM (ssim / mixed*) needs a 7 x 7
+# window. Sides already below it (thin edge tiles) keep their native size.
+MIN_LEVEL_SIDE = 7
+
+
+def _level_side(size: int, scale: float) -> int:
+    return max(min(size, MIN_LEVEL_SIDE), round(size * scale))
+
+
+def level_size(width: int, height: int, scale: float) -> Tuple[int, int]:
+    return _level_side(width, scale), _level_side(height, scale)
+
+
+def downscale(img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """Area-averaged target for a level (the full image when size matches)."""
+    return img if img.size == tuple(size) else img.resize(size, Image.BOX)
+
+
+def render_at_size(individual, width: int, height: int) -> Image.Image:
+    """Render of `individual` at width x height, rescaling a copy of the
+    genome when it lives at a coarser level."""
+    if (individual.width, individual.height) != (width, height):
+        individual = individual.clone()
+        individual.rescale(width, height)
+    return individual.render()
+
+
+class PyramidSchedule:
+    """Tracks the active level and decides when to move to the next one."""
+
+    def __init__(self, levels: List[PyramidLevel]):
+        self.levels = levels
+        self.index = 0
+        self._reset()
+
+    def _reset(self):
+        self.generations = 0
+        self._best = float('-inf')
+        self._since_improvement = 0
+
+    @property
+    def level(self) -> PyramidLevel:
+        return self.levels[self.index]
+
+    @property
+    def is_final(self) -> bool:
+        return self.index == len(self.levels) - 1
+
+    def step(self, best_fitness: float) -> bool:
+        """Record one generation at this level; True when the level is done."""
+        self.generations += 1
+        if best_fitness > self._best:
+            self._best = best_fitness
+            self._since_improvement = 0
+        else:
+            self._since_improvement += 1
+        if self.is_final:
+            return False
+        level = self.level
+        return ((level.generations is not None and self.generations >= level.generations)
+                or (level.plateau is not None and self._since_improvement >= level.plateau))
+
+    def advance(self) -> PyramidLevel:
+        self.index += 1
+        self._reset()
+        return self.level
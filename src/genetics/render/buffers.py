@@ -0,0 +1,72 @@
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .raster import RasterScratch
+
+# Render backend and reusable render buffers, resolved once per process.
+
+RENDER_MODES = ("fast", "compat", "numpy")
+_mode: Optional[str] = None
+
+
+def render_mode() -> str:
+    """Backend chosen by GEN_RENDER_MODE, read on first use and then cached."""
+    global _mode
+    if _mode is None:
+        _mode = os.environ.get("GEN_RENDER_MODE", "fast").lower()
+    return _mode
+
+
+def set_render_mode(mode: Optional[str]):
+    """Override the cached backend (None re-reads GEN_RENDER_MODE on next use)."""
+    global _mode
+    _mode = mode.lower() if mode else None
+
+
+class RenderBuffers:
+    """Preallocated per-size buffers: the (H, W, 3) uint8 output array, the
+    planar float32 accumulator and raster scratch of the numpy backend and
+    the RGB canvas the PIL backends draw on. Allocated lazily, then reused by
+    every render."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._acc = None
+        self._scratch = None
+        self._canvas = None
+
+    @property
+    def acc(self) -> np.ndarray:
+        if self._acc is None:
+            self._acc = np.empty((3, self.height, self.width), dtype=np.float32)
+        return self._acc
+
+    @property
+    def scratch(self) -> RasterScratch:
+        if self._scratch is None:
+            self._scratch = RasterScratch(self.width, self.height)
+        return self._scratch
+
+    @property
+    def canvas(self) -> Image.Image:
+        if self._canvas is None:
+            self._canvas = Image.new("RGB", (self.width, self.height), (255, 255, 255))
+        else:
+            self._canvas.paste((255, 255, 255), (0, 0, self.width, self.height))
+        return self._canvas
+
+
+_buffers: Dict[Tuple[int, int], RenderBuffers] = {}
+
+
+def render_buffers(width: int, height: int) -> RenderBuffers:
+    key = (width, height)
+    buffers = _buffers.get(key)
+    if buffers is None:
+        buffers = _buffers[key] = RenderBuffers(width, height)
+    return buffers
@@ -0,0 +1,88 @@
+import os
+from collections import OrderedDict
+from typing import Callable, Optional
+
+# Per-polygon coverage mask cache for the numpy backend.
+#
+# A polygon's coverage only depends on its vertices (and the canvas window),
+# so masks are stored under (width, height, origin, vertex bytes) as the
+# bbox-cropped boolean arrays triangle_coverage produces. Color and alpha
+# mutations keep the key, so the next render blends the cached mask without
+# rasterizing; a vertex mutation produces a new key and the stale mask ages
+# out of the LRU. Memory is bounded by a byte budget.
+# Process-local: every fitness worker keeps its own cache and reports its
+# counters through worker_counters.SharedCounters.
+
+_ENTRY_OVERHEAD = 64
+
+
+class MaskCache:
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = int(budget_bytes)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._reported = (0, 0)
+
+    def coverage(self, key, compute: Callable[[], Optional[tuple]]) -> Optional[tuple]:
+        """Cached (x0, y0, mask) for key, computing (and storing) it on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        cov = compute()
+        if cov is not None:
+            # the rasterizer may hand out a view into its scratch buffer
+            cov = (cov[0], cov[1], cov[2].copy())
+        nbytes = _ENTRY_OVERHEAD + (cov[2].nbytes if cov is not None else 0)
+        if nbytes <= self.budget_bytes:
+            self._entries[key] = (cov, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.budget_bytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                self.nbytes -= size
+                self.evictions += 1
+        return cov
+
+    def take_counts(self):
+        """(hits, misses) since the previous call."""
+        hits, misses = self.hits - self._reported[0], self.misses - self._reported[1]
+        self._reported = (self.hits, self.misses)
+        return hits, misses
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Per-process cache, configured by GEN_MASK_CACHE_MB (0 / unset = off).
+_cache: Optional[MaskCache] = None
+_resolved = False
+
+
+def mask_cache() -> Optional[MaskCache]:
+    global _cache, _resolved
+    if not _resolved:
+        budget_mb = float(os.environ.get("GEN_MASK_CACHE_MB", "0") or 0)
+        _cache = MaskCache(int(budget_mb * 1024 * 1024)) if budget_mb > 0 else None
+        _resolved = True
+    return _cache
+
+
+def set_mask_cache(cache: Optional[MaskCache]):
+    """Install a cache for this process (None re-reads the environment on next use)."""
+    global _cache, _resolved
+    _cache = cache
+    _resolved = cache is not None
@@ -0,0 +1,118 @@
+import math
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# Prefix-composite checkpoint cache.
+#
+# Polygons are drawn in order, so the composite after the first k polygons
+# only depends on those k polygons. While rendering, a snapshot of the
+# canvas is stored every `step` polygons (sqrt(n) by default) under a hash
+# of the prefix drawn so far. A later render whose first k polygons are
+# identical (a child that mutated polygon >= k, a crossover child that kept
+# a parent's head) restores the deepest matching snapshot and only draws the
+# remaining polygons. Snapshots are content-addressed, so children inherit
+# their parents' checkpoints without any bookkeeping in the operators.
+#
+# Snapshots are backend specific (float32 accumulator for "numpy", RGB
+# canvas copy for "fast"); the key carries a tag naming the backend and the
+# canvas size. Memory is bounded by a byte budget with LRU eviction.
+# Process-local: every fitness worker keeps its own cache.
+
+_PREFIX_SEED = hash("prefix")
+
+
+def prefix_hashes(polygons) -> List[int]:
+    """hashes[k] identifies the first k polygons (hashes[0] is the empty prefix)."""
+    hashes = [_PREFIX_SEED]
+    h = _PREFIX_SEED
+    for poly in polygons:
+        h = hash((h, poly.vertices, poly.color))
+        hashes.append(h)
+    return hashes
+
+
+class PrefixCache:
+    def __init__(self, budget_bytes: int, step: int = 0):
+        self.budget_bytes = int(budget_bytes)
+        self.step = int(step)
+        self._entries: "OrderedDict[tuple, Tuple[object, int]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.polygons_skipped = 0
+        self.polygons_drawn = 0
+
+    def step_for(self, n_polygons: int) -> int:
+        return self.step if self.step > 0 else max(1, math.isqrt(n_polygons))
+
+    def checkpoints(self, n_polygons: int) -> range:
+        """Prefix lengths at which snapshots are taken (never the full genome)."""
+        step = self.step_for(n_polygons)
+        return range(step, n_polygons, step)
+
+    def lookup(self, tag, hashes: List[int]) -> Tuple[int, Optional[object]]:
+        """Deepest cached (k, snapshot) for this prefix chain, or (0, None)."""
+        n = len(hashes) - 1
+        for k in reversed(self.checkpoints(n)):
+            key = (tag, k, hashes[k])
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.polygons_skipped += k
+                self.polygons_drawn += n - k
+                return k, entry[0]
+        self.misses += 1
+        self.polygons_drawn += n
+        return 0, None
+
+    def store(self, tag, k: int, prefix_hash: int, snapshot, nbytes: int):
+        if nbytes > self.budget_bytes:
+            return
+        key = (tag, k, prefix_hash)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self._entries[key] = (snapshot, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.budget_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Per-process cache, configured by GEN_PREFIX_CACHE_MB (0 / unset = off)
+# and GEN_PREFIX_CACHE_STEP (0 / unset = sqrt(n_polygons)).
+_cache: Optional[PrefixCache] = None
+_resolved = False
+
+
+def prefix_cache() -> Optional[PrefixCache]:
+    global _cache, _resolved
+    if not _resolved:
+        budget_mb = float(os.environ.get("GEN_PREFIX_CACHE_MB", "0") or 0)
+        step = int(os.environ.get("GEN_PREFIX_CACHE_STEP", "0") or 0)
+        _cache = PrefixCache(int(budget_mb * 1024 * 1024), step) if budget_mb > 0 else None
+        _resolved = True
+    return _cache
+
+
+def set_prefix_cache(cache: Optional[PrefixCache]):
+    """Install a cache for this process (None re-reads the environment on next use)."""
+    global _cache, _resolved
+    _cache = cache
+    _resolved = cache is not None
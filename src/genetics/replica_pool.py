@@ -0,0 +1,225 @@
+import math
+import multiprocessing
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fitness.batch import evaluate_individuals
+from .fitness.evaluator import FitnessEvaluator
+from .genome_codec import PackedGenome, genome_arrays, unpack_genome
+from .shared_target import attach_shared_arrays, resolve_target
+from .worker_counters import publish_fitness_counters, publish_render_counters
+
+# Worker-resident population replicas.
+#
+# Each worker process keeps the genomes (as int16/uint8 arrays) of the shard
+# of the population it evaluated. For a new child the master only sends an
+# EditScript against a parent that already lives on that worker:
+#   - base:    uid of the resident genome the child starts from
+#   - donor:   optional second resident parent plus the index ranges copied
+#              from it (crossover cut points)
+#   - edits:   remaining polygon rows that differ (mutations)
+# Children whose parents are not resident on the chosen shard are sent as a
+# full genome (base=None, every row is an edit).
+
+
+class EditScript:
+    __slots__ = ("uid", "base", "donor", "donor_ranges", "edit_idx", "edit_vertices", "edit_colors")
+
+    def __init__(self, uid, base, donor, donor_ranges, edit_idx, edit_vertices, edit_colors):
+        self.uid = uid
+        self.base = base
+        self.donor = donor
+        self.donor_ranges = donor_ranges
+        self.edit_idx = edit_idx
+        self.edit_vertices = edit_vertices
+        self.edit_colors = edit_colors
+
+    def __getstate__(self):
+        return tuple(getattr(self, k) for k in self.__slots__)
+
+    def __setstate__(self, state):
+        for k, v in zip(self.__slots__, state):
+            setattr(self, k, v)
+
+    @property
+    def nbytes(self) -> int:
+        return self.edit_idx.nbytes + self.edit_vertices.nbytes + self.edit_colors.nbytes + 8 * len(self.donor_ranges)
+
+
+def _ranges(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Half-open [start, stop) runs of True values."""
+    if not mask.any():
+        return []
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return [(int(a), int(b)) for a, b in zip(edges[::2], edges[1::2])]
+
+
+def _apply_script(script: EditScript, replicas: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    if script.base is None:
+        verts = script.edit_vertices.copy()
+        cols = script.edit_colors.copy()
+    else:
+        base_v, base_c = replicas[script.base]
+        verts, cols = base_v.copy(), base_c.copy()
+        if script.donor is not None:
+            donor_v, donor_c = replicas[script.donor]
+            for start, stop in script.donor_ranges:
+                verts[start:stop] = donor_v[start:stop]
+                cols[start:stop] = donor_c[start:stop]
+        verts[script.edit_idx] = script.edit_vertices
+        cols[script.edit_idx] = script.edit_colors
+    return verts, cols
+
+
+def _replica_worker(conn, handles, fitness_method, width, height, counters=None):
+    attach_shared_arrays(handles)
+    target = resolve_target(handles["target"])
+    if isinstance(fitness_method, FitnessEvaluator):
+        fitness_method.prepare(target)
+    replicas = {}
+    # uid -> DeltaState of resident genomes (only filled with delta fitness on)
+    delta_states = {}
+    while True:
+        msg = conn.recv()
+        if msg[0] == "close":
+            break
+        _, drop, scripts, options = msg
+        try:
+            for uid in drop:
+                replicas.pop(uid, None)
+                delta_states.pop(uid, None)
+            individuals = []
+            for script in scripts:
+                verts, cols = _apply_script(script, replicas)
+                replicas[script.uid] = (verts, cols)
+                packed = PackedGenome(width, height, verts.shape[1], verts.reshape(-1), cols.reshape(-1))
+                individual = unpack_genome(packed, fitness_method)
+                individual.delta_base = delta_states.get(script.base)
+                if individual.uses_delta_fitness():
+                    # in order: a later script may start from this state
+                    individual.calculate_fitness(target, min_fitness=options.get("min_fitness"))
+                    if individual.delta_base is not None:
+                        delta_states[script.uid] = individual.delta_base
+                individuals.append(individual)
+            results = evaluate_individuals(individuals, target, **options)
+            publish_render_counters(counters)
+            publish_fitness_counters(counters, fitness_method)
+            conn.send(("ok", results))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+    conn.close()
+
+
+class ReplicaPool:
+    """Evaluates a Population on workers that keep resident genome replicas."""
+
+    def __init__(self, processes, handles, fitness_method, width, height, balance=1.5, counters=None):
+        self.balance = balance
+        self._conns = []
+        self._procs = []
+        for _ in range(max(1, processes)):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            proc = multiprocessing.Process(
+                target=_replica_worker,
+                args=(child_conn, handles, fitness_method, width, height, counters),
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+        # Master-side mirror of what each worker holds: uid -> (shard, vertices, colors)
+        self._resident: Dict[int, Tuple[int, np.ndarray, np.ndarray]] = {}
+        self._drop: List[List[int]] = [[] for _ in self._conns]
+        self.last_bytes = 0
+
+    def _script_for(self, individual, loads, cap):
+        verts, cols = genome_arrays(individual, np.int16)
+        lineage = getattr(individual, "lineage", None) or ()
+        base_uid = next((uid for uid in lineage if uid in self._resident), None)
+
+        shard = None
+        if base_uid is not None:
+            shard = self._resident[base_uid][0]
+            if loads[shard] >= cap:
+                shard = None
+        if shard is None:
+            shard = int(np.argmin(loads))
+            if base_uid is not None and self._resident[base_uid][0] != shard:
+                base_uid = None
+
+        full = EditScript(individual.uid, None, None, [], np.arange(len(cols), dtype=np.int16), verts, cols)
+        if base_uid is None:
+            return shard, full, verts, cols
+
+        _, base_v, base_c = self._resident[base_uid]
+        if base_v.shape != verts.shape:
+            return shard, full, verts, cols
+
+        changed = (verts != base_v).any(axis=(1, 2)) | (cols != base_c).any(axis=1)
+        donor_uid, donor_ranges = None, []
+        for uid in lineage:
+            entry = self._resident.get(uid)
+            if uid == base_uid or entry is None or entry[0] != shard or entry[1].shape != verts.shape:
+                continue
+            from_donor = changed & (verts == entry[1]).all(axis=(1, 2)) & (cols == entry[2]).all(axis=1)
+            if from_donor.any():
+                donor_uid, donor_ranges = uid, _ranges(from_donor)
+                changed &= ~from_donor
+            break
+
+        idx = np.flatnonzero(changed).astype(np.int16)
+        script = EditScript(individual.uid, base_uid, donor_uid, donor_ranges, idx, verts[idx], cols[idx])
+        return shard, script, verts, cols
+
+    def evaluate(self, population) -> List[float]:
+        pending = population.collect_pending()
+        n_shards = len(self._conns)
+        cap = max(1, math.ceil(len(pending) / n_shards * self.balance))
+        loads = np.zeros(n_shards, dtype=int)
+        per_shard: List[List[EditScript]] = [[] for _ in range(n_shards)]
+        order: List[List[int]] = [[] for _ in range(n_shards)]
+        new_residents = []
+
+        for i, individual in enumerate(pending):
+            shard, script, verts, cols = self._script_for(individual, loads, cap)
+            loads[shard] += 1
+            per_shard[shard].append(script)
+            order[shard].append(i)
+            new_residents.append((script.uid, (shard, verts, cols)))
+
+        self.last_bytes = sum(s.nbytes for scripts in per_shard for s in scripts)
+        for shard, conn in enumerate(self._conns):
+            conn.send(("eval", self._drop[shard], per_shard[shard], population.eval_options()))
+            self._drop[shard] = []
+
+        results: List[Optional[float]] = [None] * len(pending)
+        for shard, conn in enumerate(self._conns):
+            status, payload = conn.recv()
+            if status != "ok":
+                raise RuntimeError(f"replica worker {shard} failed:\n{payload}")
+            for i, fitness in zip(order[shard], payload):
+                results[i] = fitness
+
+        # Mirror the new residents; anything no longer in the population is
+        # dropped on the next round (this round's scripts may still need it).
+        self._resident.update(new_residents)
+        live = {ind.uid for ind in population.individuals}
+        for uid in [uid for uid in self._resident if uid not in live]:
+            self._drop[self._resident.pop(uid)[0]].append(uid)
+        return results
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        for conn in self._conns:
+            conn.close()
+
@@ -0,0 +1,84 @@
+from multiprocessing import shared_memory
+from typing import Dict, NamedTuple, Tuple, Union
+
+import numpy as np
+
+
+class SharedArrayHandle(NamedTuple):
+    """Picklable reference to an array living in a shared memory block."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedTarget:
+    """Owns shared memory copies of the target image and any derived arrays.
+
+    Created once in the parent process; workers only ever receive the (tiny)
+    handles and attach to the blocks through `attach_shared_arrays`.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks = {}
+        self._views = {}
+        self.handles = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+            view[...] = arr
+            self._blocks[key] = shm
+            self._views[key] = view
+            self.handles[key] = SharedArrayHandle(shm.name, tuple(arr.shape), arr.dtype.str)
+
+    @property
+    def handle(self) -> SharedArrayHandle:
+        return self.handles["target"]
+
+    def array(self, key: str = "target") -> np.ndarray:
+        return self._views[key]
+
+    def close(self):
+        self._views.clear()
+        for shm in self._blocks.values():
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-process cache of attached blocks: shm name -> (SharedMemory, read-only view)
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def attach(handle: SharedArrayHandle) -> np.ndarray:
+    """Return a read-only view of a shared array, attaching on first use."""
+    entry = _attached.get(handle.name)
+    if entry is None:
+        shm = shared_memory.SharedMemory(name=handle.name)
+        view = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf)
+        view.flags.writeable = False
+        entry = (shm, view)
+        _attached[handle.name] = entry
+    return entry[1]
+
+
+def attach_shared_arrays(handles: Dict[str, SharedArrayHandle]):
+    """Pool initializer: attach every shared array once per worker."""
+    for handle in handles.values():
+        attach(handle)
+
+
+def resolve_target(reference: Union[np.ndarray, SharedArrayHandle]) -> np.ndarray:
+    """Accept either a plain array (in-process evaluation) or a shared handle."""
+    if isinstance(reference, SharedArrayHandle):
+        return attach(reference)
+    return reference
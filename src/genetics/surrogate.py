@@ -0,0 +1,224 @@
+import math
+import pickle
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from .fitness.evaluator import resolve_evaluator
+from .fitness.sampling import rank_agreement
+from .pyramid import downscale, level_size
+
+# Cheap surrogate fitness for pre-screening offspring.
+#
+# With a deferred replacement (traditional_selection, see
+# Population.create_next_generation) most children end below the worst
+# survivor and are thrown away after paying a full-resolution render and
+# fitness. Population(screen_ratio=r) first scores every pending child with
+# LowResSurrogate: the genome rescaled onto a small canvas (screen_scale of
+# the target size) and scored with the same metric against the target
+# downscaled once. Only the best ceil(r * n) children by that score, plus
+# those at or above the screen_percentile of the survivors' surrogate
+# scores, get the full evaluation; the rest take REJECTED_FITNESS and cannot
+# survive. screen_disagreement (1 - rank_agreement of surrogate vs exact
+# fitness over the survivors and the evaluated children) tracks how much
+# the cheap ranking can be trusted.
+#
+# RidgeSurrogate (screen_surrogate="ridge") renders nothing: it predicts a
+# child's fitness from how it was bred (OFFSPRING_FEATURES: parents'
+# fitness, crossover, share of polygons whose vertices / colors changed,
+# changed area, color shift) with a ridge regression refit every
+# generation on the (features -> exact fitness) pairs of the children that
+# were evaluated. Until it has min_samples pairs, and while any of its last
+# accuracy_window generations predicted with R^2 <= min_accuracy (or too
+# few / too similar children to measure it), every child is evaluated.
+
+SURROGATES = ("lowres", "ridge")
+# R^2 needs this many evaluated children and a fitness variance above
+# R2_VARIANCE_FLOOR * mean^2; otherwise it is not measured (None)
+R2_MIN_SAMPLES = 8
+R2_VARIANCE_FLOOR = 1e-6
+OFFSPRING_FEATURES = ("parent1_fitness", "parent2_fitness", "crossover", "vertices_changed",
+                      "colors_changed", "changed_area", "color_shift")
+
+
+class Surrogate:
+    """Interface of the screening surrogates (scores comparable to each other only)."""
+
+    # False while the surrogate cannot rank children yet (all are evaluated)
+    ready = True
+    # accuracy of the last batch of predictions (R^2), when the model learns
+    accuracy = None
+
+    def record_offspring(self, births):
+        """(child, parent1, parent2, crossed) for the children of a generation."""
+
+    def score(self, individual) -> Optional[float]:
+        raise NotImplementedError
+
+    def survivor_score(self, individual) -> Optional[float]:
+        """Score of a current individual, for screen_percentile."""
+        return self.score(individual)
+
+    def learn(self, offspring):
+        """Called with the offspring once the kept ones have their exact fitness."""
+
+
+class LowResSurrogate(Surrogate):
+    def __init__(self, fitness_method, target_img, scale: float):
+        self.width, self.height = level_size(target_img.width, target_img.height, scale)
+        self.target = np.array(downscale(target_img.convert("RGB"), (self.width, self.height)))
+        # own copy: the population's evaluator stays prepared on the full target
+        self.evaluator = pickle.loads(pickle.dumps(resolve_evaluator(fitness_method)))
+        self.evaluator.prepare(self.target)
+
+    def score(self, individual) -> float:
+        if individual.surrogate_fitness is None:
+            small = individual.clone()
+            small.rescale(self.width, self.height)
+            individual.surrogate_fitness = float(self.evaluator.score(small.render_array()))
+        return individual.surrogate_fitness
+
+
+def _bbox_areas(vertices: np.ndarray) -> np.ndarray:
+    extent = vertices.max(axis=1) - vertices.min(axis=1)
+    return extent[:, 0].astype(np.float64) * extent[:, 1]
+
+
+def r_squared(predicted: np.ndarray, actual: np.ndarray) -> Optional[float]:
+    """Coefficient of determination, None when actual is too small or flat to tell."""
+    if len(actual) < R2_MIN_SAMPLES:
+        return None
+    variance = float(actual.var())
+    if variance <= R2_VARIANCE_FLOOR * max(float(actual.mean()) ** 2, 1e-12):
+        return None
+    residual = actual - predicted
+    return 1.0 - float(residual @ residual) / (variance * len(actual))
+
+
+def offspring_features(child, parent1, parent2, crossed: bool) -> np.ndarray:
+    """OFFSPRING_FEATURES of a child, from its genome diff against parent1."""
+    vertices, colors = child.genome_arrays()
+    base_vertices, base_colors = parent1.genome_arrays()
+    n = max(1, len(vertices))
+    if vertices.shape != base_vertices.shape:
+        moved = recolored = np.ones(len(vertices), dtype=bool)
+        area, shift = 1.0, 1.0
+    else:
+        moved = (vertices != base_vertices).any(axis=(1, 2))
+        recolored = (colors != base_colors).any(axis=1)
+        changed = moved | recolored
+        area = (_bbox_areas(vertices[changed]).sum() + _bbox_areas(base_vertices[changed]).sum()) \
+            / (child.width * child.height)
+        shift = np.abs(colors[recolored].astype(np.int16) - base_colors[recolored]).sum() / (255.0 * 4 * n)
+    return np.array([parent1.fitness, parent2.fitness, float(crossed), moved.sum() / n,
+                     recolored.sum() / n, area, shift])
+
+
+class RidgeSurrogate(Surrogate):
+    """Online ridge regression from OFFSPRING_FEATURES to exact fitness."""
+
+    def __init__(self, alpha: float = 1.0, min_samples: int = 32, window: int = 2000,
+                 min_accuracy: float = 0.0, accuracy_window: int = 3):
+        self.alpha = float(alpha)
+        self.min_samples = int(min_samples)
+        self.window = int(window)
+        self.min_accuracy = float(min_accuracy)
+        # accuracy of the last accuracy_window generations (None = not measured)
+        self._recent = deque(maxlen=max(1, int(accuracy_window)))
+        self._x = np.empty((0, len(OFFSPRING_FEATURES)))
+        self._y = np.empty(0)
+        self._features = {}  # uid -> features of this generation's children
+        self._model = None  # (feature mean, feature std, y mean, weights)
+        self.accuracy = None
+
+    @property
+    def ready(self) -> bool:
+        return (self._model is not None and len(self._recent) == self._recent.maxlen
+                and all(acc is not None and acc > self.min_accuracy for acc in self._recent))
+
+    def record_offspring(self, births):
+        self._features = {child.uid: offspring_features(child, p1, p2, crossed)
+                          for child, p1, p2, crossed in births}
+
+    def _predict(self, x: np.ndarray) -> np.ndarray:
+        mean, std, y_mean, weights = self._model
+        return ((x - mean) / std) @ weights + y_mean
+
+    def score(self, individual) -> Optional[float]:
+        if individual.surrogate_fitness is None:
+            x = self._features.get(individual.uid)
+            if x is None or self._model is None:
+                return None
+            individual.surrogate_fitness = float(self._predict(x[None])[0])
+        return individual.surrogate_fitness
+
+    def survivor_score(self, individual) -> Optional[float]:
+        # predictions are on the fitness scale
+        return individual.fitness
+
+    def learn(self, offspring):
+        pairs = [(self._features[ind.uid], ind.fitness) for ind in offspring
+                 if ind.uid in self._features and np.isfinite(ind.fitness)]
+        self._features = {}
+        self.accuracy = None
+        if not pairs:
+            if self._model is not None:
+                self._recent.append(None)
+            return
+        x = np.array([p[0] for p in pairs])
+        y = np.array([p[1] for p in pairs], dtype=np.float64)
+        if self._model is not None:
+            # R^2 of predictions made before seeing these results
+            self.accuracy = r_squared(self._predict(x), y)
+            self._recent.append(self.accuracy)
+        self._x = np.concatenate([self._x, x])[-self.window:]
+        self._y = np.concatenate([self._y, y])[-self.window:]
+        if len(self._y) >= self.min_samples:
+            self._fit()
+
+    def _fit(self):
+        mean, std = self._x.mean(axis=0), self._x.std(axis=0)
+        std[std == 0] = 1.0
+        xs = (self._x - mean) / std
+        y_mean = self._y.mean()
+        gram = xs.T @ xs + self.alpha * np.eye(xs.shape[1])
+        weights = np.linalg.solve(gram, xs.T @ (self._y - y_mean))
+        self._model = (mean, std, y_mean, weights)
+
+
+def make_surrogate(kind, fitness_method, target_img, scale=0.25, alpha=1.0, min_samples=32,
+                   min_accuracy=0.0, accuracy_window=3):
+    if kind == "lowres":
+        return LowResSurrogate(fitness_method, target_img, scale)
+    if kind == "ridge":
+        return RidgeSurrogate(alpha, min_samples, min_accuracy=min_accuracy, accuracy_window=accuracy_window)
+    raise ValueError(f"screen_surrogate '{kind}' no disponible")
+
+
+def screen(children, surrogate: Surrogate, ratio: float, survivors=(), percentile=None):
+    """Split children into (to evaluate, screened out) by surrogate score.
+
+    Children the surrogate cannot score are always evaluated."""
+    if not children or not surrogate.ready:
+        return list(children), []
+    scores = np.array([surrogate.score(child) for child in children], dtype=np.float64)
+    unknown = np.isnan(scores)
+    keep = unknown.copy()
+    ranked = np.argsort(-np.where(unknown, -np.inf, scores), kind="stable")
+    keep[ranked[:math.ceil(ratio * (len(children) - unknown.sum()))]] = True
+    if percentile is not None and survivors:
+        bar = np.percentile([surrogate.survivor_score(ind) for ind in survivors], percentile)
+        keep |= ~unknown & (scores >= bar)
+    return ([child for child, k in zip(children, keep) if k],
+            [child for child, k in zip(children, keep) if not k])
+
+
+def disagreement(surrogate: Surrogate, individuals) -> Optional[float]:
+    """Fraction of pairs the surrogate orders differently from the fitness."""
+    scored = [ind for ind in individuals if np.isfinite(ind.fitness)]
+    pairs = [(surrogate.score(ind), ind.fitness) for ind in scored]
+    pairs = [pair for pair in pairs if pair[0] is not None]
+    if len(pairs) < 2:
+        return None
+    return 1.0 - rank_agreement([p[0] for p in pairs], [p[1] for p in pairs])
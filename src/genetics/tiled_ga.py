@@ -8,11 +8,12 @@ import numpy as np
 from PIL import Image, ImageDraw
 import matplotlib.pyplot as plt
 
-from .fitness.mse import mse_fitness
-from .fitness.ssim import ssim_fitness
-from .fitness.mixed_fitness import mixed_fitness
-from .fitness.mixed_mse_ssim_deltae import mixed_fitness_mse_ssim_deltaE
-from .fitness.deltaE import delta_e_fitness
+from .fitness.mse import mse_fitness, MSEEvaluator
+from .fitness.ssim import ssim_fitness, SSIMEvaluator
+from .fitness.mixed_fitness import mixed_fitness, MixedEvaluator
+from .fitness.mixed_mse_ssim_deltae import mixed_fitness_mse_ssim_deltaE, MixedMSESSIMDeltaEEvaluator
+from .fitness.deltaE import delta_e_fitness, DeltaEEvaluator
+from .fitness.evaluator import resolve_evaluator
 
 
 from .mutation.single_gene_mutation import single_gene_mutation
@@ -40,6 +41,11 @@ from .crossover.circular_crossover import annular_crossover
 from .crossover.artistic_crossover import artistic_crossover
 
 from .population import Population
+from .env_config import apply_env_config
+from .pyramid import PyramidSchedule, downscale, level_size, parse_pyramid, render_at_size
+from .render.buffers import render_mode as active_render_mode
+from .render.mask_cache import mask_cache
+from .fitness.cutoff import cutoff_stats
 from .fitness.mse import mse_fitness
 from .mutation.multi_gene_mutation import multi_gene_mutation
 from .selection.ranking import ranking_selection
@@ -52,10 +58,9 @@ from .crossover.two_point_crossover import two_point_crossover
 
 
 def _eval_population(pop: Population, target_np: np.ndarray) -> None:
-    tasks = pop.prepare_fitness_tasks(target_np)
-    # sequential evaluation avoids nested multiprocessing issues
-    results = [ind.calculate_fitness(target_np) for ind, _ in tasks]
-    pop.update_fitness_from_results(results)
+    # sequential evaluation avoids nested multiprocessing issues; renders are
+    # scored in stacked batches when batch_fitness_mb is set
+    pop.evaluate_pending(target_np)
 
 def _tiles_for_image(width: int, height: int, tile_size: int) -> List[Tuple[int, int, int, int]]:
     boxes = []
@@ -70,11 +75,11 @@ def _tiles_for_image(width: int, height: int, tile_size: int) -> List[Tuple[int,
 
 # --- mapas de nombre->función (según lo implementado) ---
 fitness_map = {
-    "mse": mse_fitness,
-    "ssim": ssim_fitness,
-    "mixed": mixed_fitness,
-    "mixed_mse_ssim_deltae": mixed_fitness_mse_ssim_deltaE,
-    "deltaE": delta_e_fitness,
+    "mse": MSEEvaluator,
+    "ssim": SSIMEvaluator,
+    "mixed": MixedEvaluator,
+    "mixed_mse_ssim_deltae": MixedMSESSIMDeltaEEvaluator,
+    "deltaE": DeltaEEvaluator,
 }
 
 mutation_map = {
@@ -122,11 +127,8 @@ def main():
         with open(args.config, 'r', encoding='utf-8') as f:
             cfg_json = json.load(f) or {}
 
-    render_mode = cfg_json.get('render_mode')
-    if render_mode is None and cfg_json.get('use_fast_render') is not None:
-        render_mode = 'fast' if bool(cfg_json.get('use_fast_render')) else 'compat'
-    if render_mode:
-        os.environ['GEN_RENDER_MODE'] = str(render_mode)
+    # render mode, caches, delta fitness and batch budget (GEN_* variables)
+    apply_env_config(cfg_json)
 
     # Resolve inputs with config taking precedence
     image_path = cfg_json.get('image_path')
@@ -164,6 +166,14 @@ def main():
     cfg.setdefault('replacement', cfg_json.get('replacement', 'traditional'))
     cfg.setdefault('crossover', cfg_json.get('crossover', 'two_point'))
 
+    # Coarse-to-fine pyramid (see pyramid.py): every tile evolves against its
+    # downscaled target first; all tiles switch level together
+    try:
+        pyramid = parse_pyramid(cfg)
+    except (KeyError, TypeError, ValueError) as e:
+        raise SystemExit(f"Invalid pyramid: {e}")
+    schedule = PyramidSchedule(pyramid) if pyramid else None
+
     tasks = []
     for (x0, y0, x1, y1) in boxes:
         tile_np = full_np[y0:y1, x0:x1].copy()
@@ -188,15 +198,26 @@ def main():
     print(f"Tiles: {len(tasks)} | sequential mode with per-generation preview interval {preview_interval}")
     # Build a population per tile
     tile_objs = []
+    # per tile: (level image, level array) for each pyramid level
+    tile_levels = []
     for (_, x0, y0, x1, y1, tile_np, _) in tasks:
-        h, w = tile_np.shape[:2]
         timg = Image.fromarray(tile_np)
+        levels = [(timg, tile_np)]
+        if schedule is not None:
+            levels = []
+            for level in pyramid:
+                im = downscale(timg, level_size(x1 - x0, y1 - y0, level.scale))
+                levels.append((im, np.array(im) if level.scale < 1 else tile_np))
+        timg, tile_np = levels[0]
+        tile_levels.append(levels)
+        h, w = tile_np.shape[:2]
         pop = Population(
             population_size=cfg.get('population_size', 40),
             width=w,
             height=h,
             n_polygons=cfg.get('polygons_per_tile', cfg.get('n_polygons', 60)),
-            fitness_method=fitness_map[cfg.get("fitness", "mse")],
+            # one evaluator per tile, prepared once against that tile's target
+            fitness_method=resolve_evaluator(fitness_map[cfg.get("fitness", "mse")], cfg),
             mutation_method=mutation_map[cfg.get("mutation", "multi_gene")],
             selection_method=selection_map[cfg.get("selection", "ranking")],
             replacement_method=replacement_map[cfg.get("replacement", "traditional")],
@@ -208,18 +229,35 @@ def main():
             seed_frac=0.0,
             target_img=timg,
             crossover_method=crossover_map[cfg.get("crossover", "two_point")],
-            n_vertices=cfg.get('n_vertices', 3)
+            n_vertices=cfg.get('n_vertices', 3),
+            fitness_memo_size=int(cfg.get('fitness_memo_size', 0)),
+            duplicate_policy=cfg.get('duplicate_policy'),
+            early_abort=bool(cfg.get('early_abort', False)),
+            sample_fraction=float(cfg.get('sample_fraction', 0.0)),
+            sample_mode=cfg.get('sample_mode', 'stratified'),
+            sample_rerank_every=int(cfg.get('sample_rerank_every', 10)),
+            sample_rerank_top=int(cfg.get('sample_rerank_top', 5)),
+            screen_ratio=float(cfg.get('screen_ratio', 0.0)),
+            screen_scale=float(cfg.get('screen_scale', 0.25)),
+            screen_percentile=(float(cfg['screen_percentile'])
+                               if cfg.get('screen_percentile') is not None else None),
+            screen_surrogate=cfg.get('screen_surrogate', 'lowres'),
+            surrogate_alpha=float(cfg.get('surrogate_alpha', 1.0)),
+            surrogate_min_samples=int(cfg.get('surrogate_min_samples', 32)),
+            surrogate_min_r2=float(cfg.get('surrogate_min_r2', 0.0)),
+            surrogate_r2_window=int(cfg.get('surrogate_r2_window', 3)),
         )
 
         tile_objs.append((x0, y0, tile_np, pop))
+    tile_sizes = [(x1 - x0, y1 - y0) for (_, x0, y0, x1, y1, _, _) in tasks]
 
     # Initial eval
     for (_, _, tile_np, pop) in tile_objs:
         _eval_population(pop, tile_np)
 
     def _compose_current():
-        for (x0, y0, _, pop) in tile_objs:
-            im = pop.best_individual.render()
+        for (x0, y0, _, pop), size in zip(tile_objs, tile_sizes):
+            im = render_at_size(pop.best_individual, *size)
             canvas.paste(im, (x0, y0))
             # _draw_border(x0, y0, im) #debug: show tile borders
 
@@ -242,7 +280,51 @@ def main():
             pop.create_next_generation()
             _eval_population(pop, tile_np)
         fits = [pop.get_statistics()['best_fitness'] for (_, _, _, pop) in tile_objs]
-        print(f"Gen {gen}: avg_best={np.mean(fits):.6f} min_best={np.min(fits):.6f}")
+        # only the numpy renderer uses the mask cache
+        masks = mask_cache() if active_render_mode() == "numpy" else None
+        cache_info = f" mask_hit_rate={masks.hit_rate:.3f}" if masks is not None else ""
+        # per-component time of composite fitnesses, summed over tiles
+        timings = {}
+        for (_, _, _, pop) in tile_objs:
+            for name, sec in pop.fitness_method.take_timings().items():
+                timings[name] = timings.get(name, 0.0) + sec
+        cache_info += "".join(f" {name}_ms={sec * 1e3:.1f}" for name, sec in timings.items())
+        memos = [pop.fitness_memo for (_, _, _, pop) in tile_objs if pop.fitness_memo is not None]
+        if cfg.get('duplicate_policy') is not None:
+            cache_info += f" duplicates={sum(pop.offspring_stats['duplicates'] for (_, _, _, pop) in tile_objs)}"
+        if cfg.get('early_abort'):
+            scored, skipped = cutoff_stats.take_counts()
+            rejected = sum(pop.early_abort_stats['rejected'] for (_, _, _, pop) in tile_objs)
+            cache_info += f" rejected={rejected} pixels_skipped={skipped / max(1, scored + skipped):.3f}"
+        if cfg.get('sample_fraction'):
+            exact = sum(pop.sample_stats['exact_evals'] for (_, _, _, pop) in tile_objs)
+            cache_info += f" exact_evals={exact}"
+        if cfg.get('screen_ratio'):
+            screened = sum(pop.screen_stats['screened_out'] for (_, _, _, pop) in tile_objs)
+            disagreements = [pop.screen_stats['disagreement'] for (_, _, _, pop) in tile_objs
+                             if pop.screen_stats['disagreement'] is not None]
+            cache_info += f" screened_out={screened}"
+            if disagreements:
+                cache_info += f" screen_disagreement={np.mean(disagreements):.3f}"
+            accuracies = [pop.screen_stats['accuracy'] for (_, _, _, pop) in tile_objs
+                          if pop.screen_stats['accuracy'] is not None]
+            if accuracies:
+                cache_info += f" surrogate_r2={np.mean(accuracies):.3f}"
+        if memos:
+            lookups = sum(m.hits + m.misses for m in memos)
+            cache_info += f" memo_hit_rate={sum(m.hits for m in memos) / max(1, lookups):.3f}"
+        if schedule is not None:
+            cache_info += f" level={schedule.index} scale={schedule.level.scale:g}"
+        print(f"Gen {gen}: avg_best={np.mean(fits):.6f} min_best={np.min(fits):.6f}{cache_info}")
+        if schedule is not None and schedule.step(float(np.mean(fits))):
+            # next level: rescale every tile's genomes and re-score them
+            level = schedule.advance()
+            for k, (x0, y0, _, pop) in enumerate(tile_objs):
+                timg, tile_np = tile_levels[k][schedule.index]
+                pop.rescale(timg.width, timg.height, timg)
+                _eval_population(pop, tile_np)
+                tile_objs[k] = (x0, y0, tile_np, pop)
+            print(f"Level {schedule.index}: scale {level.scale:g}")
         if preview_flag and (gen % max(1, preview_interval) == 0):
             _compose_current()
             if show_gui and img_display is not None:
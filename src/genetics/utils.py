@@ -16,6 +16,15 @@ def hex_to_rgba(hex_color, alpha=255):
     b = int(hex_color[4:6], 16)
     return (r, g, b, alpha)
 
+def to_rgba(color):
+    # Canonical polygon color: (r, g, b, a) tuple of ints, from a hex string
+    # (alpha 255), an RGB or an RGBA sequence (possibly of numpy integers)
+    if isinstance(color, str):
+        return hex_to_rgba(color)
+    if len(color) == 3:
+        return (int(color[0]), int(color[1]), int(color[2]), 255)
+    return (int(color[0]), int(color[1]), int(color[2]), int(color[3]))
+
 def generate_random_rgba_color(a):
     r = random.randint(0, 255)
     g = random.randint(0, 255)
@@ -29,11 +38,12 @@ def blend_colors(c1, c2, alpha=0.5):
     return f"#{r:02x}{g:02x}{b:02x}"
 
 def smart_color_mutation(individual, target_img, mutation_rate=0.05):
-    for poly in individual.polygons:
+    polygons = individual.polygons
+    for idx, poly in enumerate(polygons):
         if random.random() < mutation_rate:
             x = random.randint(0, individual.width - 1)
             y = random.randint(0, individual.height - 1)
             new_color = target_img.getpixel((x, y))
-            poly.color = (new_color[0], new_color[1], new_color[2], poly.color[3])
+            polygons[idx] = poly.with_color((new_color[0], new_color[1], new_color[2], poly.color[3]))
 
     return individual
\ No newline at end of file
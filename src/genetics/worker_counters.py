@@ -0,0 +1,60 @@
+import multiprocessing
+from typing import Dict, Iterable, Optional
+
+from .fitness.cutoff import cutoff_stats
+from .render.mask_cache import mask_cache
+
+# Counters that fitness workers add to and the parent reads for the
+# metrics CSV (cache hit rates and the like). The Array is handed to the
+# workers at process start (Pool initargs / Process args).
+
+
+class SharedCounters:
+    """Named int64 counters shared by the parent and its worker processes."""
+
+    def __init__(self, names: Iterable[str]):
+        self.names = tuple(names)
+        self._values = multiprocessing.Array("q", len(self.names))
+
+    def add(self, deltas: Dict[str, int]):
+        with self._values.get_lock():
+            for i, name in enumerate(self.names):
+                value = deltas.get(name)
+                if value:
+                    self._values[i] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._values.get_lock():
+            return dict(zip(self.names, self._values[:]))
+
+
+RENDER_COUNTERS = ("mask_hits", "mask_misses")
+
+
+def publish_render_counters(counters: Optional[SharedCounters]):
+    """Add this process's render-cache activity since the last call."""
+    cache = mask_cache()
+    if counters is None or cache is None:
+        return
+    hits, misses = cache.take_counts()
+    counters.add({"mask_hits": hits, "mask_misses": misses})
+
+
+# Per-component fitness time (composite evaluators), in microseconds, and
+# pixels scored / skipped by early-abort evaluations.
+FITNESS_TIMERS = ("planes", "lab", "mse", "ssim", "delta_e")
+FITNESS_COUNTERS = tuple(f"fitness_{name}_us" for name in FITNESS_TIMERS) + (
+    "cutoff_pixels_scored", "cutoff_pixels_skipped")
+
+
+def publish_fitness_counters(counters: Optional[SharedCounters], fitness_method):
+    """Add the evaluator's per-component fitness time and this process's
+    early-abort pixel counts since the last call."""
+    if counters is None:
+        return
+    scored, skipped = cutoff_stats.take_counts()
+    deltas = {"cutoff_pixels_scored": scored, "cutoff_pixels_skipped": skipped}
+    if hasattr(fitness_method, "take_timings"):
+        for name, sec in fitness_method.take_timings().items():
+            deltas[f"fitness_{name}_us"] = int(sec * 1e6)
+    counters.add(deltas)
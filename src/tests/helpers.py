@@ -0,0 +1,34 @@
+"""Factories shared by the test modules (not collected by pytest)."""
+import numpy as np
+from PIL import Image
+
+from src.genetics.population import Population
+from src.genetics.fitness.mse import mse_fitness
+from src.genetics.individual import Individual
+from src.genetics.mutation.single_gene_mutation import single_gene_mutation
+from src.genetics.selection.torneos import tournament_selection
+from src.genetics.next_gen.traditional_selection import traditional_selection
+from src.genetics.crossover.two_point_crossover import two_point_crossover
+
+
+def make_population(size=10, n_polygons=6, **kwargs):
+    target = Image.fromarray(np.random.randint(0, 256, size=(24, 32, 3), dtype=np.uint8))
+    params = dict(
+        population_size=size, width=32, height=24, n_polygons=n_polygons,
+        fitness_method=mse_fitness, mutation_method=single_gene_mutation,
+        selection_method=tournament_selection, replacement_method=traditional_selection,
+        max_gen=10, elite_size=2, target_img=target, crossover_method=two_point_crossover,
+    )
+    params.update(kwargs)
+    return Population(**params), np.array(target)
+
+
+def evaluate(pop, target):
+    tasks = pop.prepare_fitness_tasks(target)
+    pop.update_fitness_from_results([ind.calculate_fitness(ref) for ind, ref in tasks])
+
+
+
+def make_individuals(target, evaluator, n=7):
+    img = Image.fromarray(target)
+    return [Individual(28, 20, 8, evaluator, single_gene_mutation, target_img=img) for _ in range(n)]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.genetics.fitness.batch import chunk_size, evaluate_individuals, set_batch_fitness_budget
+from src.genetics.fitness.delta_mse import set_delta_fitness
+from src.genetics.fitness.mixed_mse_ssim_deltae import MixedMSESSIMDeltaEEvaluator
+from src.genetics.fitness.mse import MSEEvaluator, mse_fitness
+from src.genetics.fitness.ssim import SSIMEvaluator
+from src.genetics.render.buffers import set_render_mode
+from src.tests.helpers import make_individuals
+
+
+@pytest.fixture
+def target():
+    rng = np.random.default_rng(5)
+    return rng.integers(0, 256, size=(20, 28, 3), dtype=np.uint8)
+
+
+@pytest.fixture(autouse=True)
+def reset_switches():
+    yield
+    set_batch_fitness_budget(None)
+    set_delta_fitness(None)
+    set_render_mode(None)
+
+
+@pytest.mark.parametrize("evaluator_cls", [MSEEvaluator, SSIMEvaluator, MixedMSESSIMDeltaEEvaluator])
+def test_batches_match_one_call_per_individual(target, evaluator_cls):
+    evaluator = evaluator_cls()
+    individuals = make_individuals(target, evaluator)
+    expected = [ind.clone().calculate_fitness(target) for ind in individuals]
+    # budget for 3 candidates at a time: chunks of 3, 3 and 1
+    budget = 3 * evaluator.batch_bytes(target.shape)
+    assert chunk_size(evaluator, target.shape, budget) == 3
+    calls = []
+    score_batch = evaluator.score_batch
+    evaluator.score_batch = lambda stack: calls.append(len(stack)) or score_batch(stack)
+    results = evaluate_individuals(individuals, target, budget_bytes=budget)
+    assert calls == [3, 3, 1]
+    assert np.allclose(results, expected, rtol=1e-6, atol=1e-7)
+    assert [ind.fitness for ind in individuals] == results
+
+
+def test_budget_zero_and_plain_functions_score_one_by_one(target):
+    evaluator = MSEEvaluator()
+    individuals = make_individuals(target, evaluator, n=3)
+    evaluator.score_batch = None  # must not be used
+    results = evaluate_individuals(individuals, target, budget_bytes=0)
+    assert results == [ind.fitness for ind in individuals]
+
+    plain = make_individuals(target, mse_fitness, n=3)
+    assert evaluate_individuals(plain, target, budget_bytes=1 << 20) == [
+        mse_fitness(target, ind.render_array()) for ind in plain]
+
+
+def test_scored_and_delta_individuals_skip_the_batch(target):
+    set_render_mode("numpy")
+    set_delta_fitness(True)
+    evaluator = MSEEvaluator()
+    individuals = make_individuals(target, evaluator, n=3)
+    evaluator.score_batch = None
+    results = evaluate_individuals(individuals, target, budget_bytes=1 << 20)
+    assert all(ind.delta_base is not None for ind in individuals)
+    assert results == [ind.fitness for ind in individuals]
+    # already scored: kept as is
+    assert evaluate_individuals(individuals, target, budget_bytes=1 << 20) == results
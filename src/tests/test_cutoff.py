@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from src.genetics.fitness.cutoff import REJECTED_FITNESS, cutoff_stats, score_with_cutoff, supports_cutoff
+from src.genetics.fitness.deltaE import DeltaEEvaluator
+from src.genetics.fitness.delta_mse import set_delta_fitness
+from src.genetics.fitness.memo import genome_hash
+from src.genetics.fitness.mse import MSEEvaluator, mse_fitness
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.fitness.ssim import SSIMEvaluator
+from src.tests.helpers import make_population
+
+
+@pytest.fixture
+def images():
+    rng = np.random.default_rng(8)
+    target = rng.integers(0, 256, size=(40, 30, 3), dtype=np.uint8)
+    near = np.clip(target.astype(int) + rng.integers(-20, 20, size=target.shape), 0, 255).astype(np.uint8)
+    far = rng.integers(0, 256, size=target.shape, dtype=np.uint8)
+    return target, near, far
+
+
+@pytest.mark.parametrize("method", [mse_fitness, MSEEvaluator(), DeltaEEvaluator()])
+def test_cutoff_rejects_exactly_the_candidates_below_threshold(images, method):
+    target, near, far = images
+    full_near, full_far = method(target, near), method(target, far)
+    threshold = (full_near + full_far) / 2
+
+    fitness, rows = score_with_cutoff(method, target, near, threshold)
+    assert fitness == pytest.approx(full_near, rel=1e-6) and rows == 40
+    fitness, rows = score_with_cutoff(method, target, far, threshold)
+    assert fitness == REJECTED_FITNESS and rows < 40
+    # a threshold just above the candidate rejects it, just below keeps it
+    assert score_with_cutoff(method, target, near, full_near * 1.0001)[0] == REJECTED_FITNESS
+    assert score_with_cutoff(method, target, near, full_near * 0.9999)[0] == pytest.approx(full_near, rel=1e-6)
+
+
+def test_only_pixel_mean_metrics_support_cutoff():
+    assert supports_cutoff(mse_fitness) and supports_cutoff(MSEEvaluator()) and supports_cutoff(DeltaEEvaluator())
+    assert not supports_cutoff(SSIMEvaluator())
+
+
+def test_early_abort_generation_matches_traditional_replacement():
+    evaluator = MSEEvaluator()
+    pop, target = make_population(size=10, early_abort=True, fitness_method=evaluator)
+    assert pop.early_abort
+    pop.evaluate_pending(target)
+    for _ in range(4):
+        old = list(pop.individuals)
+        worst = min(ind.fitness for ind in old)
+        pop.create_next_generation()
+        assert pop.survival_threshold == worst
+        offspring = pop._deferred_replacement[1]
+        tasks = pop.prepare_fitness_tasks(target, packed=True)
+        assert all(len(task) == 3 and task[2] == {"min_fitness": worst} for task in tasks)
+        full = {id(ind): ind.fitness if not ind.is_dirty else evaluator.score(ind.render_array())
+                for ind in old + offspring}
+
+        pop.evaluate_pending(target)
+        assert len(pop.individuals) == 10 and pop.survival_threshold is None
+        expected = sorted(old + offspring, key=lambda ind: full[id(ind)], reverse=True)[:10]
+        # same survivors up to ties (clones share their fitness; score() is float32)
+        assert sorted(full[id(ind)] for ind in pop.individuals) == pytest.approx(
+            sorted(full[id(ind)] for ind in expected), rel=1e-6)
+        rejected = [ind for ind in offspring if ind.fitness == REJECTED_FITNESS]
+        assert pop.early_abort_stats == {"rejected": len(rejected)}
+        assert all(full[id(ind)] < worst * (1 + 1e-6) for ind in rejected)
+
+
+def test_rejected_results_are_not_memoized():
+    pop, target = make_population(size=10, early_abort=True, fitness_method=MSEEvaluator(),
+                                  fitness_memo_size=1000, mutation_rate=1.0)
+    pop.evaluate_pending(target)
+    pop.create_next_generation()
+    tasks = pop.prepare_fitness_tasks(target)
+    assert len(tasks) >= 2 and len(pop.fitness_memo) == 10
+    results = [REJECTED_FITNESS] + [task[0].calculate_fitness(target) for task in tasks[1:]]
+    pop.update_fitness_from_results(results)
+    assert len(pop.fitness_memo) == 10 + len(tasks) - 1
+    assert pop.fitness_memo.get(genome_hash(tasks[0][0])) is None
+    assert all(np.isfinite(f) for f in pop.fitness_memo._entries.values())
+
+
+@pytest.mark.parametrize("mode", ["fast", "numpy"])
+def test_early_abort_applies_to_delta_fitness(mode):
+    set_render_mode(mode)
+    set_delta_fitness(True)
+    try:
+        pop, target = make_population(size=10, early_abort=True, fitness_method=mse_fitness, mutation_rate=1.0)
+        pop.evaluate_pending(target)
+        assert all(ind.uses_delta_fitness() and ind.delta_base is not None for ind in pop.individuals)
+        cutoff_stats.rejected = 0
+        rejected = 0
+        for _ in range(6):
+            worst = min(ind.fitness for ind in pop.individuals)
+            pop.create_next_generation()
+            offspring = pop._deferred_replacement[1]
+            full = {id(ind): mse_fitness(target, ind.render_array()) for ind in offspring if ind.is_dirty}
+            pop.evaluate_pending(target)
+            for ind in offspring:
+                if id(ind) not in full:
+                    continue
+                if ind.fitness == REJECTED_FITNESS:
+                    rejected += 1
+                    assert full[id(ind)] < worst * (1 + 1e-6)
+                else:
+                    assert ind.fitness == pytest.approx(full[id(ind)], rel=1e-6) and full[id(ind)] >= worst * (1 - 1e-6)
+        assert rejected > 0 and cutoff_stats.rejected == rejected
+    finally:
+        set_delta_fitness(None)
+        set_render_mode(None)
+
+
+def test_early_abort_needs_traditional_replacement():
+    pop, _ = make_population(early_abort=True, replacement_method=lambda old, new: new + old[:len(old) - len(new)])
+    assert not pop.early_abort
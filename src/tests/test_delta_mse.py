@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.genetics.fitness.delta_mse import (
+    dirty_rect, polygon_keys, set_delta_fitness, squared_error_sum, sse_fitness,
+)
+from src.genetics.fitness.mse import mse_fitness
+from src.genetics.individual import Individual
+from src.genetics.mutation.single_gene_mutation import single_gene_mutation
+from src.genetics.render.buffers import set_render_mode
+
+
+@pytest.fixture
+def target_img():
+    rng = np.random.default_rng(11)
+    return Image.fromarray(rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8))
+
+
+@pytest.fixture(autouse=True)
+def reset_switches():
+    yield
+    set_delta_fitness(None)
+    set_render_mode(None)
+
+
+@pytest.mark.parametrize("mode", ["fast", "numpy"])
+def test_delta_matches_full_evaluation(target_img, mode):
+    random.seed(5)
+    set_render_mode(mode)
+    set_delta_fitness(True)
+    target = np.array(target_img)
+    ind = Individual(80, 60, 20, mse_fitness, single_gene_mutation, target_img=target_img)
+    ind.calculate_fitness(target)
+
+    for _ in range(30):
+        child = ind.clone()
+        child.mutate(mutation_rate=1.0, target_img=target_img)
+        fitness = child.calculate_fitness(target)
+        full = squared_error_sum(target, child.render_array())
+        assert child.delta_base.sse == full
+        assert np.array_equal(child.delta_base.image, child.render_array())
+        assert fitness == sse_fitness(full, target.size)
+        assert fitness == pytest.approx(mse_fitness(target, child.render_array()), rel=1e-6)
+        ind = child
+
+
+def test_dirty_rect_covers_changed_polygons_only():
+    old = [(((10, 10), (20, 10), (10, 20)), (0, 0, 0, 255)),
+           (((0, 0), (5, 0), (0, 5)), (0, 0, 0, 255))]
+    assert dirty_rect(old, list(old), 100, 100) == ()
+    moved = [(((12, 10), (20, 14), (10, 20)), (0, 0, 0, 255)), old[1]]
+    assert dirty_rect(old, moved, 100, 100) == (9, 9, 22, 22)
+    # polygon count changed or rect too large: full evaluation
+    assert dirty_rect(old, moved[:1], 100, 100) is None
+    big = [(((0, 0), (99, 0), (0, 99)), (0, 0, 0, 255)), old[1]]
+    assert dirty_rect(old, big, 100, 100) is None
+
+
+def test_non_mse_fitness_keeps_full_path(target_img):
+    set_delta_fitness(True)
+    target = np.array(target_img)
+    ind = Individual(80, 60, 5, lambda t, g: 0.5, None, target_img=target_img)
+    assert ind.calculate_fitness(target) == 0.5
+    assert ind.delta_base is None
+    assert len(polygon_keys(ind.polygons)) == 5
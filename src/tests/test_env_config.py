@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from src.genetics.env_config import ENV_KEYS, apply_env_config
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for var in ENV_KEYS.values():
+        monkeypatch.delenv(var, raising=False)
+
+
+def test_config_keys_are_exported():
+    apply_env_config({"render_mode": "numpy", "prefix_cache_mb": 16, "prefix_cache_step": 4,
+                      "delta_fitness": True, "mask_cache_mb": 8.5, "batch_fitness_mb": 2})
+    assert {var: os.environ[var] for var in ENV_KEYS.values()} == {
+        "GEN_RENDER_MODE": "numpy", "GEN_PREFIX_CACHE_MB": "16", "GEN_PREFIX_CACHE_STEP": "4",
+        "GEN_DELTA_FITNESS": "1", "GEN_MASK_CACHE_MB": "8.5", "GEN_BATCH_FITNESS_MB": "2",
+    }
+    apply_env_config({"delta_fitness": False})
+    assert os.environ["GEN_DELTA_FITNESS"] == "0"
+
+
+def test_missing_keys_keep_the_environment(monkeypatch):
+    monkeypatch.setenv("GEN_RENDER_MODE", "fast")
+    apply_env_config({"render_mode": "", "mask_cache_mb": None})
+    assert os.environ["GEN_RENDER_MODE"] == "fast" and "GEN_MASK_CACHE_MB" not in os.environ
+    # legacy flag, only without render_mode
+    apply_env_config({"use_fast_render": False})
+    assert os.environ["GEN_RENDER_MODE"] == "compat"
+    apply_env_config({"render_mode": "numpy", "use_fast_render": True})
+    assert os.environ["GEN_RENDER_MODE"] == "numpy"
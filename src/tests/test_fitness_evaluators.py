@@ -0,0 +1,143 @@
+import pickle
+
+import numpy as np
+import pytest
+from skimage import color
+
+from src.genetics.fitness.deltaE import DELTAE_TOLERANCE, DeltaEEvaluator, delta_e_fitness, rgb_to_lab32
+from src.genetics.fitness.evaluator import FunctionEvaluator, resolve_evaluator
+from src.genetics.fitness.mixed_fitness import MixedEvaluator, mixed_fitness
+from src.genetics.fitness.mixed_mse_ssim_deltae import (
+    MixedMSESSIMDeltaEEvaluator, mixed_fitness_mse_ssim_deltaE,
+)
+from src.genetics.fitness.mse import MSEEvaluator, mse_fitness
+from src.genetics.fitness.ssim import SSIM_TOLERANCE, SSIMEvaluator, ssim_fitness
+
+
+@pytest.fixture
+def images():
+    rng = np.random.default_rng(2)
+    target = rng.integers(0, 256, size=(24, 32, 3), dtype=np.uint8)
+    stack = rng.integers(0, 256, size=(3, 24, 32, 3), dtype=np.uint8)
+    return target, stack
+
+
+@pytest.mark.parametrize("evaluator_cls, function, tolerance", [
+    (MSEEvaluator, mse_fitness, 0),
+    (SSIMEvaluator, ssim_fitness, SSIM_TOLERANCE),
+    (DeltaEEvaluator, delta_e_fitness, DELTAE_TOLERANCE),
+    (MixedEvaluator, mixed_fitness, SSIM_TOLERANCE),
+    (MixedMSESSIMDeltaEEvaluator, mixed_fitness_mse_ssim_deltaE, SSIM_TOLERANCE),
+])
+def test_evaluators_match_plain_functions(images, evaluator_cls, function, tolerance):
+    target, stack = images
+    evaluator = evaluator_cls().prepare(target)
+    for generated in stack:
+        assert evaluator.score(generated) == pytest.approx(function(target, generated), rel=1e-6, abs=tolerance)
+    assert np.allclose(evaluator.score_batch(stack), [function(target, g) for g in stack],
+                       rtol=1e-6, atol=tolerance)
+
+
+@pytest.mark.parametrize("shape", [(60, 80, 3), (60, 80), (5, 9, 3)])
+def test_fast_ssim_matches_skimage(shape):
+    rng = np.random.default_rng(9)
+    target = rng.integers(0, 256, size=shape, dtype=np.uint8)
+    # smooth candidates (like renders) plus noise and a flat-ish image
+    base = np.clip(target.astype(int) + rng.integers(-40, 40, size=shape), 0, 255).astype(np.uint8)
+    flat = np.full(shape, 200, dtype=np.uint8)
+    flat.flat[0] = 10
+    candidates = np.stack([base, rng.integers(0, 256, size=shape, dtype=np.uint8), flat])
+    evaluator = SSIMEvaluator().prepare(target)
+    expected = [ssim_fitness(target, g) for g in candidates]
+    assert np.abs(evaluator.score_batch(candidates) - expected).max() < SSIM_TOLERANCE
+    assert abs(evaluator.score(candidates[0]) - expected[0]) < SSIM_TOLERANCE
+
+
+def test_lut_lab_matches_skimage():
+    rgb = np.arange(256, dtype=np.uint8)[:, None].repeat(3, axis=1)
+    rgb = np.concatenate([rgb, np.random.default_rng(4).integers(0, 256, size=(4000, 3), dtype=np.uint8)])
+    expected = color.rgb2lab(rgb / 255.0)
+    assert np.abs(np.moveaxis(rgb_to_lab32(rgb), 0, -1) - expected).max() < 1e-3
+
+
+@pytest.mark.parametrize("mode, reference", [
+    ("ciede2000", color.deltaE_ciede2000),
+    ("cie94", color.deltaE_ciede94),
+    ("cie76", color.deltaE_cie76),
+])
+def test_fast_delta_e_modes_match_skimage(mode, reference):
+    rng = np.random.default_rng(6)
+    target = rng.integers(0, 256, size=(30, 40, 3), dtype=np.uint8)
+    near = np.clip(target.astype(int) + rng.integers(-12, 12, size=target.shape), 0, 255).astype(np.uint8)
+    gray = np.full_like(target, 128)
+    candidates = np.stack([near, rng.integers(0, 256, size=target.shape, dtype=np.uint8), gray, target])
+    target_lab = color.rgb2lab(target / 255.0)
+    expected = [1 / (1 + reference(target_lab, color.rgb2lab(g / 255.0)).mean()) for g in candidates]
+    evaluator = DeltaEEvaluator(mode).prepare(target)
+    assert np.abs(evaluator.score_batch(candidates) - expected).max() < DELTAE_TOLERANCE
+    assert evaluator.score(target) == pytest.approx(1.0)
+
+
+def test_deltae_mode_from_config(images):
+    target, stack = images
+    evaluator = resolve_evaluator(MixedEvaluator, {"deltae_mode": "cie76"})
+    assert evaluator.delta_e.mode == "cie76"
+    assert resolve_evaluator(DeltaEEvaluator).mode == "ciede2000"
+    # la aproximación da otro fitness que CIEDE2000
+    assert evaluator(target, stack[0]) != MixedEvaluator()(target, stack[0])
+    with pytest.raises(ValueError):
+        DeltaEEvaluator("cie2077")
+
+
+def test_composite_shares_intermediates_and_reports_timings(images, monkeypatch):
+    from src.genetics.fitness import composite
+    target, stack = images
+    conversions = []
+    monkeypatch.setattr(composite, "rgb_to_lab32", lambda a: conversions.append(1) or rgb_to_lab32(a))
+    evaluator = MixedMSESSIMDeltaEEvaluator().prepare(target)
+    evaluator.score_batch(stack)
+    assert len(conversions) == 1
+    timings = evaluator.take_timings()
+    assert set(timings) == {"mse", "ssim", "delta_e", "planes", "lab"}
+    assert all(sec >= 0 for sec in timings.values())
+    assert evaluator.take_timings() == {}
+
+
+def test_composite_weights_from_config(images):
+    target, stack = images
+    cfg = {"weight_mse": 1.0, "weight_ssim": 0.0, "weight_deltae": 0.0, "alpha": 1.0}
+    only_mse = resolve_evaluator(MixedMSESSIMDeltaEEvaluator, cfg)
+    assert only_mse(target, stack[0]) == pytest.approx(mse_fitness(target, stack[0]), rel=1e-6)
+    only_ssim = resolve_evaluator(MixedEvaluator, cfg)
+    assert only_ssim(target, stack[0]) == pytest.approx(ssim_fitness(target, stack[0]), abs=SSIM_TOLERANCE)
+
+
+def test_call_prepares_once_per_target(images):
+    target, stack = images
+    evaluator = MSEEvaluator()
+    evaluator(target, stack[0])
+    cached = evaluator.cache["target"]
+    evaluator(target, stack[1])
+    assert evaluator.cache["target"] is cached
+    evaluator(target.copy(), stack[1])
+    assert evaluator.cache["target"] is not cached
+
+
+def test_pickling_drops_prepared_arrays(images):
+    target, stack = images
+    evaluator = MixedEvaluator(alpha=0.3).prepare(target)
+    clone = pickle.loads(pickle.dumps(evaluator))
+    assert clone.target is None and clone.delta_e.cache == {} and clone.alpha == 0.3
+    assert clone(target, stack[0]) == pytest.approx(evaluator.score(stack[0]))
+
+
+def test_resolve_evaluator_accepts_functions_classes_and_instances(images):
+    target, stack = images
+    wrapped = resolve_evaluator(mse_fitness)
+    assert isinstance(wrapped, FunctionEvaluator)
+    assert wrapped(target, stack[0]) == mse_fitness(target, stack[0])
+    assert isinstance(resolve_evaluator(MSEEvaluator), MSEEvaluator)
+    instance = SSIMEvaluator()
+    assert resolve_evaluator(instance) is instance
+    with pytest.raises(TypeError):
+        resolve_evaluator("mse")
@@ -0,0 +1,47 @@
+import pickle
+
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.fitness.mse import mse_fitness
+from src.genetics.genome_codec import pack_individual, unpack_genome, dumps, loads
+
+
+def _individual():
+    target = Image.new("RGB", (40, 30), (120, 60, 30))
+    return Individual(40, 30, 12, mse_fitness, None, target_img=target)
+
+
+def _genome(ind):
+    return [(list(map(tuple, p.vertices)), tuple(int(c) for c in p.color)) for p in ind.polygons]
+
+
+def test_pack_roundtrip():
+    ind = _individual()
+    restored = unpack_genome(pack_individual(ind), mse_fitness)
+    assert (restored.width, restored.height) == (40, 30)
+    assert _genome(restored) == _genome(ind)
+
+
+def test_pickle_protocols_roundtrip():
+    ind = _individual()
+    packed = pack_individual(ind)
+    for protocol in (4, 5):
+        restored = pickle.loads(pickle.dumps(packed, protocol=protocol))
+        assert _genome(unpack_genome(restored, mse_fitness)) == _genome(ind)
+
+
+def test_out_of_band_buffers():
+    packed = pack_individual(_individual())
+    data, buffers = dumps(packed)
+    assert len(buffers) == 2
+    restored = loads(data, buffers)
+    assert restored.vertices.tolist() == packed.vertices.tolist()
+    assert restored.colors.tolist() == packed.colors.tolist()
+
+
+def test_hex_colors_are_packed_as_rgba():
+    ind = _individual()
+    ind.polygons[0] = ind.polygons[0].with_color("#ff8000")
+    restored = unpack_genome(pack_individual(ind), mse_fitness)
+    assert restored.polygons[0].color == (255, 128, 0, 255)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.render.mask_cache import MaskCache, set_mask_cache
+from src.genetics.worker_counters import SharedCounters, publish_render_counters
+
+
+@pytest.fixture
+def target():
+    rng = np.random.default_rng(5)
+    return Image.fromarray(rng.integers(0, 256, size=(40, 50, 3), dtype=np.uint8))
+
+
+@pytest.fixture(autouse=True)
+def numpy_mode():
+    set_render_mode("numpy")
+    yield
+    set_mask_cache(None)
+    set_render_mode(None)
+
+
+def _uncached(ind):
+    set_mask_cache(None)
+    return ind.render_array().copy()
+
+
+def test_color_change_reuses_masks_vertex_change_does_not(target):
+    ind = Individual(50, 40, 12, None, None, target_img=target)
+    cache = MaskCache(16 * 1024 * 1024)
+    set_mask_cache(cache)
+    ind.render_array()
+    assert (cache.hits, cache.misses) == (0, 12)
+
+    ind.polygons[3] = ind.polygons[3].with_color((250, 10, 10, 200))
+    recolored = ind.render_array().copy()
+    assert (cache.hits, cache.misses) == (12, 12)
+
+    set_mask_cache(cache)
+    (x, y) = ind.polygons[7].vertices[0]
+    ind.polygons[7] = ind.polygons[7].with_vertex(0, (x + 3, y))
+    moved = ind.render_array().copy()
+    assert (cache.hits, cache.misses) == (23, 13)
+
+    assert np.array_equal(moved, _uncached(ind))
+    ind.polygons[7] = ind.polygons[7].with_vertex(0, (x, y))
+    assert np.array_equal(recolored, _uncached(ind))
+
+
+def test_budget_bounds_memory(target):
+    ind = Individual(50, 40, 30, None, None, target_img=target)
+    unbounded = MaskCache(16 * 1024 * 1024)
+    set_mask_cache(unbounded)
+    ind.render_array()
+    assert unbounded.nbytes > 4 * 1024  # the masks do not all fit in the budget below
+
+    cache = MaskCache(4 * 1024)
+    set_mask_cache(cache)
+    ind.render_array()
+    assert 0 < cache.nbytes <= 4 * 1024
+    assert cache.evictions > 0
+
+
+def test_counters_published_as_deltas(target):
+    counters = SharedCounters(("mask_hits", "mask_misses"))
+    cache = MaskCache(16 * 1024 * 1024)
+    set_mask_cache(cache)
+    ind = Individual(50, 40, 5, None, None, target_img=target)
+    ind.render_array()
+    publish_render_counters(counters)
+    ind.render_array()
+    publish_render_counters(counters)
+    assert counters.snapshot() == {"mask_hits": 5, "mask_misses": 5}
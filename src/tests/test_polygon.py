@@ -0,0 +1,95 @@
+import copy
+import pickle
+import random
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.genetics.crossover.artistic_crossover import artistic_crossover
+from src.genetics.crossover.circular_crossover import annular_crossover
+from src.genetics.crossover.single_point_crossover import single_point_crossover
+from src.genetics.crossover.two_point_crossover import two_point_crossover
+from src.genetics.crossover.uniform_crossover import uniform_crossover
+from src.genetics.individual import Individual
+from src.genetics.mutation.doomsday_mutation import doomsday_mutation
+from src.genetics.mutation.multi_gene_mutation import multi_gene_mutation
+from src.genetics.mutation.non_uniform_mutation import non_uniform_multi_gene_mutation
+from src.genetics.mutation.uniform_mutation import uniform_multi_gene_mutation
+from src.genetics.polygon import Polygon
+from src.genetics.preprocessing.tiling import compute_tile_seeds
+
+
+@pytest.fixture
+def target():
+    return Image.fromarray(np.random.default_rng(4).integers(0, 256, size=(30, 40, 3), dtype=np.uint8))
+
+
+def _genome(ind):
+    return [(p.vertices, p.color) for p in ind.polygons]
+
+
+def test_polygon_is_immutable():
+    poly = Polygon([[0, 0], [5, 0], [0, 5]], [10, 20, 30, 40])
+    assert poly.vertices == ((0, 0), (5, 0), (0, 5)) and poly.color == (10, 20, 30, 40)
+    with pytest.raises(AttributeError):
+        poly.color = (0, 0, 0, 255)
+    with pytest.raises(TypeError):
+        poly.vertices[0] = (1, 1)
+    moved = poly.with_vertex(1, (6, 1))
+    assert moved.vertices == ((0, 0), (6, 1), (0, 5)) and poly.vertices[1] == (5, 0)
+    assert poly.clone() is poly
+
+
+def test_colors_are_canonical_rgba():
+    vertices = [(0, 0), (5, 0), (0, 5)]
+    assert Polygon(vertices, "#ff8000").color == (255, 128, 0, 255)
+    assert Polygon(vertices, (1, 2, 3)).color == (1, 2, 3, 255)
+    color = Polygon(np.array(vertices), np.array([1, 2, 3, 4], dtype=np.uint8)).color
+    assert color == (1, 2, 3, 4) and all(type(c) is int for c in color)
+    assert Polygon(vertices, (1, 2, 3, 4)).with_color("#000").color == (0, 0, 0, 255)
+
+
+def test_seed_colors_are_rgba(target):
+    seeds = compute_tile_seeds(np.array(target), 10)
+    assert all(len(s.mean_color) == 4 and s.mean_color[3] == 255 for s in seeds)
+    patch = np.array(target)[:10, :10].reshape(-1, 3)
+    assert seeds[0].mean_color[:3] == tuple(int(c) for c in patch.mean(axis=0))
+
+
+def test_polygon_is_slotted_and_pickles():
+    poly = Polygon([(0, 0), (5, 0), (0, 5)], (10, 20, 30, 40))
+    assert not hasattr(poly, "__dict__")
+    restored = pickle.loads(pickle.dumps(poly))
+    assert (restored.vertices, restored.color) == (poly.vertices, poly.color)
+    assert copy.deepcopy(poly).color == poly.color
+
+
+def test_clone_shares_polygons_not_the_list(target):
+    ind = Individual(40, 30, 8, None, None, target_img=target)
+    clone = ind.clone()
+    assert clone.polygons == ind.polygons and clone.polygons is not ind.polygons
+    assert all(a is b for a, b in zip(clone.polygons, ind.polygons))
+
+
+@pytest.mark.parametrize("crossover", [single_point_crossover, two_point_crossover, uniform_crossover,
+                                       annular_crossover, artistic_crossover])
+@pytest.mark.parametrize("mutate", [
+    lambda ind, img: multi_gene_mutation(ind, 1.0, img),
+    lambda ind, img: uniform_multi_gene_mutation(ind, 1.0, img),
+    lambda ind, img: doomsday_mutation(ind, 1.0, img),
+    lambda ind, img: non_uniform_multi_gene_mutation(ind, 1.0, img, 1, 10),
+])
+def test_mutating_children_leaves_parents_intact(target, crossover, mutate):
+    random.seed(3)
+    np.random.seed(3)
+    parents = [Individual(40, 30, 10, None, None, target_img=target) for _ in range(2)]
+    before = [_genome(p) for p in parents]
+    for _ in range(5):
+        children = crossover(*parents)
+        for child in children:
+            mutate(child, target)
+    assert [_genome(p) for p in parents] == before
+    # unchanged polygons are still shared with the parents
+    child = single_point_crossover(*parents)[0]
+    assert all(any(poly is q for q in parents[0].polygons + parents[1].polygons) for poly in child.polygons)
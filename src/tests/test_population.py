@@ -0,0 +1,124 @@
+import pytest
+
+from src.genetics.fitness.cutoff import REJECTED_FITNESS
+from src.genetics.fitness.delta_mse import set_delta_fitness
+from src.genetics.fitness.mse import mse_fitness
+from src.genetics.render.buffers import set_render_mode
+from src.tests.helpers import evaluate, make_population
+
+
+def test_only_dirty_individuals_are_submitted():
+    pop, target = make_population()
+    evaluate(pop, target)
+    assert pop.eval_stats == {"evaluated": 10, "skipped": 0, "memo_hits": 0}
+
+    pop.create_next_generation()
+    dirty = sum(ind.is_dirty for ind in pop.individuals)
+    tasks = pop.prepare_fitness_tasks(target)
+    assert len(tasks) == dirty
+    assert pop.eval_stats["skipped"] == len(pop.individuals) - dirty
+    pop.update_fitness_from_results([ind.calculate_fitness(ref) for ind, ref in tasks])
+    assert not any(ind.is_dirty for ind in pop.individuals)
+
+
+def test_chunked_tasks_cover_pending_in_order():
+    pop, target = make_population(size=10)
+    tasks = pop.prepare_fitness_tasks(target, packed=True, chunks=3)
+    assert [len(chunk) for chunk, _ in tasks] == [4, 4, 2]
+    pop.evaluate_pending(target)
+    assert pop.eval_stats == {"evaluated": 10, "skipped": 0, "memo_hits": 0}
+    assert not any(ind.is_dirty for ind in pop.individuals)
+
+
+def test_fitness_memo_serves_repeated_genomes():
+    pop, target = make_population(size=6, fitness_memo_size=100)
+    pop.evaluate_pending(target)
+    assert pop.eval_stats["memo_hits"] == 0 and len(pop.fitness_memo) == 6
+
+    # unmutated clones and a copy of an earlier genome hit the memo
+    original = pop.individuals[0]
+    clones = [ind.clone() for ind in pop.individuals[:3]]
+    pop.individuals[3:] = clones
+    pop.evaluate_pending(target)
+    assert pop.eval_stats == {"evaluated": 0, "skipped": 3, "memo_hits": 3}
+    assert [c.fitness for c in clones] == [ind.fitness for ind in pop.individuals[:3]]
+
+    mutated = original.clone()
+    mutated.polygons[0] = mutated.polygons[0].with_vertices([(0, 0), (5, 0), (0, 5)])
+    pop.individuals[5] = mutated
+    pop.evaluate_pending(target)
+    assert pop.eval_stats["evaluated"] == 1 and pop.eval_stats["memo_hits"] == 0
+    assert mutated.fitness == mse_fitness(target, mutated.render_array())
+
+
+def test_fitness_memo_evicts_least_recently_used():
+    from src.genetics.fitness.memo import FitnessMemo
+    memo = FitnessMemo(2)
+    memo.put(b"a", 0.1)
+    memo.put(b"b", 0.2)
+    assert memo.get(b"a") == 0.1
+    memo.put(b"c", 0.3)
+    assert memo.get(b"b") is None and memo.get(b"a") == 0.1 and len(memo) == 2
+    assert memo.evictions == 1 and memo.hit_rate == pytest.approx(2 / 3)
+
+
+def _duplicated_offspring(pop):
+    # every child a copy of the same parent: the selection worst case
+    parent = pop.individuals[0]
+    pop.selection_method = lambda individuals, n: [parent] * n
+    pop.crossover_rate = 0.0
+    pop.mutation_args["mutation_rate"] = 0.0
+
+
+def test_duplicates_are_counted_and_evaluated_once():
+    pop, target = make_population(size=8, duplicate_policy="evaluate_once")
+    pop.evaluate_pending(target)
+    _duplicated_offspring(pop)
+    pop.create_next_generation()
+    assert pop.offspring_stats == {"duplicates": 5}
+    pending = pop.collect_pending()
+    dirty = [ind for ind in pop.individuals if ind.is_dirty]
+    assert len(pending) == 1 and len(dirty) > 1
+    pop.evaluate_pending(target)
+    assert len({ind.fitness for ind in dirty}) == 1 and not any(ind.is_dirty for ind in pop.individuals)
+
+
+@pytest.mark.parametrize("policy", ["remutate", "replace"])
+def test_duplicates_are_remutated_or_replaced(policy):
+    from src.genetics.fitness.memo import genome_hash
+    pop, target = make_population(size=8, duplicate_policy=policy)
+    pop.evaluate_pending(target)
+    _duplicated_offspring(pop)
+    pop.mutation_args["mutation_rate"] = 0.0 if policy == "replace" else 1.0
+    offspring = [pop.individuals[0].clone() for _ in range(6)]
+    pop._handle_duplicates(offspring)
+    assert pop.offspring_stats == {"duplicates": 5}
+    assert len({genome_hash(child) for child in offspring}) == 6
+
+
+def test_unknown_duplicate_policy_is_rejected():
+    with pytest.raises(ValueError):
+        make_population(duplicate_policy="drop")
+
+
+@pytest.mark.parametrize("early_abort", [False, True])
+def test_discarded_individuals_release_their_delta_state(early_abort):
+    set_render_mode("fast")
+    set_delta_fitness(True)
+    try:
+        pop, target = make_population(early_abort=early_abort)
+        pop.evaluate_pending(target)
+        assert all(ind.delta_base is not None for ind in pop.individuals)
+        for _ in range(3):
+            before = pop._deferred_replacement[0] if pop._deferred_replacement else list(pop.individuals)
+            pop.create_next_generation()
+            offspring = pop._deferred_replacement[1] if early_abort else []
+            pop.evaluate_pending(target)
+            kept = {id(ind) for ind in pop.individuals}
+            dropped = [ind for ind in before + offspring if id(ind) not in kept]
+            assert dropped and all(ind.delta_base is None for ind in dropped)
+            assert all(ind.delta_base is not None for ind in pop.individuals if ind.fitness != REJECTED_FITNESS)
+        assert pop.best_individual.delta_base is None
+    finally:
+        set_delta_fitness(None)
+        set_render_mode(None)
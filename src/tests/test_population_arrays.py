@@ -0,0 +1,53 @@
+import pickle
+
+import numpy as np
+
+from src.genetics.genome_codec import pack_individual, unpack_genome
+from src.genetics.population_arrays import PopulationArrays
+from src.tests.helpers import make_population, evaluate
+
+
+def test_shapes_and_dtypes():
+    pop, _ = make_population(size=5, n_polygons=7)
+    arrays = pop.to_arrays()
+    assert arrays.vertices.shape == (5, 7, 3, 2) and arrays.vertices.dtype == np.int16
+    assert arrays.colors.shape == (5, 7, 4) and arrays.colors.dtype == np.uint8
+    assert arrays.fitness.shape == (5,) and arrays.fitness.dtype == np.float64
+
+
+def test_roundtrip_keeps_genomes_and_fitness():
+    pop, target = make_population(size=6, n_polygons=5)
+    evaluate(pop, target)
+    before = [np.array(ind.render()) for ind in pop.individuals]
+    fitness = [ind.fitness for ind in pop.individuals]
+
+    pop.load_arrays(pop.to_arrays())
+    assert [ind.fitness for ind in pop.individuals] == fitness
+    for img, ind in zip(before, pop.individuals):
+        assert np.array_equal(img, np.array(ind.render()))
+
+    # the object API keeps working on the converted individuals
+    pop.create_next_generation()
+    evaluate(pop, target)
+
+
+def test_take_selects_rows():
+    pop, _ = make_population(size=4, n_polygons=3)
+    arrays = pop.to_arrays()
+    sub = arrays.take([3, 1])
+    assert len(sub) == 2
+    assert np.array_equal(sub.colors[0], arrays.colors[3])
+    assert isinstance(sub, PopulationArrays)
+
+
+def test_packed_tasks_are_rows_of_one_block():
+    pop, target = make_population(size=6, n_polygons=5)
+    tasks = pop.prepare_fitness_tasks(target, packed=True)
+    assert len(tasks) == 6
+    for (item, _), ind in zip(tasks, pop.individuals):
+        assert not item.vertices.flags.owndata
+        expected = pack_individual(ind)
+        assert np.array_equal(item.vertices, expected.vertices) and np.array_equal(item.colors, expected.colors)
+        worker_side = unpack_genome(pickle.loads(pickle.dumps(item)), ind.fitness_method)
+        assert [(p.vertices, p.color) for p in worker_side.polygons] == \
+            [(p.vertices, p.color) for p in ind.polygons]
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.genetics.crossover.single_point_crossover import single_point_crossover
+from src.genetics.individual import Individual
+from src.genetics.polygon import Polygon
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.render.prefix_cache import PrefixCache, set_prefix_cache
+
+
+@pytest.fixture
+def target():
+    rng = np.random.default_rng(3)
+    return Image.fromarray(rng.integers(0, 256, size=(40, 50, 3), dtype=np.uint8))
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    yield
+    set_prefix_cache(None)
+    set_render_mode(None)
+
+
+def _uncached(ind):
+    set_prefix_cache(None)
+    return ind.render_array().copy()
+
+
+@pytest.mark.parametrize("mode", ["fast", "numpy"])
+def test_resumes_from_checkpoint_after_mutation(target, mode):
+    set_render_mode(mode)
+    ind = Individual(50, 40, 16, None, None, target_img=target)
+    cache = PrefixCache(64 * 1024 * 1024)
+    set_prefix_cache(cache)
+    ind.render_array()
+    assert len(cache) == 3 and cache.misses == 1
+
+    # polygon 10 changes: the checkpoint after 8 polygons is still valid
+    ind.polygons[10] = Polygon([(0, 0), (49, 0), (0, 39)], (10, 200, 30, 128))
+    cached = ind.render_array().copy()
+    assert cache.hits == 1 and cache.polygons_skipped == 8
+    assert np.array_equal(cached, _uncached(ind))
+
+
+def test_crossover_child_reuses_parent_prefix(target, monkeypatch):
+    set_render_mode("numpy")
+    p1 = Individual(50, 40, 16, None, None, target_img=target)
+    p2 = Individual(50, 40, 16, None, None, target_img=target)
+    cache = PrefixCache(64 * 1024 * 1024, step=4)
+    set_prefix_cache(cache)
+    p1.render_array()
+    p2.render_array()
+
+    # crossover point 10: the child starts with p1's first 10 polygons
+    monkeypatch.setattr(random, "randint", lambda a, b: 10)
+    child, _ = single_point_crossover(p1, p2)
+    assert child.polygons[:10] == p1.polygons[:10] and child.polygons[10:] == p2.polygons[10:]
+    cached = child.render_array().copy()
+    assert cache.hits == 1 and cache.polygons_skipped == 8
+    assert np.array_equal(cached, _uncached(child))
+
+
+def test_budget_evicts_least_recently_used():
+    cache = PrefixCache(250)
+    for k in range(1, 4):
+        cache.store("t", k, k, object(), 100)
+    assert len(cache) == 2 and cache.nbytes == 200 and cache.evictions == 1
+    cache.store("t", 9, 9, object(), 1000)  # larger than the whole budget
+    assert len(cache) == 2
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.genetics.fitness.mixed_fitness import MixedEvaluator
+from src.genetics.pyramid import (PyramidLevel, PyramidSchedule, downscale, level_size, parse_pyramid,
+                                  render_at_size)
+from src.tests.helpers import make_population
+
+
+def test_parse_pyramid_appends_the_full_size_level():
+    assert parse_pyramid({}) == []
+    levels = parse_pyramid({"pyramid": [0.125, {"scale": 0.5, "plateau": 5}]}, default_generations=30)
+    assert levels == [PyramidLevel(0.125, 30, None), PyramidLevel(0.5, None, 5), PyramidLevel(1.0)]
+    assert parse_pyramid({"pyramid": [0.5, 1]})[-1] == PyramidLevel(1.0)
+    with pytest.raises(ValueError):
+        parse_pyramid({"pyramid": [0.5, 0.25]})
+    with pytest.raises(ValueError):
+        parse_pyramid({"pyramid": [2]})
+    assert level_size(740, 780, 0.125) == (92, 98)
+
+
+def test_schedule_switches_on_generations_or_plateau():
+    schedule = PyramidSchedule([PyramidLevel(0.25, generations=3), PyramidLevel(0.5, generations=10, plateau=2),
+                                PyramidLevel(1.0)])
+    assert [schedule.step(f) for f in (0.1, 0.2, 0.3)] == [False, False, True]
+    schedule.advance()
+    # the best stops improving: two generations later the level is done
+    assert [schedule.step(f) for f in (0.1, 0.2, 0.2, 0.15)] == [False, False, False, True]
+    assert schedule.advance().scale == 1.0 and schedule.is_final
+    assert not any(schedule.step(0.0) for _ in range(50))
+
+
+def test_rescale_carries_the_population_over():
+    pop, target = make_population(size=6)
+    pop.evaluate_pending(target)
+    shared = pop.individuals[1].polygons[0]
+    pop.individuals[0].polygons[0] = shared  # as crossover leaves them
+    before = [[list(p.vertices) for p in ind.polygons] for ind in pop.individuals]
+
+    big = Image.fromarray(np.random.randint(0, 256, size=(48, 64, 3), dtype=np.uint8))
+    pop.rescale(64, 48, big)
+    assert (pop.width, pop.height) == (64, 48) and pop.best_individual is None
+    for ind, polygons in zip(pop.individuals, before):
+        assert ind.is_dirty and (ind.width, ind.height) == (64, 48)
+        assert [list(p.vertices) for p in ind.polygons] == [[(2 * x, 2 * y) for x, y in v] for v in polygons]
+    pop.evaluate_pending(np.array(big))
+    assert all(not ind.is_dirty for ind in pop.individuals)
+    assert pop.best_individual.render().size == (64, 48)
+    assert render_at_size(pop.best_individual, 32, 24).size == (32, 24)
+
+
+def test_mixed_fitness_pyramid_on_a_thin_tile():
+    # a 48 x 4 edge tile: halving it must not leave less than SSIM's 7-px window
+    assert level_size(48, 4, 0.5) == (24, 4)
+    assert level_size(48, 40, 0.125) == (7, 7)
+    tile = Image.fromarray(np.random.default_rng(5).integers(0, 256, size=(4, 48, 3), dtype=np.uint8))
+    levels = [downscale(tile, level_size(48, 4, level.scale)) for level in parse_pyramid({"pyramid": [0.5]})]
+    pop, _ = make_population(size=6, width=24, height=4, target_img=levels[0], fitness_method=MixedEvaluator())
+    for level in levels:
+        if pop.width != level.width:
+            pop.rescale(level.width, level.height, level)
+        pop.evaluate_pending(np.array(level))
+        pop.create_next_generation()
+        pop.evaluate_pending(np.array(level))
+    assert (pop.width, pop.height) == (48, 4)
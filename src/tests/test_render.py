@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.genetics.individual import Individual
+from src.genetics.render.buffers import set_render_mode
+from src.genetics.render.raster import render_batch, render_genome
+
+
+@pytest.fixture
+def target():
+    rng = np.random.default_rng(7)
+    return Image.fromarray(rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8))
+
+
+@pytest.fixture(autouse=True)
+def reset_render_mode():
+    yield
+    set_render_mode(None)
+
+
+def _render(ind, mode):
+    set_render_mode(mode)
+    return np.array(ind.render(use_cache=False)).astype(np.int16)
+
+
+def test_numpy_mode_matches_compat(target):
+    for _ in range(5):
+        ind = Individual(80, 60, 30, None, None, target_img=target)
+        compat = _render(ind, "compat")
+        fast_np = _render(ind, "numpy")
+        diff = np.abs(compat - fast_np).max(axis=2)
+        # only a few edge pixels may differ, blended values match within rounding
+        assert diff.mean() < 1.0
+        assert (diff > 4).mean() < 0.01
+
+
+def test_batch_matches_single_renders(target):
+    inds = [Individual(80, 60, 10, None, None, target_img=target) for _ in range(4)]
+    arrays = [ind.genome_arrays() for ind in inds]
+    vertices = np.stack([v for v, _ in arrays])
+    colors = np.stack([c for _, c in arrays])
+    out = np.empty((4, 60, 80, 3), dtype=np.uint8)
+    assert render_batch(vertices, colors, 80, 60, out=out) is out
+    for b, (v, c) in enumerate(arrays):
+        assert np.array_equal(out[b], render_genome(v, c, 80, 60))
+
+
+def test_offscreen_and_degenerate_polygons():
+    vertices = np.array([[[-20, -20], [-10, -20], [-20, -10]],
+                         [[5, 5], [5, 5], [5, 5]]])
+    colors = np.array([[0, 0, 0, 255], [0, 0, 0, 255]], dtype=np.uint8)
+    img = render_genome(vertices, colors, 10, 10)
+    assert img[5, 5].tolist() == [0, 0, 0]
+    assert (img.reshape(-1, 3) == 255).all(axis=1).sum() == 99
+
+
+def test_fast_mode_blends_like_compat(target):
+    for _ in range(5):
+        ind = Individual(80, 60, 30, None, None, target_img=target)
+        compat = _render(ind, "compat")
+        fast = _render(ind, "fast")
+        assert np.abs(compat - fast).max() <= 1
+
+
+def test_render_array_reuses_pooled_buffer(target):
+    a = Individual(80, 60, 10, None, None, target_img=target)
+    b = Individual(80, 60, 10, None, None, target_img=target)
+    for mode in ("fast", "numpy"):
+        set_render_mode(mode)
+        first = a.render_array()
+        expected = np.array(a.render(use_cache=False))
+        assert np.array_equal(first, expected)
+        assert b.render_array() is first
@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.genetics.replica_pool import ReplicaPool
+from src.genetics.shared_target import SharedTarget
+from src.genetics.fitness.mse import mse_fitness
+from src.tests.helpers import make_population
+
+
+def test_replica_fitness_matches_direct_evaluation():
+    pop, target = make_population(size=12, n_polygons=8)
+    with SharedTarget({"target": target}) as shared:
+        replicas = ReplicaPool(2, shared.handles, mse_fitness, pop.width, pop.height)
+        try:
+            for _ in range(4):
+                pending = [ind.clone() for ind in pop.individuals if ind.is_dirty]
+                results = replicas.evaluate(pop)
+                expected = [mse_fitness(target, np.array(ind.render())) for ind in pending]
+                assert np.allclose(results, expected)
+                pop.update_fitness_from_results(results)
+                pop.create_next_generation()
+        finally:
+            replicas.close()
+
+
+def test_children_travel_as_edit_scripts():
+    pop, target = make_population(size=12, n_polygons=40, mutation_rate=0.0)
+    with SharedTarget({"target": target}) as shared:
+        replicas = ReplicaPool(2, shared.handles, mse_fitness, pop.width, pop.height)
+        try:
+            pop.update_fitness_from_results(replicas.evaluate(pop))
+            full_bytes = replicas.last_bytes
+            pop.create_next_generation()
+            pop.update_fitness_from_results(replicas.evaluate(pop))
+            # unmutated children are mostly parent references and cut points
+            assert replicas.last_bytes < full_bytes / 2
+        finally:
+            replicas.close()
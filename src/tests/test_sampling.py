@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from src.genetics.fitness.batch import evaluate_individuals
+from src.genetics.fitness.mse import MSEEvaluator, mse_fitness
+from src.genetics.fitness.sampling import draw_sample, rank_agreement, sampled_fitness
+from src.genetics.fitness.ssim import SSIMEvaluator
+from src.tests.helpers import make_individuals, make_population
+
+
+@pytest.fixture
+def target():
+    rng = np.random.default_rng(11)
+    return rng.integers(0, 256, size=(20, 28, 3), dtype=np.uint8)
+
+
+def test_stratified_sample_covers_the_requested_fraction():
+    rng = np.random.default_rng(0)
+    sample = draw_sample(256, 192, 0.25, rng)
+    assert sample.fraction == pytest.approx(0.25, abs=0.05)
+    for idx, size in ((sample.rows, 256), (sample.cols, 192)):
+        assert np.all(np.diff(idx) > 0) and idx[0] >= 0 and idx[-1] < size
+        # one band per stratum: every half of the axis is sampled
+        assert (idx < size // 2).any() and (idx >= size // 2).any()
+    img = np.zeros((256, 192, 3), dtype=np.uint8)
+    assert sample.take(img).shape == (len(sample.rows), len(sample.cols), 3)
+    with pytest.raises(ValueError):
+        draw_sample(10, 10, 1.0, rng)
+
+
+@pytest.mark.parametrize("method", [mse_fitness, MSEEvaluator(), SSIMEvaluator()])
+def test_sampled_fitness_scores_the_mosaic(target, method):
+    sample = draw_sample(20, 28, 0.4, np.random.default_rng(1), band=4)
+    generated = np.random.default_rng(2).integers(0, 256, size=target.shape, dtype=np.uint8)
+    expected = SSIMEvaluator()(sample.take(target).copy(), sample.take(generated).copy()) \
+        if isinstance(method, SSIMEvaluator) else mse_fitness(sample.take(target), sample.take(generated))
+    assert sampled_fitness(method, target, generated, sample) == pytest.approx(expected, rel=1e-6)
+
+
+def test_batched_sampled_fitness_matches_one_by_one(target):
+    evaluator = MSEEvaluator()
+    sample = draw_sample(20, 28, 0.4, np.random.default_rng(3), band=4)
+    individuals = make_individuals(target, evaluator, n=5)
+    expected = [ind.clone().calculate_fitness(target, sample=sample) for ind in individuals]
+    results = evaluate_individuals(individuals, target, budget_bytes=1 << 20, sample=sample)
+    assert np.allclose(results, expected, rtol=1e-6)
+
+
+def test_rank_agreement():
+    assert rank_agreement([3, 2, 1], [0.3, 0.2, 0.1]) == 1.0
+    assert rank_agreement([3, 2, 1], [0.1, 0.2, 0.3]) == 0.0
+    assert rank_agreement([3, 2, 1], [0.3, 0.1, 0.2]) == pytest.approx(2 / 3)
+
+
+def test_sampled_population_reports_exact_best_and_reranks():
+    evaluator = MSEEvaluator()
+    pop, target = make_population(size=10, fitness_method=evaluator, sample_fraction=0.3,
+                                  sample_rerank_every=3, sample_rerank_top=4)
+    tasks = pop.prepare_fitness_tasks(target)
+    assert all(task[2]["sample"] is pop.pixel_sample for task in tasks)
+    for generation in range(7):
+        if generation:
+            pop.create_next_generation()
+        sample = pop.pixel_sample
+        pop.evaluate_pending(target)
+        if generation == 3 or generation == 6:
+            # stratified: a new sample, and the whole population re-scored on it
+            assert pop.pixel_sample is not sample and pop.eval_stats["evaluated"] == 10
+        stats = pop.get_statistics()
+        best = stats["best_individual"]
+        assert stats["best_fitness"] == pytest.approx(evaluator.score(best.render_array()), rel=1e-6)
+        assert pop.best_fitness >= stats["best_fitness"]
+        if pop.generation % 3 == 0:
+            # the sampled top 4 are ordered by their exact fitness
+            # (a tie with the 4th may bring in an individual that was not re-ranked)
+            top = [ind for ind in sorted(pop.individuals, key=lambda x: x.fitness, reverse=True)[:4]
+                   if ind.exact_fitness is not None]
+            assert all(a.exact_fitness >= b.exact_fitness
+                       for a, b in zip(top, top[1:]) if a.fitness > b.fitness)
+            assert pop.sample_stats["rank_agreement"] is not None
+
+
+def test_exact_best_survives_and_reported_best_never_drops():
+    evaluator = MSEEvaluator()
+    pop, target = make_population(size=8, fitness_method=evaluator, sample_fraction=0.1,
+                                  sample_rerank_every=2, sample_rerank_top=2)
+    pop.evaluate_pending(target)
+    previous = float("-inf")
+    for _ in range(12):
+        pop.create_next_generation()
+        pop.evaluate_pending(target)
+        stats = pop.get_statistics()
+        assert stats["best_fitness"] >= previous
+        assert stats["best_fitness"] == pop.best_fitness
+        assert any(ind is pop._exact_elite for ind in pop.individuals)
+        assert stats["best_fitness"] == pytest.approx(evaluator.score(stats["best_individual"].render_array()), rel=1e-6)
+        previous = stats["best_fitness"]
+
+
+def test_fixed_sample_is_kept_and_disables_early_abort():
+    pop, target = make_population(size=6, sample_fraction=0.3, sample_mode="fixed",
+                                  sample_rerank_every=1, early_abort=True)
+    assert not pop.early_abort
+    pop.evaluate_pending(target)
+    sample = pop.pixel_sample
+    for _ in range(3):
+        pop.create_next_generation()
+        pop.evaluate_pending(target)
+        assert pop.pixel_sample is sample
+    with pytest.raises(ValueError):
+        make_population(sample_mode="random")
@@ -0,0 +1,30 @@
+import multiprocessing
+
+import numpy as np
+
+from src.genetics.shared_target import SharedTarget, attach_shared_arrays, resolve_target
+
+
+def _checksum(handle):
+    return int(resolve_target(handle).astype(np.int64).sum())
+
+
+def test_resolve_plain_array_passthrough():
+    arr = np.zeros((2, 2, 3), dtype=np.uint8)
+    assert resolve_target(arr) is arr
+
+
+def test_workers_read_shared_target():
+    target = np.random.randint(0, 256, size=(16, 12, 3), dtype=np.uint8)
+    with SharedTarget({"target": target}) as shared:
+        assert np.array_equal(shared.array(), target)
+        with multiprocessing.Pool(2, initializer=attach_shared_arrays, initargs=(shared.handles,)) as pool:
+            sums = pool.map(_checksum, [shared.handle] * 4)
+    assert sums == [int(target.astype(np.int64).sum())] * 4
+
+
+def test_attached_view_is_read_only():
+    target = np.ones((4, 4, 3), dtype=np.uint8)
+    with SharedTarget({"target": target}) as shared:
+        view = resolve_target(shared.handle)
+        assert not view.flags.writeable
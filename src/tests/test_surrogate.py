@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.genetics.fitness.cutoff import REJECTED_FITNESS
+from src.genetics.fitness.mse import MSEEvaluator
+from src.genetics.polygon import Polygon
+from src.genetics.surrogate import (OFFSPRING_FEATURES, LowResSurrogate, RidgeSurrogate, offspring_features,
+                                     r_squared, screen)
+from src.tests.helpers import make_population
+
+
+def test_surrogate_scores_a_downscaled_render_once():
+    pop, target = make_population(size=4)
+    surrogate = LowResSurrogate(pop.fitness_method, pop.target_img, 0.5)
+    assert surrogate.target.shape == (12, 16, 3)
+    ind = pop.individuals[0]
+    score = surrogate.score(ind)
+    assert 0 < score <= 1 and ind.surrogate_fitness == score
+    assert ind.width == 32  # the genome itself is not rescaled
+    ind.mutate(mutation_rate=1.0, target_img=pop.target_img)
+    assert ind.surrogate_fitness is None
+
+
+def test_screen_keeps_the_top_ratio_and_the_percentile():
+    pop, _ = make_population(size=10)
+    surrogate = LowResSurrogate(pop.fitness_method, pop.target_img, 0.5)
+    children = pop.individuals
+    keep, rejected = screen(children, surrogate, 0.3)
+    assert len(keep) == 3 and len(rejected) == 7
+    assert min(c.surrogate_fitness for c in keep) >= max(c.surrogate_fitness for c in rejected)
+    # percentile 0 of the survivors lets every child at least as good as the worst through
+    survivors = children[:5]
+    keep, _ = screen(children, surrogate, 0.1, survivors, percentile=0)
+    worst = min(s.surrogate_fitness for s in survivors)
+    assert {id(c) for c in keep} >= {id(c) for c in children if c.surrogate_fitness >= worst}
+
+
+def test_screened_generation_evaluates_only_the_kept_children():
+    evaluator = MSEEvaluator()
+    pop, target = make_population(size=10, fitness_method=evaluator, screen_ratio=0.25, screen_scale=0.5)
+    assert pop.screening
+    pop.evaluate_pending(target)
+    for _ in range(3):
+        pop.create_next_generation()
+        old, offspring = pop._deferred_replacement
+        pop.evaluate_pending(target)
+        kept = len(offspring) - pop.screen_stats["screened_out"]
+        assert kept == int(np.ceil(0.25 * len(offspring)))
+        assert pop.eval_stats["evaluated"] + pop.eval_stats["memo_hits"] <= kept
+        assert len(pop.individuals) == 10
+        assert not any(ind.fitness == REJECTED_FITNESS for ind in pop.individuals)
+        assert 0 <= pop.screen_stats["disagreement"] <= 1
+        assert pop.early_abort_stats == {"rejected": 0}
+
+
+def test_screening_needs_traditional_replacement():
+    pop, _ = make_population(screen_ratio=0.5, replacement_method=lambda old, new: new + old[:len(old) - len(new)])
+    assert not pop.screening
+
+
+def test_offspring_features_describe_the_change():
+    pop, _ = make_population(size=2)
+    parent1, parent2 = pop.individuals
+    parent1.fitness, parent2.fitness = 0.5, 0.25
+    clone = parent1.clone()
+    assert list(offspring_features(clone, parent1, parent2, False)) == [0.5, 0.25, 0, 0, 0, 0, 0]
+    poly = clone.polygons[0]
+    clone.polygons[0] = Polygon(poly.vertices, (0, 0, 0, 255))
+    features = offspring_features(clone, parent1, parent2, True)
+    assert features[2] == 1 and features[3] == 0 and features[4] == pytest.approx(1 / 6)
+    assert features[5] > 0 and features[6] > 0
+
+
+def test_ridge_surrogate_learns_a_linear_fitness():
+    rng = np.random.default_rng(4)
+    weights = rng.normal(size=len(OFFSPRING_FEATURES))
+    surrogate = RidgeSurrogate(alpha=1e-6, min_samples=20, accuracy_window=2)
+    assert not surrogate.ready
+
+    def generation(n=12, sign=1.0):
+        children = [SimpleNamespace(uid=object(), fitness=0.0, surrogate_fitness=None) for _ in range(n)]
+        surrogate._features = {child.uid: rng.normal(size=len(weights)) for child in children}
+        for child in children:
+            child.fitness = sign * float(surrogate._features[child.uid] @ weights)
+        return children
+
+    surrogate.learn(generation())
+    assert not surrogate.ready  # 12 < min_samples
+    surrogate.learn(generation())
+    # trained, but its accuracy has not been measured yet
+    assert not surrogate.ready and surrogate.accuracy is None
+    children = generation()
+    predicted = [surrogate.score(child) for child in children]
+    assert np.allclose(predicted, [child.fitness for child in children], atol=1e-4)
+    surrogate.learn(children)
+    assert surrogate.accuracy == pytest.approx(1.0, abs=1e-6) and not surrogate.ready  # 1 of 2 generations
+    surrogate.learn(generation())
+    assert surrogate.ready
+    # one generation predicted worse than the mean turns screening off
+    surrogate.learn(generation(sign=-1.0))
+    assert surrogate.accuracy < 0 and not surrogate.ready
+    surrogate.learn(generation())
+    surrogate.learn(generation())
+    assert surrogate.ready
+    # too few evaluated children to measure R^2 also turns it off
+    surrogate.learn(generation(n=4))
+    assert surrogate.accuracy is None and not surrogate.ready
+
+
+def test_r_squared_needs_samples_and_variance():
+    actual = np.linspace(0.5, 0.6, 10)
+    assert r_squared(actual, actual) == 1.0
+    assert r_squared(np.full(10, actual.mean()), actual) == pytest.approx(0.0)
+    assert r_squared(actual[:4], actual[:4]) is None
+    # fitness differing only in the 8th digit: R^2 would be meaningless (~ -1e10)
+    flat = 0.6 + np.arange(10) * 1e-9
+    assert r_squared(flat + 1e-5, flat) is None
+
+
+def test_ridge_screening_evaluates_everything_until_trained():
+    # any measured R^2 is good enough here: this checks the warm-up, not the model
+    pop, target = make_population(size=12, screen_ratio=0.5, screen_surrogate="ridge", surrogate_min_samples=8,
+                                  surrogate_min_r2=float("-inf"), surrogate_r2_window=1)
+    pop.evaluate_pending(target)
+    for _ in range(2):
+        # trained after the first generation, measured after the second
+        pop.create_next_generation()
+        pop.evaluate_pending(target)
+        assert pop.screen_stats["screened_out"] == 0
+    assert pop.screen_stats["accuracy"] is not None and pop._surrogate.ready
+    pop.create_next_generation()
+    n_offspring = len(pop._deferred_replacement[1])
+    pop.evaluate_pending(target)
+    assert pop.screen_stats["screened_out"] == n_offspring // 2
+    with pytest.raises(ValueError):
+        make_population(screen_surrogate="forest")
+
+
+@pytest.mark.parametrize("percentile", [-1, 100.5])
+def test_screen_percentile_outside_0_100_is_rejected(percentile):
+    with pytest.raises(ValueError, match="screen_percentile"):
+        make_population(screen_ratio=0.5, screen_percentile=percentile)
+    assert make_population(screen_ratio=0.5, screen_percentile="75")[0].screen_percentile == 75.0